@@ -0,0 +1,316 @@
+"""Headless HTTP API over the core pipeline, sharing caches and the Gemini scheduler with the Streamlit UI.
+
+    uvicorn api:app --host 0.0.0.0 --port 8000 --workers 4
+    python api.py --port 8000
+
+Every operation is a POST with a JSON body and answers {"result": ..., "notices": [...]}.
+POST /batch runs several operations concurrently in one request.
+"""
+import argparse
+import asyncio
+import io
+import os
+import time
+from contextlib import asynccontextmanager
+
+from starlette.applications import Starlette
+from starlette.concurrency import run_in_threadpool
+from starlette.responses import JSONResponse, PlainTextResponse
+from starlette.routing import Route
+
+import core
+from ats_keywords import missing_keywords
+from diagnostics import metrics
+from resources import (
+    get_artifact_registry, get_keyword_index, get_llm_cache, get_llm_scheduler, get_model_router, get_posting_store,
+    get_report_store, get_report_warmer, get_semantic_matcher, startup_report
+)
+
+# Operations running at once in this process; the rest queue
+API_MAX_CONCURRENCY = int(os.getenv("API_MAX_CONCURRENCY", "16"))
+# Queued requests give up with 503 after this long
+API_QUEUE_TIMEOUT = float(os.getenv("API_QUEUE_TIMEOUT", "30"))
+API_MAX_BATCH = int(os.getenv("API_MAX_BATCH", "20"))
+
+
+class BadRequest(Exception):
+    """Invalid or missing parameters; answered with 400"""
+
+
+def require(params, *names):
+    missing = [name for name in names if params.get(name) in (None, "", [])]
+    if missing:
+        raise BadRequest(f"Missing required field(s): {', '.join(missing)}")
+    return [params[name] for name in names]
+
+
+def number(params, name, default):
+    """Optional non-negative numeric field"""
+    value = params.get(name)
+    if value in (None, ""):
+        return default
+    try:
+        value = float(value)
+    except (TypeError, ValueError):
+        raise BadRequest(f"{name} must be a number")
+    if not 0 <= value < float("inf"):
+        raise BadRequest(f"{name} must be a non-negative number")
+    return value
+
+
+def list_field(params, name, item_type, default=()):
+    """Optional list field whose items must all be item_type (str or dict)"""
+    value = params.get(name)
+    if value in (None, "", []):
+        return list(default)
+    if not isinstance(value, list) or not all(isinstance(item, item_type) for item in value):
+        raise BadRequest(f"{name} must be a list of {'strings' if item_type is str else 'objects'}")
+    return value
+
+
+def op_parse_resume(params):
+    (text,) = require(params, "resume_text")
+    return core.extract_skills_from_resume(text, enrich=str(params.get("enrich", "")).lower() in ("1", "true", "yes"))
+
+
+def op_search_jobs(params):
+    job_title, _ = require(params, "job_title", "locations")
+    locations = list_field(params, "locations", str)
+    platforms = list_field(params, "platforms", str, core.JOB_PLATFORMS)
+    unknown = [platform for platform in platforms if platform not in core.JOB_PLATFORMS]
+    if unknown:
+        raise BadRequest(f"Unknown platform(s): {', '.join(unknown)}")
+    # Whole years: experience is formatted into the boards' search URLs
+    experience = int(number(params, "experience", 0))
+    return core.search_jobs(job_title, locations, experience, list_field(params, "skills", str), platforms,
+                            resume_text=params.get("resume_text"))
+
+
+def op_semantic_match(params):
+    require(params, "jobs")
+    jobs, skills = list_field(params, "jobs", dict), list_field(params, "skills", str)
+    if not skills and not params.get("resume_text"):
+        raise BadRequest("Provide skills, resume_text or both")
+    nearest = get_semantic_matcher().nearest_postings(jobs, skills, params.get("resume_text"),
+                                                      int(number(params, "k", 10)))
+    return [{"job": job, "similarity": round(similarity, 4)} for job, similarity in nearest]
+
+
+def op_analyze_jobs(params):
+    _, profile = require(params, "jobs", "profile")
+    jobs = list_field(params, "jobs", dict)
+    if not isinstance(profile, dict):
+        raise BadRequest("profile must be an object")
+    # Results arrive in completion order; place each by position, since jobs can share a url or title
+    positions = {}
+    for i, job in enumerate(jobs):
+        positions.setdefault(id(job), []).append(i)
+    analyses = [None] * len(jobs)
+    for job, analysis, error in core.analyze_jobs_concurrently(jobs, profile):
+        analyses[positions[id(job)].pop()] = {"analysis": analysis, "error": str(error) if error else None}
+    return analyses
+
+
+def op_optimize_resume(params):
+    return core.optimize_resume(*require(params, "resume_text", "job_description"))
+
+
+def op_cover_letter(params):
+    return core.generate_cover_letter(*require(params, "resume_text", "job_description", "company_name"))
+
+
+def op_ats_keywords(params):
+    return core.suggest_ats_keywords(*require(params, "job_description"))
+
+
+def op_keyword_gap(params):
+    job_description, resume_text = require(params, "job_description", "resume_text")
+    keywords = core.suggest_ats_keywords(job_description)
+    return {"keywords": keywords, "missing": missing_keywords(keywords, resume_text)}
+
+
+def op_interview_questions(params):
+    return core.generate_interview_questions(*require(params, "job_description"))
+
+
+def op_company_research(params):
+    return core.generate_company_research(*require(params, "company_name"))
+
+
+def op_linkedin_connections(params):
+    return core.suggest_linkedin_connections(*require(params, "company_name", "job_title"))
+
+
+def op_outreach_template(params):
+    return core.generate_outreach_template(*require(params, "connection_type", "company_name"))
+
+
+def op_application_pack(params):
+    resume_text, job_description = require(params, "resume_text", "job_description")
+    pack = {}
+    for name, result, notices, seconds in core.build_application_pack(resume_text, job_description,
+                                                                      params.get("company_name", "")):
+        pack[name] = {"result": result, "notices": notices, "seconds": round(seconds, 2)}
+    return pack
+
+
+def op_industry_trends(params):
+    return core.get_industry_trends(*require(params, "industry", "location"))
+
+
+OPERATIONS = {
+    "parse_resume": op_parse_resume,
+    "search_jobs": op_search_jobs,
+    "semantic_match": op_semantic_match,
+    "analyze_jobs": op_analyze_jobs,
+    "optimize_resume": op_optimize_resume,
+    "cover_letter": op_cover_letter,
+    "ats_keywords": op_ats_keywords,
+    "keyword_gap": op_keyword_gap,
+    "interview_questions": op_interview_questions,
+    "company_research": op_company_research,
+    "linkedin_connections": op_linkedin_connections,
+    "outreach_template": op_outreach_template,
+    "industry_trends": op_industry_trends,
+    "application_pack": op_application_pack,
+}
+
+_slots = None
+
+
+def slots():
+    """Process-wide concurrency limit, created inside the running event loop"""
+    global _slots
+    if _slots is None:
+        _slots = asyncio.Semaphore(API_MAX_CONCURRENCY)
+    return _slots
+
+
+def run_operation(name, params):
+    """Run one operation on the calling thread, capturing helper notices instead of rendering them"""
+    with core.collect_notices() as notices, metrics.track(f"api:{name}"):
+        result = OPERATIONS[name](params)
+    return result, notices
+
+
+async def execute(name, params):
+    """Run an operation on the thread pool once a concurrency slot frees up; return (status, body)"""
+    if name not in OPERATIONS:
+        return 404, {"error": f"Unknown operation: {name}"}
+    if not isinstance(params, dict):
+        return 400, {"error": "Parameters must be a JSON object"}
+    try:
+        await asyncio.wait_for(slots().acquire(), API_QUEUE_TIMEOUT)
+    except asyncio.TimeoutError:
+        return 503, {"error": "Server busy, retry later"}
+    started = time.perf_counter()
+    try:
+        result, notices = await run_in_threadpool(run_operation, name, params)
+    except BadRequest as e:
+        return 400, {"error": str(e)}
+    except Exception as e:
+        return 500, {"error": str(e)}
+    finally:
+        slots().release()
+    body = {"result": result, "notices": notices, "elapsed_ms": round((time.perf_counter() - started) * 1000, 1)}
+    # Helpers return None (and notify an error) when the upstream call failed
+    return (502 if result is None and any(n["level"] == "error" for n in notices) else 200), body
+
+
+async def read_params(request):
+    """JSON body, or resume text extracted from an uploaded PDF (raw application/pdf or multipart "file")"""
+    content_type = request.headers.get("content-type", "")
+    if content_type.startswith("application/pdf"):
+        data = await request.body()
+        return {**request.query_params, "resume_text": await run_in_threadpool(pdf_to_text, data)}
+    if content_type.startswith("multipart/form-data"):
+        form = await request.form()
+        upload = form.get("file")
+        params = {key: value for key, value in form.items() if key != "file"}
+        if upload is not None:
+            params["resume_text"] = await run_in_threadpool(pdf_to_text, await upload.read())
+        return params
+    try:
+        return await request.json()
+    except ValueError:
+        raise BadRequest("Request body must be JSON")
+
+
+def pdf_to_text(data):
+    with core.collect_notices() as notices:
+        text = core.extract_text_from_pdf(io.BytesIO(data))
+    if not text:
+        raise BadRequest(notices[0]["message"] if notices else "No text found in PDF")
+    return text
+
+
+async def operation_endpoint(request):
+    try:
+        params = await read_params(request)
+    except BadRequest as e:
+        return JSONResponse({"error": str(e)}, status_code=400)
+    status, body = await execute(request.path_params["operation"], params)
+    return JSONResponse(body, status_code=status)
+
+
+async def batch_endpoint(request):
+    """Run {"requests": [{"op": name, "params": {...}}, ...]} concurrently; results keep request order"""
+    try:
+        requests = (await request.json()).get("requests")
+    except (ValueError, AttributeError):
+        requests = None
+    if not isinstance(requests, list) or not requests:
+        return JSONResponse({"error": 'Body must be {"requests": [{"op": ..., "params": {...}}]}'}, status_code=400)
+    if len(requests) > API_MAX_BATCH:
+        return JSONResponse({"error": f"At most {API_MAX_BATCH} requests per batch"}, status_code=400)
+    outcomes = await asyncio.gather(*(
+        execute(item.get("op"), item.get("params", {})) if isinstance(item, dict) else execute(None, None)
+        for item in requests
+    ))
+    return JSONResponse({"responses": [{"status": status, **body} for status, body in outcomes]})
+
+
+async def health(request):
+    return JSONResponse({"status": "ok", "operations": sorted(OPERATIONS)})
+
+
+async def diagnostics(request):
+    snapshot = metrics.snapshot(get_llm_cache().stats(), startup_report())
+    snapshot["scheduler"] = get_llm_scheduler().stats()
+    snapshot["routes"] = get_model_router().stats()
+    snapshot["reports"] = get_report_store().stats()
+    snapshot["postings"] = get_posting_store().stats()
+    snapshot["semantic"] = get_semantic_matcher().stats()
+    snapshot["sessions"] = get_artifact_registry().stats()
+    snapshot["keywords"] = get_keyword_index().stats()
+    return JSONResponse(snapshot)
+
+
+async def prometheus(request):
+    return PlainTextResponse(metrics.to_prometheus(get_llm_cache().stats()))
+
+
+@asynccontextmanager
+async def lifespan(app):
+    get_report_warmer()
+    yield
+
+
+app = Starlette(lifespan=lifespan, routes=[
+    Route("/health", health),
+    Route("/metrics", prometheus),
+    Route("/diagnostics", diagnostics),
+    Route("/batch", batch_endpoint, methods=["POST"]),
+    Route("/{operation}", operation_endpoint, methods=["POST"]),
+])
+
+
+if __name__ == "__main__":
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="Serve the job-hunting pipeline over HTTP")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--workers", type=int, default=1)
+    args = parser.parse_args()
+    uvicorn.run("api:app", host=args.host, port=args.port, workers=args.workers)
@@ -1,16 +1,28 @@
 import os
+import time
 import streamlit as st
-import google.generativeai as genai
-from firecrawl import FirecrawlApp
-from dotenv import load_dotenv
-import PyPDF2
-import io
 import json
+import hashlib
 from datetime import datetime
-import re
+from contextlib import contextmanager
+# Environment variables, clients and caches are loaded once per process by resources/core
+from core import (
+    INDIAN_CITIES, JOB_PLATFORMS, extract_text_from_pdf, extract_skills_from_resume, analyze_job_with_gemini,
+    analyze_jobs_concurrently, optimize_resume, generate_cover_letter, suggest_ats_keywords,
+    generate_interview_questions, generate_company_research, application_pack_artifacts, build_application_pack,
+    suggest_linkedin_connections, generate_outreach_template, search_jobs, get_industry_trends
+)
+from ats_keywords import missing_keywords
+from diagnostics import metrics
+from interview_session import MockInterview
+from pdf_text import file_digest
+from results_view import ALL_PLATFORMS, SORT_ORDERS, filter_postings, paginate, platform_counts, sort_postings
+from resources import (
+    get_artifact_registry, get_keyword_index, get_llm_cache, get_llm_scheduler, get_model_router, get_posting_store, get_report_store, get_report_warmer, get_semantic_matcher,
+    startup_report
+)
 
-# Load environment variables
-load_dotenv()
+rerun_started = time.perf_counter()
 
 # Initialize all session state variables
 def init_session_state():
@@ -20,453 +32,207 @@ def init_session_state():
         st.session_state.search_time = None
     if 'resume_data' not in st.session_state:
         st.session_state.resume_data = {'skills': [], 'experience': 0, 'titles': [], 'education': [], 'certifications': []}
-    if 'uploaded_file' not in st.session_state:
-        st.session_state.uploaded_file = None
+    if 'resume_digest' not in st.session_state:
+        st.session_state.resume_digest = None
     if 'custom_skills' not in st.session_state:
         st.session_state.custom_skills = []
     if 'job_description' not in st.session_state:
         st.session_state.job_description = ""
     if 'target_company' not in st.session_state:
         st.session_state.target_company = ""
-    if 'resume_text' not in st.session_state:
-        st.session_state.resume_text = ""
     if 'job_title' not in st.session_state:
         st.session_state.job_title = "Software Engineer"
     if 'resume_uploaded' not in st.session_state:
         st.session_state.resume_uploaded = False
-    if 'optimized_resume' not in st.session_state:
-        st.session_state.optimized_resume = ""
-    if 'cover_letter' not in st.session_state:
-        st.session_state.cover_letter = ""
-    if 'interview_questions' not in st.session_state:
-        st.session_state.interview_questions = ""
-    if 'mock_interview' not in st.session_state:
-        st.session_state.mock_interview = ""
-    if 'company_research' not in st.session_state:
-        st.session_state.company_research = ""
-    if 'connections' not in st.session_state:
-        st.session_state.connections = ""
-    if 'outreach_template' not in st.session_state:
-        st.session_state.outreach_template = ""
+    if 'derived_artifacts' not in st.session_state:
+        st.session_state.derived_artifacts = {}
+    if 'application_pack' not in st.session_state:
+        st.session_state.application_pack = {}
+    if 'artifacts' not in st.session_state:
+        # Generated text and resume content, bounded in memory and spilled to disk past the budget
+        st.session_state.artifacts = get_artifact_registry().session()
 
 init_session_state()
+artifacts = st.session_state.artifacts
+# Precompute popular industry-trends and company-research reports in the background
+get_report_warmer()
 
-# Configure Gemini
-genai.configure(api_key=os.getenv('GEMINI_API_KEY'))
-
-# Initialize models and clients
-gemini_model = genai.GenerativeModel('gemini-1.5-pro')
-firecrawl_app = FirecrawlApp(api_key=os.getenv('FIRECRAWL_API_KEY'))
-
-# Indian major cities
-INDIAN_CITIES = [
-    "Bangalore", "Mumbai", "Delhi", "Hyderabad", "Chennai",
-    "Pune", "Kolkata", "Ahmedabad", "Gurgaon", "Noida",
-    "Remote", "Anywhere"
-]
+# Render long generations token-by-token as they stream in
+STREAMING_ENABLED = os.getenv('STREAM_RESPONSES', '1') != '0'
+# Hidden diagnostics panel, enabled with DIAGNOSTICS=1 or ?diagnostics=1
+DIAGNOSTICS_ENABLED = os.getenv('DIAGNOSTICS') == '1' or st.query_params.get('diagnostics') == '1'
 
-# Job platforms with specific search URLs
-JOB_PLATFORMS = {
-    "Naukri": {
-        "url": "https://www.naukri.com",
-        "search_pattern": "/{job_title}-jobs-in-{location}?experience={experience}"
-    },
-    "Indeed": {
-        "url": "https://www.indeed.com",
-        "search_pattern": "/jobs?q={job_title}&l={location}&explvl={experience_level}"
-    },
-    "Monster": {
-        "url": "https://www.monsterindia.com",
-        "search_pattern": "/search/{job_title}-jobs-in-{location}?exp={experience}"
-    },
-    "LinkedIn": {
-        "url": "https://www.linkedin.com/jobs",
-        "search_pattern": "/search/?keywords={job_title}&location={location}&f_E={experience_code}"
-    },
-    "PayScale": {
-        "url": "https://www.payscale.com",
-        "search_pattern": "/research/IN/Job={job_title}/Salary"
-    }
-}
-
-def extract_text_from_pdf(uploaded_file):
-    """Extract text from PDF resume with enhanced error handling"""
+@contextmanager
+def streaming_output():
+    """Yield an on_chunk callback that renders partial output, cleared once the final text is stored"""
+    if not STREAMING_ENABLED:
+        yield None
+        return
+    placeholder = st.empty()
     try:
-        pdf_reader = PyPDF2.PdfReader(io.BytesIO(uploaded_file.read()))
-        text = ""
-        for page in pdf_reader.pages:
-            text += page.extract_text() or ""  # Handle None returns
-        return text.strip()
-    except Exception as e:
-        st.error(f"Error reading PDF: {str(e)}")
-        return None
+        yield lambda text: placeholder.markdown(text + " ▌")
+    finally:
+        placeholder.empty()
 
-def extract_skills_from_resume(resume_text):
-    """Use Gemini 1.5 Pro to extract skills with structured output"""
-    prompt = """Extract the following information from the resume in JSON format:
-    {
-        "technical_skills": [],
-        "soft_skills": [],
-        "years_experience": float,
-        "job_titles": [],
-        "education": [],
-        "certifications": []
-    }
-    
-    Resume Text:
-    """ + resume_text[:10000]  # Using 1.5 Pro's larger context window
-    
-    try:
-        response = gemini_model.generate_content(prompt)
-        if response.text:
-            try:
-                return json.loads(response.text)
-            except json.JSONDecodeError:
-                st.error("Failed to parse skills data")
-        return {"technical_skills": [], "soft_skills": [], "years_experience": 0, "job_titles": [], "education": [], "certifications": []}
-    except Exception as e:
-        st.error(f"Error extracting skills: {str(e)}")
-        return {"technical_skills": [], "soft_skills": [], "years_experience": 0, "job_titles": [], "education": [], "certifications": []}
+def inputs_fingerprint(inputs):
+    return hashlib.sha256(json.dumps(inputs, sort_keys=True, default=str).encode("utf-8")).hexdigest()
 
-def analyze_job_with_gemini(job_details, user_profile):
-    """Enhanced analysis with Gemini 1.5 Pro"""
-    prompt = f"""
-    Analyze this job opportunity against the candidate profile and provide:
-    1. Match score (0-100) with detailed breakdown
-    2. Key strengths and weaknesses
-    3. Missing qualifications
-    4. Salary benchmarking (current market rates)
-    5. Company culture insights
-    6. Customized application strategy
-    
-    Format your response as markdown with these sections:
-    
-    ### 🎯 Match Analysis
-    - Overall Score: [score]/100
-    - Skills Match: [x]/[y] skills matched
-    - Experience: [analysis]
-    
-    ### 💪 Strengths
-    - [List candidate strengths for this role]
-    
-    ### 📉 Weaknesses
-    - [List potential gaps]
-    
-    ### 💰 Salary Insights
-    - [Market range analysis]
-    
-    ### 🏢 Company Fit
-    - [Culture analysis]
-    
-    ### 📝 Application Strategy
-    - [Customized tips]
-    
-    Job Details:
-    {json.dumps(job_details, indent=2)}
-    
-    Candidate Profile:
-    {json.dumps(user_profile, indent=2)}
-    """
-    
-    try:
-        response = gemini_model.generate_content(prompt)
-        return response.text
-    except Exception as e:
-        st.error(f"Error analyzing with Gemini: {str(e)}")
-        return None
+def remember_in_session(name, inputs, value):
+    """Store a derived artifact computed elsewhere so memoize_in_session reuses it for the same inputs"""
+    computed_at = datetime.now()
+    artifacts[f"derived:{name}"] = value
+    st.session_state.derived_artifacts[name] = {"fingerprint": inputs_fingerprint(inputs), "computed_at": computed_at}
+    return computed_at
 
-def optimize_resume(resume_text, job_description):
-    """Optimize resume based on job description"""
-    prompt = f"""
-    Optimize this resume for the following job description. Provide:
-    1. ATS-optimized version with relevant keywords
-    2. Improved formatting and structure
-    3. Enhanced bullet points with quantifiable achievements
-    4. Skills section reordered by relevance
+def memoize_in_session(name, inputs, compute, spinner_text=None):
+    """Recompute a derived artifact only when its inputs change.
     
-    Return the optimized resume in markdown format.
-    
-    Job Description:
-    {job_description}
-    
-    Original Resume:
-    {resume_text}
+    Returns (value, computed_at, fresh) where fresh is True if the value was computed on this rerun.
     """
+    entry = st.session_state.derived_artifacts.get(name)
+    if entry and entry["fingerprint"] == inputs_fingerprint(inputs) and f"derived:{name}" in artifacts:
+        return artifacts[f"derived:{name}"], entry["computed_at"], False
     
-    try:
-        response = gemini_model.generate_content(prompt)
-        return response.text
-    except Exception as e:
-        st.error(f"Error optimizing resume: {str(e)}")
-        return None
-
-def generate_cover_letter(resume_text, job_description, company_name):
-    """Generate tailored cover letter"""
-    prompt = f"""
-    Write a professional cover letter for this job application.
-    Tailor it specifically to the company and job description.
-    Include:
-    1. Personalized opening
-    2. 3-4 key qualifications
-    3. Specific examples from resume
-    4. Enthusiastic closing
-    
-    Job Description:
-    {job_description}
-    
-    Company Name:
-    {company_name}
-    
-    Candidate Resume:
-    {resume_text}
-    """
-    
-    try:
-        response = gemini_model.generate_content(prompt)
-        return response.text
-    except Exception as e:
-        st.error(f"Error generating cover letter: {str(e)}")
-        return None
-
-def suggest_ats_keywords(job_description):
-    """Extract ATS keywords from job description"""
-    prompt = f"""
-    Extract the most important keywords for Applicant Tracking Systems (ATS)
-    from this job description. Return only a comma-separated list.
-    
-    Job Description:
-    {job_description}
-    """
-    
-    try:
-        response = gemini_model.generate_content(prompt)
-        return [kw.strip() for kw in response.text.split(",") if kw.strip()]
-    except Exception as e:
-        st.error(f"Error extracting keywords: {str(e)}")
-        return []
-
-def generate_interview_questions(job_description):
-    """Generate potential interview questions"""
-    prompt = f"""
-    Generate 10 likely interview questions for this job,
-    including 5 technical and 5 behavioral questions.
-    Format as a numbered list with question type.
-    
-    Job Description:
-    {job_description}
-    """
-    
-    try:
-        response = gemini_model.generate_content(prompt)
-        return response.text
-    except Exception as e:
-        st.error(f"Error generating questions: {str(e)}")
-        return None
+    if spinner_text:
+        with st.spinner(spinner_text):
+            value = compute()
+    else:
+        value = compute()
+    return value, remember_in_session(name, inputs, value), True
 
-def conduct_mock_interview(questions, resume_text):
-    """AI-powered mock interview"""
-    prompt = f"""
-    Conduct a mock interview with the candidate.
-    Ask one question at a time and evaluate responses.
-    Provide constructive feedback after each answer.
-    
-    Questions:
-    {questions}
-    
-    Candidate Resume:
-    {resume_text}
-    
-    Start with the first question.
-    """
-    
-    try:
-        response = gemini_model.generate_content(prompt)
-        return response.text
-    except Exception as e:
-        st.error(f"Error conducting mock interview: {str(e)}")
-        return None
+def show_freshness(computed_at, fresh):
+    """Render a small fresh/cached indicator for a memoized artifact"""
+    if fresh:
+        st.caption(f"🟢 Fresh · computed at {computed_at.strftime('%H:%M:%S')}")
+    else:
+        st.caption(f"♻️ Cached · inputs unchanged since {computed_at.strftime('%H:%M:%S')}")
 
-def generate_company_research(company_name):
-    """Generate company research report"""
-    prompt = f"""
-    Create a comprehensive research report about this company
-    to help a job candidate prepare for interviews.
-    Include:
-    1. Company overview
-    2. Recent news
-    3. Company culture
-    4. Interview tips specific to this company
-    
-    Company Name:
-    {company_name}
-    """
+def render_posting(job, user_profile):
+    """One search result with its details, link and on-demand analysis"""
+    with st.expander(f"🌟 {job['match_score']:.0f}% | {job['title']} at {job['company']} | {job['location']} | 💰 {job['salary']}", expanded=False):
+        col1, col2 = st.columns([3, 1])
+        with col1:
+            st.markdown(f"""
+            **📌 Position:** {job['title']}  
+            **🏢 Company:** {job['company']}  
+            **📍 Location:** {job['location']}  
+            **📅 Experience:** {job['experience']}  
+            **💰 Salary Range:** {job['salary']}  
+            **🛠️ Key Skills:** {", ".join(job['skills'])}  
+            **📅 Posted:** {job.get('posted_date', 'Recently')}
+            """)
+        
+            st.link_button("View Job Posting", job['url'])
     
-    try:
-        response = gemini_model.generate_content(prompt)
-        return response.text
-    except Exception as e:
-        st.error(f"Error generating research: {str(e)}")
-        return None
+        with col2:
+            if st.button("🤖 AI Analysis", key=f"analyze_{job['url']}"):
+                with st.spinner("Generating deep analysis..."):
+                    analysis = analyze_job_with_gemini(job, user_profile)
+                    artifacts[f'analysis:{job["url"]}'] = analysis
+    
+        if f'analysis:{job["url"]}' in artifacts:
+            st.markdown("---")
+            st.markdown(artifacts[f'analysis:{job["url"]}'])
 
-def suggest_linkedin_connections(company_name, job_title):
-    """Suggest relevant LinkedIn connections"""
-    prompt = f"""
-    Suggest types of LinkedIn connections to make when applying
-    to this company for this position. Include:
-    1. Relevant job titles to connect with
-    2. Recommended outreach approach
-    3. Icebreaker message templates
-    
-    Company: {company_name}
-    Position: {job_title}
-    """
-    
-    try:
-        response = gemini_model.generate_content(prompt)
-        return response.text
-    except Exception as e:
-        st.error(f"Error generating connection suggestions: {str(e)}")
-        return None
+PACK_LABELS = {
+    "optimized_resume": "Optimized resume",
+    "cover_letter": "Cover letter",
+    "ats_keywords": "ATS keywords",
+    "interview_questions": "Interview questions",
+    "company_research": "Company research",
+}
 
-def generate_outreach_template(connection_type, company_name):
-    """Generate personalized outreach template"""
-    prompt = f"""
-    Create a personalized LinkedIn outreach message template
-    for connecting with {connection_type} at {company_name}.
-    Make it professional but friendly.
-    Include:
-    1. Personalized greeting
-    2. Reason for connecting
-    3. Specific compliment or commonality
-    4. Clear call-to-action
-    
-    Return only the message content.
-    """
-    
-    try:
-        response = gemini_model.generate_content(prompt)
-        return response.text
-    except Exception as e:
-        st.error(f"Error generating template: {str(e)}")
-        return None
+def run_application_pack(names):
+    """Generate every application artifact at once, storing each in the session's artifacts as soon as it finishes"""
+    resume_text, job_description = artifacts.get("resume_text", ""), st.session_state.job_description
+    st.session_state.application_pack = {name: {"status": "running"} for name in names}
+    started = time.perf_counter()
+    with st.status(f"Generating {len(names)} artifacts in parallel...", expanded=True) as status:
+        lines = {name: st.empty() for name in names}
+        for name in names:
+            lines[name].write(f"⏳ {PACK_LABELS[name]}")
+        
+        pack = build_application_pack(resume_text, job_description, st.session_state.target_company, names)
+        for done, (name, result, notices, seconds) in enumerate(pack, start=1):
+            if result:
+                if name == "ats_keywords":
+                    remember_in_session("ats_keywords", [job_description], result)
+                else:
+                    artifacts[name] = result
+                lines[name].write(f"✅ {PACK_LABELS[name]} ({seconds:.1f}s)")
+            else:
+                reason = notices[0]["message"] if notices else "no result"
+                lines[name].write(f"⚠️ {PACK_LABELS[name]}: {reason}")
+            st.session_state.application_pack[name] = {"status": "done" if result else "failed", "seconds": round(seconds, 1)}
+            status.update(label=f"{done}/{len(names)} artifacts ready...")
+        
+        failed = [name for name, entry in st.session_state.application_pack.items() if entry["status"] == "failed"]
+        status.update(
+            label=f"Application pack ready in {time.perf_counter() - started:.1f}s" + (f" ({len(failed)} failed)" if failed else ""),
+            state="error" if failed else "complete", expanded=bool(failed)
+        )
 
-def generate_search_url(platform, job_title, location, experience):
-    """Generate platform-specific job search URLs with proper parameters"""
-    platform_data = JOB_PLATFORMS.get(platform)
-    if not platform_data:
-        return None
-    
-    # Clean inputs
-    clean_job_title = job_title.strip().lower().replace(' ', '-')
-    clean_location = location.strip().lower().replace(' ', '-')
-    
-    # Platform-specific parameter handling
-    if platform == "Naukri":
-        return f"{platform_data['url']}/{clean_job_title}-jobs-in-{clean_location}?experience={experience}"
-    elif platform == "Indeed":
-        if experience < 1:
-            exp_level = "entry_level"
-        elif experience < 3:
-            exp_level = "mid_level"
+def analyze_jobs_batch(jobs, user_profile, on_result=None):
+    """Analyze many postings concurrently, storing each report in the session's artifacts as it completes"""
+    failed = []
+    for done, (job, analysis, error) in enumerate(analyze_jobs_concurrently(jobs, user_profile), start=1):
+        if error or not analysis:
+            failed.append(job)
         else:
-            exp_level = "senior_level"
-        return f"{platform_data['url']}/jobs?q={clean_job_title}&l={clean_location}&explvl={exp_level}"
-    elif platform == "Monster":
-        return f"{platform_data['url']}/search/{clean_job_title}-jobs-in-{clean_location}?exp={experience}-{experience+2}"
-    elif platform == "LinkedIn":
-        if experience < 2:
-            exp_code = "1"
-        elif experience < 5:
-            exp_code = "2"
-        elif experience < 10:
-            exp_code = "3"
-        else:
-            exp_code = "4"
-        return f"{platform_data['url']}/search/?keywords={clean_job_title}&location={clean_location}&f_E={exp_code}"
-    elif platform == "PayScale":
-        return f"{platform_data['url']}/research/IN/Job={clean_job_title}/Salary"
-    return None
+            artifacts[f'analysis:{job["url"]}'] = analysis
+        if on_result:
+            on_result(job, done, error)
+    
+    if failed:
+        st.error(f"Analysis failed for {len(failed)} of {len(jobs)} jobs")
+    return len(jobs) - len(failed)
 
-def search_jobs(job_title, locations, experience, skills, platforms):
-    """Search for jobs across multiple platforms"""
-    try:
-        results = []
+def render_diagnostics():
+    """Sidebar panel with rerun/helper latencies, token usage, cache hit rates and exports"""
+    cache_stats = get_llm_cache().stats()
+    snapshot = metrics.snapshot(cache_stats, startup_report())
+    with st.sidebar.expander("⚙️ Diagnostics", expanded=False):
+        rerun = snapshot["latency"].get("rerun", {})
+        col1, col2, col3 = st.columns(3)
+        col1.metric("Rerun p50", f"{rerun.get('p50_ms', 0):.0f} ms")
+        col2.metric("Rerun p95", f"{rerun.get('p95_ms', 0):.0f} ms")
+        col3.metric("Cache hit rate", f"{cache_stats['hit_rate']:.0%}")
         
-        for platform in platforms:
-            for location in locations:
-                search_url = generate_search_url(platform, job_title, location, experience)
-                if not search_url:
-                    continue
-                
-                try:
-                    # Simulated response for demo
-                    scraped_data = {
-                        "title": f"{job_title} ({platform})",
-                        "company": f"Sample Company {len(results)+1}",
-                        "location": location,
-                        "experience": f"{experience}+ years",
-                        "skills": skills[:3] + [f"{platform}-Specialized"],
-                        "salary": f"₹{10+len(results)*2}-{15+len(results)*3} LPA",
-                        "url": search_url,
-                        "platform": platform,
-                        "posted_date": datetime.now().strftime("%Y-%m-%d")
-                    }
-                    
-                    # Calculate relevance score
-                    skills_match = len(set(skills) & set(scraped_data["skills"])) / len(scraped_data["skills"]) * 100
-                    exp_match = 100 - abs(experience - int(scraped_data["experience"].split("+")[0])) * 10
-                    scraped_data["match_score"] = min(100, (skills_match * 0.7 + exp_match * 0.3))
-                    
-                    results.append(scraped_data)
-                
-                except Exception as e:
-                    st.error(f"Error searching {platform}: {str(e)}")
+        st.caption("Latency by function")
+        st.dataframe(
+            [{"name": name, **summary} for name, summary in snapshot["latency"].items()],
+            hide_index=True, use_container_width=True
+        )
+        if snapshot["tokens"]:
+            st.caption("Gemini tokens by helper")
+            st.dataframe([{"name": name, **usage} for name, usage in snapshot["tokens"].items()], hide_index=True, use_container_width=True)
+        if snapshot["prompts"]:
+            st.caption("Prompt compaction (estimated tokens)")
+            st.dataframe([{"name": name, **usage} for name, usage in snapshot["prompts"].items()], hide_index=True, use_container_width=True)
+        if cache_stats["by_namespace"]:
+            st.caption(f"LLM cache ({cache_stats['entries']}/{cache_stats['max_entries']} entries)")
+            st.dataframe([{"name": name, **counts} for name, counts in cache_stats["by_namespace"].items()], hide_index=True, use_container_width=True)
+        st.caption("Gemini call scheduler")
+        st.json(get_llm_scheduler().stats(), expanded=False)
+        st.caption("Model routes")
+        st.json(get_model_router().stats(), expanded=False)
+        st.caption("Precomputed reports")
+        st.json({"store": get_report_store().stats(), "warmer": get_report_warmer().status}, expanded=False)
+        st.caption("Posting store")
+        st.json(get_posting_store().stats(), expanded=False)
+        st.caption("Session artifacts")
+        st.json({"process": get_artifact_registry().stats(), "this_session": artifacts.stats()}, expanded=False)
+        st.caption("ATS keyword corpus")
+        st.json(get_keyword_index().stats(), expanded=False)
+        st.caption("Semantic matching")
+        st.json(get_semantic_matcher().stats(), expanded=False)
+        st.caption("Startup (ms)")
+        st.json(snapshot["startup_ms"], expanded=False)
         
-        return sorted(results, key=lambda x: (-x["match_score"], x["platform"]))
-    except Exception as e:
-        st.error(f"Job search failed: {str(e)}")
-        return []
-
-def get_industry_trends(industry, location):
-    """Get comprehensive industry trends using Gemini"""
-    prompt = f"""
-    Provide a detailed industry trends report for {industry} professionals in {location}.
-    Include these sections with specific data:
-    
-    ### 💰 Salary Trends
-    - Entry-level: [range]
-    - Mid-career: [range]
-    - Senior-level: [range]
-    - Factors affecting compensation
-    
-    ### 📈 In-Demand Skills
-    1. Technical skills:
-       - [List 5-7 skills]
-    2. Soft skills:
-       - [List 3-5 skills]
-    
-    ### 🏆 Top Companies
-    - [List 5-7 top employers]
-    - Notable perks/benefits
-    
-    ### 🚀 Emerging Technologies
-    - [List 3-5 emerging tech]
-    - Adoption trends
-    
-    ### 📅 Hiring Trends
-    - Best times to apply
-    - Growth projections
-    - Remote work availability
-    
-    Format the response in markdown with clear headings.
-    """
-    
-    try:
-        response = gemini_model.generate_content(prompt)
-        return response.text
-    except Exception as e:
-        st.error(f"Error getting industry trends: {str(e)}")
-        return "Industry trends data unavailable."
+        st.download_button("Export JSON", metrics.to_json(cache_stats, startup_report()), file_name="diagnostics.json")
+        st.download_button("Export Prometheus", metrics.to_prometheus(cache_stats), file_name="metrics.prom")
+        if st.button("Reset metrics"):
+            metrics.reset()
 
 # Streamlit UI Configuration
 st.set_page_config(
@@ -483,18 +249,23 @@ st.markdown("The ultimate all-in-one job search toolkit ")
 with st.sidebar:
     st.header("📄 Resume Upload")
     uploaded_file = st.file_uploader("Upload Your Resume (PDF)", type="pdf", key="global_resume_uploader")
+    enrich_resume = st.checkbox("✨ Enrich with Gemini", value=False, help="Local parsing is instant; Gemini adds skills it may have missed")
     
-    if uploaded_file and (uploaded_file != st.session_state.uploaded_file):
+    # Only a digest of the upload is kept; the PDF itself is dropped once its text is extracted
+    resume_digest = file_digest(uploaded_file) if uploaded_file else None
+    if uploaded_file and (resume_digest != st.session_state.resume_digest):
         with st.spinner("Analyzing resume..."):
-            st.session_state.resume_text = extract_text_from_pdf(uploaded_file)
-            if st.session_state.resume_text:
-                st.session_state.resume_data = extract_skills_from_resume(st.session_state.resume_text)
-                st.session_state.uploaded_file = uploaded_file
+            artifacts["resume_text"] = extract_text_from_pdf(uploaded_file)
+            if artifacts.get("resume_text"):
+                st.session_state.resume_data = extract_skills_from_resume(artifacts["resume_text"], enrich=enrich_resume)
+                st.session_state.resume_digest = resume_digest
                 st.session_state.resume_uploaded = True
                 st.success("Resume analyzed successfully!")
             else:
                 st.error("Failed to process resume")
 
+resume_text = artifacts.get("resume_text", "")
+
 # Main Tabs
 tab1, tab2, tab3, tab4 = st.tabs(["🔍 Job Search", "📝 Resume Tools", "💼 Interview Prep", "🤝 Networking"])
 
@@ -538,110 +309,190 @@ with tab1:  # Job Search Tab
         if st.button("🚀 Start Smart Search", use_container_width=True, type="primary"):
             st.session_state.search_triggered = True
             st.session_state.search_time = datetime.now().strftime("%Y-%m-%d %H:%M")
+            # An explicit search always refreshes results, even with unchanged inputs
+            st.session_state.derived_artifacts.pop("search_results", None)
+        
+        pack_artifacts = application_pack_artifacts(
+            resume_text, st.session_state.job_description, st.session_state.target_company
+        )
+        if st.button("📦 Generate Application Pack", use_container_width=True, disabled=not pack_artifacts,
+                     help="Optimized resume, cover letter, ATS keywords, interview questions and company research at once"):
+            run_application_pack(pack_artifacts)
+        elif st.session_state.application_pack:
+            ready = sum(entry["status"] == "done" for entry in st.session_state.application_pack.values())
+            st.caption(f"📦 Application pack: {ready}/{len(st.session_state.application_pack)} ready in the Resume Tools and Interview Prep tabs")
 
     # Display search results
     if st.session_state.search_triggered:
-        with st.spinner(f"Searching across {len(platforms)} platforms..."):
-            jobs = search_jobs(st.session_state.job_title, locations, experience, selected_skills, platforms)
+        with metrics.track("render_search_results"):
+            search_inputs = [st.session_state.job_title, locations, experience, selected_skills, platforms]
         
-        if jobs:
-            time_display = f"(Updated: {st.session_state.search_time})" if st.session_state.search_time else ""
-            st.success(f"Found {len(jobs)} matching jobs {time_display}")
-            
-            # Display in tabs by platform
-            tab_names = list({job['platform'] for job in jobs})
-            tabs = st.tabs([f"{platform} 🔍" for platform in tab_names])
+            def run_search():
+                with st.status(f"Searching across {len(platforms)} platforms...", expanded=False) as status:
+                    def report(result, found):
+                        task = result.task
+                        if result.error:
+                            status.write(f"⚠️ {task.platform} · {task.location}: failed")
+                        elif result.cached:
+                            status.write(f"💾 {task.platform} · {task.location}: {len(result.postings)} stored postings")
+                        else:
+                            status.write(f"✅ {task.platform} · {task.location}: {len(result.postings)} postings ({result.elapsed:.1f}s)")
+                        status.update(label=f"Found {found} postings so far...")
+                
+                    found_jobs = search_jobs(*search_inputs, on_progress=report, resume_text=resume_text)
+                    status.update(label=f"Search complete: {len(found_jobs)} postings", state="complete")
+                return found_jobs
+        
+            jobs, jobs_computed_at, jobs_fresh = memoize_in_session(
+                "search_results", search_inputs + [resume_text], run_search
+            )
+        
+            if jobs:
+                time_display = f"(Updated: {st.session_state.search_time})" if st.session_state.search_time else ""
+                st.success(f"Found {len(jobs)} matching jobs {time_display}")
+                show_freshness(jobs_computed_at, jobs_fresh)
             
-            platform_tabs = {platform: tab for platform, tab in zip(tab_names, tabs)}
+                user_profile = {
+                    "experience": experience,
+                    "skills": selected_skills,
+                    "resume_titles": st.session_state.resume_data.get('job_titles', []),
+                    "resume_skills": base_skills
+                }
             
-            for job in sorted(jobs, key=lambda x: -x['match_score']):
-                with platform_tabs[job['platform']]:
-                    with st.expander(f"🌟 {job['match_score']:.0f}% | {job['title']} at {job['company']} | {job['location']} | 💰 {job['salary']}", expanded=False):
-                        col1, col2 = st.columns([3, 1])
-                        with col1:
-                            st.markdown(f"""
-                            **📌 Position:** {job['title']}  
-                            **🏢 Company:** {job['company']}  
-                            **📍 Location:** {job['location']}  
-                            **📅 Experience:** {job['experience']}  
-                            **💰 Salary Range:** {job['salary']}  
-                            **🛠️ Key Skills:** {", ".join(job['skills'])}  
-                            **📅 Posted:** {job.get('posted_date', 'Recently')}
-                            """)
-                            
-                            st.link_button("View Job Posting", job['url'])
+                # Batch analysis of the best matches
+                batch_col1, batch_col2 = st.columns([1, 3])
+                with batch_col1:
+                    top_k = st.number_input("Analyze top", min_value=1, max_value=len(jobs), value=min(10, len(jobs)), step=1)
+                with batch_col2:
+                    st.write("")
+                    if st.button(f"🤖 Analyze top {top_k} jobs", use_container_width=True):
+                        pending = [job for job in jobs[:top_k] if f'analysis:{job["url"]}' not in artifacts]
+                        if pending:
+                            progress = st.progress(0.0, text=f"Analyzing {len(pending)} jobs...")
                         
-                        with col2:
-                            if st.button("🤖 AI Analysis", key=f"analyze_{job['url']}"):
-                                user_profile = {
-                                    "experience": experience,
-                                    "skills": selected_skills,
-                                    "resume_titles": st.session_state.resume_data.get('job_titles', []),
-                                    "resume_skills": base_skills
-                                }
-                                with st.spinner("Generating deep analysis..."):
-                                    analysis = analyze_job_with_gemini(job, user_profile)
-                                    st.session_state[f'analysis_{job["url"]}'] = analysis
+                            def report_analysis(job, done, error):
+                                status = "⚠️ failed" if error else "done"
+                                progress.progress(done / len(pending), text=f"{done}/{len(pending)} · {job['title']} at {job['company']} {status}")
                         
-                        if f'analysis_{job["url"]}' in st.session_state:
-                            st.markdown("---")
-                            st.markdown(st.session_state[f'analysis_{job["url"]}'])
+                            analyzed = analyze_jobs_batch(pending, user_profile, on_result=report_analysis)
+                            progress.empty()
+                            st.success(f"Analyzed {analyzed} jobs — open a posting to read its report")
+                        else:
+                            st.info("All selected jobs are already analyzed")
             
-            # Industry Insights Section
-            st.header("📊 Market Intelligence")
-            with st.spinner("Generating industry insights..."):
-                trends = get_industry_trends(st.session_state.job_title.split()[0], locations[0])
+                # One platform, one page of the sorted and filtered results is rendered per rerun
+                counts = platform_counts(jobs)
+                platform = st.radio(
+                    "Platform", [ALL_PLATFORMS] + sorted(counts), horizontal=True, key="results_platform",
+                    format_func=lambda name: f"{name} 🔍 ({counts.get(name, len(jobs))})"
+                )
+                sort_col, score_col, salary_col, location_col = st.columns(4)
+                with sort_col:
+                    order = st.selectbox("Sort by", list(SORT_ORDERS), key="results_order")
+                with score_col:
+                    min_score = st.slider("Min match %", 0, 100, 0, step=5, key="results_min_score")
+                with salary_col:
+                    min_salary = st.number_input("Min salary (LPA)", min_value=0, value=0, step=1, key="results_min_salary")
+                with location_col:
+                    shown_locations = st.multiselect("Location", sorted({job["location"] for job in jobs}), key="results_locations")
+                
+                visible = sort_postings(filter_postings(jobs, platform, min_score, min_salary, shown_locations), order)
+                # Changing the view starts again from the first page
+                view = (platform, order, min_score, min_salary, tuple(shown_locations), len(jobs))
+                if st.session_state.get("results_view") != view:
+                    st.session_state.results_view = view
+                    st.session_state.results_page = 1
+                page_jobs, page, pages = paginate(visible, st.session_state.get("results_page", 1))
+                
+                for job in page_jobs:
+                    render_posting(job, user_profile)
+                
+                if visible:
+                    prev_col, page_col, next_col = st.columns([1, 2, 1])
+                    with prev_col:
+                        st.button("◀ Previous", disabled=page <= 1, use_container_width=True,
+                                  on_click=lambda: st.session_state.update(results_page=page - 1))
+                    with page_col:
+                        st.caption(f"Page {page} of {pages} · {len(visible)} of {len(jobs)} postings")
+                    with next_col:
+                        st.button("Next ▶", disabled=page >= pages, use_container_width=True,
+                                  on_click=lambda: st.session_state.update(results_page=page + 1))
+                else:
+                    st.info("No postings match these filters")
+            
+                # Industry Insights Section
+                st.header("📊 Market Intelligence")
+                industry, trends_location = st.session_state.job_title.split()[0], locations[0]
+                trends, trends_computed_at, trends_fresh = memoize_in_session(
+                    "industry_trends",
+                    [industry, trends_location],
+                    lambda: get_industry_trends(industry, trends_location),
+                    spinner_text="Generating industry insights..."
+                )
+                show_freshness(trends_computed_at, trends_fresh)
                 st.markdown(trends)
-        else:
-            st.warning("No matching jobs found. Try adjusting your search criteria.")
+            else:
+                st.warning("No matching jobs found. Try adjusting your search criteria.")
 
 with tab2:  # Resume Tools Tab
     st.header("📝 Resume Optimization Toolkit")
     
-    if st.session_state.resume_uploaded and st.session_state.resume_text:
+    if st.session_state.resume_uploaded and resume_text:
         col1, col2 = st.columns(2)
         
         with col1:
             st.subheader("Original Resume")
-            st.text_area("Original Resume Content", st.session_state.resume_text, height=400, disabled=True)
+            st.text_area("Original Resume Content", resume_text, height=400, disabled=True)
         
         with col2:
             st.subheader("Optimized Version")
             if st.session_state.job_description:
                 if st.button("✨ Optimize Resume"):
-                    with st.spinner("Enhancing your resume..."):
-                        st.session_state.optimized_resume = optimize_resume(st.session_state.resume_text, st.session_state.job_description)
+                    with st.spinner("Enhancing your resume..."), streaming_output() as on_chunk:
+                        artifacts["optimized_resume"] = optimize_resume(resume_text, st.session_state.job_description, on_chunk)
                 
-                if st.session_state.optimized_resume:
-                    st.markdown(st.session_state.optimized_resume)
+                if artifacts.get("optimized_resume"):
+                    st.markdown(artifacts["optimized_resume"])
                     st.download_button(
                         "Download Optimized Resume",
-                        st.session_state.optimized_resume,
+                        artifacts["optimized_resume"],
                         file_name="optimized_resume.md"
                     )
                 
                 st.subheader("ATS Keywords")
-                keywords = suggest_ats_keywords(st.session_state.job_description)
+                keywords, keywords_computed_at, keywords_fresh = memoize_in_session(
+                    "ats_keywords",
+                    [st.session_state.job_description],
+                    lambda: suggest_ats_keywords(st.session_state.job_description),
+                    spinner_text="Extracting ATS keywords..."
+                )
+                show_freshness(keywords_computed_at, keywords_fresh)
                 st.write("Important keywords to include:")
                 st.write(", ".join(keywords))
+                missing = missing_keywords(keywords, resume_text)
+                if missing:
+                    st.markdown(f"**Missing from your resume ({len(missing)}/{len(keywords)}):** {', '.join(missing)}")
+                elif keywords:
+                    st.success("Your resume already mentions every keyword")
             else:
                 st.warning("Please enter a job description in the Job Search tab")
             
             st.subheader("Cover Letter Generator")
             if st.session_state.target_company:
                 if st.button("✍️ Generate Cover Letter"):
-                    with st.spinner("Crafting your perfect cover letter..."):
-                        st.session_state.cover_letter = generate_cover_letter(
-                            st.session_state.resume_text,
+                    with st.spinner("Crafting your perfect cover letter..."), streaming_output() as on_chunk:
+                        artifacts["cover_letter"] = generate_cover_letter(
+                            resume_text,
                             st.session_state.job_description,
-                            st.session_state.target_company
+                            st.session_state.target_company,
+                            on_chunk
                         )
                 
-                if st.session_state.cover_letter:
-                    st.markdown(st.session_state.cover_letter)
+                if artifacts.get("cover_letter"):
+                    st.markdown(artifacts["cover_letter"])
                     st.download_button(
                         "Download Cover Letter",
-                        st.session_state.cover_letter,
+                        artifacts["cover_letter"],
                         file_name="cover_letter.md"
                     )
             else:
@@ -652,7 +503,7 @@ with tab2:  # Resume Tools Tab
 with tab3:  # Interview Prep Tab
     st.header("💼 Interview Preparation")
     
-    if st.session_state.resume_uploaded and st.session_state.resume_text:
+    if st.session_state.resume_uploaded and resume_text:
         col1, col2 = st.columns(2)
         
         with col1:
@@ -660,36 +511,57 @@ with tab3:  # Interview Prep Tab
             if st.session_state.job_description:
                 if st.button("🧠 Generate Questions"):
                     with st.spinner("Creating relevant questions..."):
-                        st.session_state.interview_questions = generate_interview_questions(st.session_state.job_description)
+                        artifacts["interview_questions"] = generate_interview_questions(st.session_state.job_description)
                 
-                if st.session_state.interview_questions:
-                    st.markdown(st.session_state.interview_questions)
+                if artifacts.get("interview_questions"):
+                    st.markdown(artifacts["interview_questions"])
             else:
                 st.warning("Please enter a job description in the Job Search tab")
         
         with col2:
             st.subheader("Mock Interview")
-            if st.session_state.interview_questions:
-                if st.button("🎤 Start Mock Interview"):
-                    with st.spinner("Setting up your interview..."):
-                        st.session_state.mock_interview = conduct_mock_interview(
-                            st.session_state.interview_questions,
-                            st.session_state.resume_text
-                        )
+            if artifacts.get("interview_questions"):
+                if st.button("🎤 Start Mock Interview" if "mock_interview" not in artifacts else "🔄 Restart Mock Interview"):
+                    artifacts["mock_interview"] = MockInterview(
+                        artifacts["interview_questions"],
+                        resume_text,
+                        st.session_state.job_description
+                    )
                 
-                if st.session_state.mock_interview:
-                    st.markdown(st.session_state.mock_interview)
+                interview = artifacts.get("mock_interview")
+                if interview and not interview.questions:
+                    st.warning("Couldn't find questions to ask; try generating them again")
+                elif interview:
+                    for number, turn in enumerate(interview.turns, start=1):
+                        st.chat_message("assistant").markdown(f"**Question {number}:** {turn['question']}")
+                        st.chat_message("user").markdown(turn["answer"])
+                        st.chat_message("assistant").markdown(turn["feedback"])
+                    
+                    if interview.finished:
+                        st.success(f"Interview complete: {len(interview.turns)} questions answered")
+                    else:
+                        number = len(interview.turns) + 1
+                        st.chat_message("assistant").markdown(f"**Question {number} of {len(interview.questions)}:** {interview.current_question}")
+                        answer = st.chat_input("Your answer", key="interview_answer")
+                        if answer:
+                            st.chat_message("user").markdown(answer)
+                            with st.chat_message("assistant"), streaming_output() as on_chunk:
+                                feedback = interview.answer(answer, on_chunk)
+                            if feedback is not None:
+                                # Stored again so the grown transcript is re-measured against the session budget
+                                artifacts["mock_interview"] = interview
+                                st.rerun()
             else:
                 st.warning("Please generate questions first")
         
         st.subheader("Company Research")
         if st.session_state.target_company:
             if st.button("🏢 Generate Company Report"):
-                with st.spinner("Researching company..."):
-                    st.session_state.company_research = generate_company_research(st.session_state.target_company)
+                with st.spinner("Researching company..."), streaming_output() as on_chunk:
+                    artifacts["company_research"] = generate_company_research(st.session_state.target_company, on_chunk)
             
-            if st.session_state.company_research:
-                st.markdown(st.session_state.company_research)
+            if artifacts.get("company_research"):
+                st.markdown(artifacts["company_research"])
         else:
             st.warning("Please enter a target company in the Job Search tab")
     else:
@@ -703,13 +575,13 @@ with tab4:  # Networking Tab
             st.subheader("LinkedIn Connection Suggestions")
             if st.button("👥 Get Connection Suggestions"):
                 with st.spinner("Finding relevant connections..."):
-                    st.session_state.connections = suggest_linkedin_connections(
+                    artifacts["connections"] = suggest_linkedin_connections(
                         st.session_state.target_company,
                         st.session_state.job_title
                     )
             
-            if st.session_state.connections:
-                st.markdown(st.session_state.connections)
+            if artifacts.get("connections"):
+                st.markdown(artifacts["connections"])
             
             st.subheader("Outreach Templates")
             connection_type = st.selectbox(
@@ -720,20 +592,20 @@ with tab4:  # Networking Tab
             
             if st.button("📩 Generate Outreach Message"):
                 with st.spinner("Creating template..."):
-                    st.session_state.outreach_template = generate_outreach_template(
+                    artifacts["outreach_template"] = generate_outreach_template(
                         connection_type,
                         st.session_state.target_company
                     )
             
-            if st.session_state.outreach_template:
+            if artifacts.get("outreach_template"):
                 customized_message = st.text_area(
                     "Customize your outreach message:", 
-                    st.session_state.outreach_template, 
+                    artifacts["outreach_template"], 
                     height=200,
                     key="outreach_msg"
                 )
                 if st.button("💾 Save Customized Message"):
-                    st.session_state.outreach_template = customized_message
+                    artifacts["outreach_template"] = customized_message
                     st.success("Message saved! Copy it to LinkedIn")
         else:
             st.warning("Please enter target company and job title in the Job Search tab")
@@ -744,5 +616,9 @@ with tab4:  # Networking Tab
 st.markdown("---")
 st.caption("""
 ℹ️ AI Job Hunting Assistant Pro+ v2.0 
-🔒 Your data is processed securely and not stored permanently
+🔒 Your data is processed securely; resume text and results that overflow memory are cached on this server only until your session ends
 """)
+
+metrics.observe("rerun", (time.perf_counter() - rerun_started) * 1000)
+if DIAGNOSTICS_ENABLED:
+    render_diagnostics()
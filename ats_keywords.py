@@ -0,0 +1,265 @@
+"""Local ATS keyword extraction ranked against a corpus of every scraped posting.
+
+Candidates are RAKE-style phrases: runs of content words between stopwords and punctuation, cut
+into n-grams. Each is scored by its frequency in the job description, its inverse document
+frequency over the corpus (so boilerplate every posting repeats sinks) and its RAKE word degree,
+with a boost for known skills. Document frequencies live in SQLite and grow with each saved posting;
+job descriptions being ranked are not added, so repeated edits of one draft don't skew them.
+"""
+import hashlib
+import math
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import Counter
+
+from posting_store import LOCATION_ALIASES
+from resume_parser import AMBIGUOUS_SPELLINGS, SKILL_ALIASES, SOFT_SKILLS, TECHNICAL_SKILLS, TOKEN_PATTERN, SkillMatcher
+
+KEYWORD_INDEX_PATH = os.getenv("KEYWORD_INDEX_PATH", os.path.join(".cache", "keywords.sqlite3"))
+ATS_KEYWORD_COUNT = int(os.getenv("ATS_KEYWORD_COUNT", "20"))
+# Longest phrase considered a single keyword, in words
+ATS_MAX_NGRAM = int(os.getenv("ATS_MAX_NGRAM", "3"))
+KNOWN_SKILL_BOOST = 2.0
+
+# English stopwords, job-ad boilerplate and place names (where the job is, not what it asks for)
+STOPWORDS = set("""
+a about above after again against all also am an and any are as at be because been before being below between
+both but by can could did do does doing down during each etc few for from further had has have having he her
+here hers him his how i if in into is it its itself just me more most my no nor not now of off on once only or
+other our ours out over own per same she should so some such than that the their theirs them then there these
+they this those through to too under until up upon us very via was we were what when where which while who whom
+why will with within without would you your yours
+""".split()) | set("""
+ability able across benefits candidate candidates company competitive day desired duties etc excellent
+experience flexible good great hands-on hire hiring hours ideal including insurance job join key knowledge location
+looking must need new nice offer office opportunity perks plus preferred proven related required requirement
+requirements responsibilities responsible role salary seeking skills strong successful team understanding
+using well work working year years
+build building built collaborate create creating deliver design designing develop developing drive ensure
+help helping implement implementing maintain make own support want write writing
+""".split()) | set("""
+ahmedabad anywhere bangalore bengaluru chandigarh chennai coimbatore delhi gurgaon gurugram hybrid hyderabad india
+indore jaipur kochi kolkata mumbai noida onsite pune remote thiruvananthapuram trivandrum
+""".split()) | {place for pair in LOCATION_ALIASES.items() for place in pair if " " not in place}
+PHRASE_BREAK = re.compile(r"[,;:!?()\[\]{}|\n\r\t•*·–—\"']|\.(?=\s|$)|\s[-/&]\s")
+
+_SKILL_MATCHER = SkillMatcher(TECHNICAL_SKILLS + SOFT_SKILLS, SKILL_ALIASES)
+# Known skill phrase (tokenized, lower case) -> canonical spelling
+_KNOWN_SKILLS = {
+    " ".join(token.lower() for token in TOKEN_PATTERN.findall(phrase)): canonical
+    for phrase, canonical in [(skill, skill) for skill in TECHNICAL_SKILLS + SOFT_SKILLS] + list(SKILL_ALIASES.items())
+}
+
+
+def _is_content(token):
+    return token not in STOPWORDS and re.search("[a-z]", token) and (len(token) > 1 or token in {"c", "r"})
+
+
+def phrases(text):
+    """Runs of content words, as (lower-case tokens, original tokens), split at punctuation and stopwords"""
+    runs = []
+    for piece in PHRASE_BREAK.split(text or ""):
+        run = []
+        for token in TOKEN_PATTERN.findall(piece):
+            if _is_content(token.lower()):
+                run.append(token)
+            elif run:
+                runs.append(run)
+                run = []
+        if run:
+            runs.append(run)
+    return [([token.lower() for token in run], run) for run in runs]
+
+
+def candidates(text, max_ngram=ATS_MAX_NGRAM):
+    """(term counts, surface forms per term, RAKE degree/frequency per word, whole short phrases) for text"""
+    counts = Counter()
+    surfaces = {}
+    frequency = Counter()
+    degree = Counter()
+    whole = set()
+    for words, originals in phrases(text):
+        if len(words) <= max_ngram:
+            whole.add(" ".join(words))
+        for word in words:
+            frequency[word] += 1
+            degree[word] += min(len(words), max_ngram)
+        for size in range(1, max_ngram + 1):
+            for start in range(len(words) - size + 1):
+                term = " ".join(words[start:start + size])
+                counts[term] += 1
+                surfaces.setdefault(term, Counter())[" ".join(originals[start:start + size])] += 1
+    word_scores = {word: degree[word] / frequency[word] for word in frequency}
+    return counts, surfaces, word_scores, whole
+
+
+def known_skill(term, surfaces):
+    """Canonical skill for term; an ambiguous one (e.g. "rest") only when spelled as the skill in text"""
+    if term in AMBIGUOUS_SPELLINGS and AMBIGUOUS_SPELLINGS[term] not in surfaces[term]:
+        return None
+    return _KNOWN_SKILLS.get(term)
+
+
+def display_form(term, surfaces):
+    return known_skill(term, surfaces) or surfaces[term].most_common(1)[0][0]
+
+
+def distinct_forms(terms, surfaces):
+    """Display forms of terms in order, once per spelling (an alias and its skill show up once)"""
+    forms = {}
+    for term in terms:
+        form = display_form(term, surfaces)
+        forms.setdefault(form.lower(), form)
+    return list(forms.values())
+
+
+def missing_keywords(keywords, resume_text):
+    """Keywords that appear in the resume neither verbatim nor as the same known skill"""
+    tokens = " " + " ".join(token.lower() for token in TOKEN_PATTERN.findall(resume_text or "")) + " "
+    skills = {skill.lower() for skill in _SKILL_MATCHER.find_in_resume(resume_text or "")}
+    missing = []
+    for keyword in keywords:
+        phrase = " ".join(token.lower() for token in TOKEN_PATTERN.findall(keyword))
+        canonical = {skill.lower() for skill in _SKILL_MATCHER.find(keyword)}
+        if f" {phrase} " in tokens or (canonical and canonical <= skills):
+            continue
+        missing.append(keyword)
+    return missing
+
+
+def posting_text(posting):
+    """A scraped posting as keyword-corpus text: title and listed skills, one phrase each"""
+    return ", ".join([posting.get("title") or ""] + [str(skill) for skill in posting.get("skills") or ()])
+
+
+class KeywordIndex:
+    """Persistent document frequencies of candidate terms over every job description and posting added"""
+
+    def __init__(self, path=KEYWORD_INDEX_PATH, max_ngram=ATS_MAX_NGRAM):
+        self.path = path
+        self.max_ngram = max_ngram
+        self._lock = threading.Lock()
+
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS documents (
+                hash TEXT PRIMARY KEY,
+                kind TEXT NOT NULL,
+                added_at REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS terms (
+                term TEXT PRIMARY KEY,
+                docs INTEGER NOT NULL
+            ) WITHOUT ROWID;
+            """
+        )
+        self._conn.commit()
+        self.documents = self._conn.execute("SELECT COUNT(*) FROM documents").fetchone()[0]
+
+    def add_many(self, texts, kind="job_description"):
+        """Count each unseen text's distinct terms once; return how many texts were new"""
+        added = 0
+        with self._lock:
+            for text in texts:
+                digest = hashlib.sha1(" ".join((text or "").lower().split()).encode("utf-8")).hexdigest()
+                terms = candidates(text, self.max_ngram)[0]
+                if not terms or self._conn.execute("SELECT 1 FROM documents WHERE hash = ?", (digest,)).fetchone():
+                    continue
+                self._conn.execute("INSERT INTO documents (hash, kind, added_at) VALUES (?, ?, ?)", (digest, kind, time.time()))
+                self._conn.executemany(
+                    "INSERT INTO terms (term, docs) VALUES (?, 1) ON CONFLICT(term) DO UPDATE SET docs = docs + 1",
+                    [(term,) for term in terms]
+                )
+                added += 1
+            if added:
+                self._conn.commit()
+                self.documents += added
+        return added
+
+    def add(self, text, kind="job_description"):
+        return self.add_many([text], kind) == 1
+
+    def add_postings(self, postings):
+        return self.add_many([posting_text(posting) for posting in postings], kind="posting")
+
+    def document_frequencies(self, terms):
+        terms = list(terms)
+        frequencies = {}
+        with self._lock:
+            # SQLite caps bound parameters per statement
+            for start in range(0, len(terms), 500):
+                chunk = terms[start:start + 500]
+                placeholders = ",".join("?" * len(chunk))
+                frequencies.update(self._conn.execute(
+                    f"SELECT term, docs FROM terms WHERE term IN ({placeholders})", chunk
+                ).fetchall())
+        return frequencies
+
+    def extract(self, text, limit=ATS_KEYWORD_COUNT, learn=False):
+        """Top keywords in text, best first; learn adds text to the corpus first"""
+        if learn:
+            self.add(text)
+        counts, surfaces, word_scores, whole = candidates(text, self.max_ngram)
+        frequencies = self.document_frequencies(counts)
+        documents = max(self.documents, 1)
+
+        # A multi-word candidate must be a whole phrase or recur, in this text or elsewhere in the corpus
+        eligible = {
+            term: count for term, count in counts.items()
+            if " " not in term or term in _KNOWN_SKILLS or term in whole or count >= 2 or frequencies.get(term, 0) >= 1
+        }
+        # Words that only ever occur inside a longer eligible phrase are represented by it, unless they are skills
+        covered = set()
+        for phrase, count in eligible.items():
+            words = phrase.split()
+            for size in range(1, len(words)):
+                for start in range(len(words) - size + 1):
+                    part = " ".join(words[start:start + size])
+                    if eligible.get(part, count + 1) <= count and part not in _KNOWN_SKILLS:
+                        covered.add(part)
+        scored = []
+        for term, count in eligible.items():
+            if term in covered:
+                continue
+            words = term.split()
+            idf = math.log((documents + 1) / (frequencies.get(term, 0) + 1)) + 1
+            rake = 1 + math.log(sum(word_scores[word] for word in words) / len(words))
+            score = (1 + math.log(count)) * idf * rake * (KNOWN_SKILL_BOOST if known_skill(term, surfaces) else 1.0)
+            scored.append((score, term))
+        scored.sort(key=lambda item: (-item[0], item[1]))
+
+        def wins(longer, shorter):
+            # Of two overlapping terms the longer is kept, unless only the shorter is a known skill
+            return bool(known_skill(longer, surfaces)) or not known_skill(shorter, surfaces)
+
+        selected = []
+        for _, term in scored:
+            # Overlapping terms are resolved the same way whichever of the two was selected first
+            if any(f" {term} " in f" {chosen} " and wins(chosen, term) for chosen in selected):
+                continue
+            if any(f" {chosen} " in f" {term} " and not wins(term, chosen) for chosen in selected):
+                continue
+            beaten = [
+                i for i, chosen in enumerate(selected) if f" {chosen} " in f" {term} " or f" {term} " in f" {chosen} "
+            ]
+            if beaten:
+                selected[beaten[0]] = term
+                selected = [chosen for i, chosen in enumerate(selected) if i not in beaten[1:]]
+            else:
+                selected.append(term)
+            if len(distinct_forms(selected, surfaces)) >= limit:
+                break
+        return distinct_forms(selected, surfaces)[:limit]
+
+    def stats(self):
+        with self._lock:
+            terms = self._conn.execute("SELECT COUNT(*) FROM terms").fetchone()[0]
+            kinds = dict(self._conn.execute("SELECT kind, COUNT(*) FROM documents GROUP BY kind").fetchall())
+        return {"documents": self.documents, "terms": terms, "by_kind": kinds}
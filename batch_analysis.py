@@ -0,0 +1,22 @@
+"""Concurrent batch execution for per-job LLM analysis"""
+import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+ANALYSIS_WORKERS = int(os.getenv("ANALYSIS_WORKERS", "4"))
+
+
+def run_batch(items, worker, max_workers=ANALYSIS_WORKERS):
+    """Run worker(item) for every item on a thread pool, yielding (item, result, error) as each completes.
+
+    Gemini quota is enforced by the shared call scheduler, so workers don't rate-limit themselves.
+    """
+    if not items:
+        return
+
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(items)))) as executor:
+        futures = {executor.submit(worker, item): item for item in items}
+        for future in as_completed(futures):
+            try:
+                yield futures[future], future.result(), None
+            except Exception as e:
+                yield futures[future], None, e
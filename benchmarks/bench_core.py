@@ -0,0 +1,238 @@
+"""Offline end-to-end benchmark of the core pipeline against deterministic fake backends.
+
+Runs the real core.py helpers with FakeGenerativeModel / FakeFirecrawlApp in place of
+the network clients, so results are reproducible and cost no quota.
+
+    python benchmarks/bench_core.py [--scenarios search_jobs full_pipeline] [--iterations 20]
+        [--concurrency 4] [--first-token-ms 20] [--per-token-ms 0.5] [--jitter 0.2]
+        [--distribution lognormal] [--error-rate 0.05] [--rate-per-minute 600] [--retries 4]
+        [--cache cold|warm]
+        [--json results.json] [--baseline previous.json --tolerance 0.25]
+
+With --baseline the run exits non-zero when any scenario's p95 latency regresses by
+more than --tolerance, so it can gate a deploy.
+"""
+import argparse
+import io
+import json
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Must be set before core is imported so search uses the fake scraper and the cache starts empty
+os.environ["FAKE_GEMINI"] = "1"
+os.environ["FAKE_FIRECRAWL"] = "1"
+_workdir = tempfile.mkdtemp(prefix="bench_core_")
+os.environ.setdefault("LLM_CACHE_PATH", os.path.join(_workdir, "llm_cache.sqlite3"))
+os.environ.setdefault("POSTING_STORE_PATH", os.path.join(_workdir, "postings.sqlite3"))
+os.environ.setdefault("VECTOR_CACHE_PATH", os.path.join(_workdir, "vectors.sqlite3"))
+os.environ.setdefault("KEYWORD_INDEX_PATH", os.path.join(_workdir, "keywords.sqlite3"))
+
+import core  # noqa: E402
+from diagnostics import metrics, percentile  # noqa: E402
+from fake_backends import (  # noqa: E402
+    FakeFirecrawlApp, FakeGenerativeModel, LatencyModel, synthetic_job_description, synthetic_resume_pdf,
+    synthetic_resume_text
+)
+from llm_scheduler import CallScheduler, TokenBucket  # noqa: E402
+from model_router import MODEL_TIERS  # noqa: E402
+from resources import (  # noqa: E402
+    get_llm_cache, get_llm_scheduler, get_model_router, get_pdf_text_cache, get_posting_store, override_resource
+)
+
+LOCATIONS = ["Bangalore", "Mumbai"]
+PLATFORMS = ["LinkedIn", "Naukri", "Indeed"]
+
+
+def discard(_text):
+    pass
+
+
+def scenario_pdf_extract(seed, inputs):
+    return core.extract_text_from_pdf(io.BytesIO(inputs["pdfs"][seed % len(inputs["pdfs"])]))
+
+
+def scenario_skills_local(seed, inputs):
+    return core.extract_skills_from_resume(synthetic_resume_text(seed))
+
+
+def scenario_skills_enriched(seed, inputs):
+    return core.extract_skills_from_resume(synthetic_resume_text(seed), enrich=True)
+
+
+def scenario_search_jobs(seed, inputs):
+    return core.search_jobs("Software Engineer", LOCATIONS, 3, inputs["profile"]["technical_skills"], PLATFORMS) or None
+
+
+def scenario_analyze_job(seed, inputs):
+    job = {"title": "Backend Developer", "company": f"Company {seed}", "skills": ["Python", "SQL"], "experience": "2-5 years"}
+    return core.analyze_job_with_gemini(job, inputs["profile"])
+
+
+def scenario_optimize_resume(seed, inputs):
+    return core.optimize_resume(synthetic_resume_text(seed), synthetic_job_description(seed), on_chunk=discard)
+
+
+def scenario_cover_letter(seed, inputs):
+    return core.generate_cover_letter(synthetic_resume_text(seed), synthetic_job_description(seed), f"Company {seed}",
+                                      on_chunk=discard)
+
+
+def scenario_interview_questions(seed, inputs):
+    return core.generate_interview_questions(synthetic_job_description(seed))
+
+
+def scenario_full_pipeline(seed, inputs):
+    """Upload -> parse -> search -> analyze the top three postings, as one user would"""
+    text = core.extract_text_from_pdf(io.BytesIO(inputs["pdfs"][seed % len(inputs["pdfs"])]))
+    profile = core.extract_skills_from_resume(text, enrich=True)
+    jobs = core.search_jobs("Software Engineer", LOCATIONS, profile["years_experience"], profile["technical_skills"],
+                            PLATFORMS)
+    analyses = [analysis for _, analysis, error in core.analyze_jobs_concurrently(jobs[:3], profile) if not error]
+    return analyses or None
+
+
+SCENARIOS = {
+    "pdf_extract": scenario_pdf_extract,
+    "skills_local": scenario_skills_local,
+    "skills_enriched": scenario_skills_enriched,
+    "search_jobs": scenario_search_jobs,
+    "analyze_job": scenario_analyze_job,
+    "optimize_resume": scenario_optimize_resume,
+    "cover_letter": scenario_cover_letter,
+    "interview_questions": scenario_interview_questions,
+    "full_pipeline": scenario_full_pipeline,
+}
+
+
+def add_backend_arguments(parser):
+    """Latency, error and quota settings for the fake backends, shared with bench_sessions.py"""
+    parser.add_argument("--first-token-ms", type=float, default=20.0)
+    parser.add_argument("--per-token-ms", type=float, default=0.5)
+    parser.add_argument("--per-prompt-token-ms", type=float, default=0.05, help="prefill cost per prompt token")
+    parser.add_argument("--fast-speedup", type=float, default=4.0, help="how much faster the fast model tier responds")
+    parser.add_argument("--scrape-ms", type=float, default=50.0)
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--distribution", choices=["fixed", "uniform", "lognormal"], default="fixed")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--rate-per-minute", type=float, default=0.0, help="Gemini quota; 0 disables the limiter")
+    parser.add_argument("--burst", type=int, default=5)
+    parser.add_argument("--retries", type=int, default=4)
+    parser.add_argument("--retry-base-ms", type=float, default=100.0)
+    parser.add_argument("--seed", type=int, default=0)
+
+
+def install_fakes(args):
+    latency = LatencyModel(args.first_token_ms / 1000, args.per_token_ms / 1000, args.jitter, args.distribution,
+                           seed=args.seed, per_prompt_token=args.per_prompt_token_ms / 1000)
+    override_resource("gemini_model", FakeGenerativeModel(MODEL_TIERS["pro"], latency=latency,
+                                                          error_rate=args.error_rate, seed=args.seed))
+    override_resource("gemini_model_fast", FakeGenerativeModel(MODEL_TIERS["fast"], latency=latency.scaled(1 / args.fast_speedup),
+                                                               error_rate=args.error_rate, seed=args.seed))
+    scrape_latency = LatencyModel(args.scrape_ms / 1000, 0.0, args.jitter, args.distribution, seed=args.seed)
+    override_resource("firecrawl_app", FakeFirecrawlApp(latency=scrape_latency, error_rate=args.error_rate,
+                                                        seed=args.seed))
+    # No quota by default so timings reflect the pipeline, not the limiter
+    limiter = TokenBucket(args.rate_per_minute, capacity=args.burst)
+    override_resource("llm_scheduler", CallScheduler(limiter, max_retries=args.retries,
+                                                     base_delay=args.retry_base_ms / 1000))
+
+
+def run_scenario(name, func, args, inputs):
+    """Run func args.iterations times on args.concurrency threads; return timing stats"""
+    if args.cache == "warm":
+        for seed in range(args.iterations):
+            func(seed, inputs)
+
+    def timed_call(seed):
+        if args.cache == "cold":
+            get_llm_cache().clear()
+            get_pdf_text_cache().clear()
+            get_posting_store().clear()
+        started = time.perf_counter()
+        try:
+            with core.collect_notices() as notices:
+                ok = func(seed, inputs) is not None
+            ok = ok and not any(notice["level"] == "error" for notice in notices)
+        except Exception:
+            ok = False
+        return (time.perf_counter() - started) * 1000, ok
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as executor:
+        outcomes = list(executor.map(timed_call, range(args.iterations)))
+    wall = time.perf_counter() - started
+
+    latencies = [elapsed for elapsed, _ in outcomes]
+    return {
+        "ops": len(outcomes),
+        "errors": sum(1 for _, ok in outcomes if not ok),
+        "throughput_ops_s": round(len(outcomes) / wall, 2) if wall else 0.0,
+        "p50_ms": round(percentile(latencies, 50), 2),
+        "p95_ms": round(percentile(latencies, 95), 2),
+        "p99_ms": round(percentile(latencies, 99), 2),
+        "max_ms": round(max(latencies), 2) if latencies else 0.0
+    }
+
+
+def compare(results, baseline, tolerance):
+    """Return scenarios whose p95 grew by more than tolerance over the baseline"""
+    regressions = []
+    for name, stats in results.items():
+        previous = baseline.get("results", {}).get(name)
+        if previous and previous["p95_ms"] and stats["p95_ms"] > previous["p95_ms"] * (1 + tolerance):
+            regressions.append((name, previous["p95_ms"], stats["p95_ms"]))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scenarios", nargs="+", choices=sorted(SCENARIOS), default=list(SCENARIOS))
+    parser.add_argument("--iterations", type=int, default=20)
+    parser.add_argument("--concurrency", type=int, default=1)
+    add_backend_arguments(parser)
+    parser.add_argument("--cache", choices=["cold", "warm"], default="cold")
+    parser.add_argument("--json", help="write results to this file")
+    parser.add_argument("--baseline", help="results file from an earlier run to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed p95 regression ratio")
+    args = parser.parse_args()
+
+    install_fakes(args)
+    inputs = {
+        "pdfs": [synthetic_resume_pdf(seed) for seed in range(8)],
+        "profile": core.extract_skills_from_resume(synthetic_resume_text(args.seed))
+    }
+
+    results = {}
+    print(f"{'scenario':<22}{'ops':>6}{'errors':>8}{'ops/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'max ms':>10}")
+    for name in args.scenarios:
+        stats = results[name] = run_scenario(name, SCENARIOS[name], args, inputs)
+        print(f"{name:<22}{stats['ops']:>6}{stats['errors']:>8}{stats['throughput_ops_s']:>10.2f}"
+              f"{stats['p50_ms']:>10.2f}{stats['p95_ms']:>10.2f}{stats['p99_ms']:>10.2f}{stats['max_ms']:>10.2f}")
+    print(f"scheduler: {get_llm_scheduler().stats()}")
+    for route, stats in get_model_router().stats().items():
+        print(f"route {route}: {stats['calls']} calls, {stats['avg_ms']:.1f} ms avg, {stats['fallbacks']} fallbacks, "
+              f"{stats['low_quality']} low quality")
+    for name, usage in metrics.snapshot()["prompts"].items():
+        print(f"prompt {name}: {usage['raw_tokens'] / usage['calls']:.0f} -> {usage['sent_tokens'] / usage['calls']:.0f} "
+              f"tokens/call ({usage['saved_pct']}% saved)")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"config": vars(args), "results": results}, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        for name, before, after in regressions:
+            print(f"REGRESSION {name}: p95 {before:.2f} ms -> {after:.2f} ms")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
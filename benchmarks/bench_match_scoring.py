@@ -0,0 +1,92 @@
+"""Benchmark the scalar and vectorized match scoring paths against the original per-posting loop.
+
+    python benchmarks/bench_match_scoring.py [--sizes 100 1000 10000 100000] [--repeat 3]
+
+rank_postings picks the scalar path below VECTORIZE_MIN_POSTINGS; use the crossover here to tune it.
+The legacy loop only intersects raw skill sets, while both engine paths also normalize case and
+compute IDF weights. Measured on a single-core dev box, the engine runs at about 0.7-0.8x the legacy loop
+below 500 postings (within 0.1-0.3 ms) and about 1.3-2x faster from 1k to 100k postings.
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import match_scoring  # noqa: E402
+from match_scoring import rank_postings  # noqa: E402
+
+SKILL_POOL = [
+    "Python", "Java", "SQL", "Machine Learning", "AWS", "Docker", "Kubernetes", "React", "Node.js",
+    "Go", "Spark", "Kafka", "TensorFlow", "PyTorch", "Azure", "Terraform", "Django", "Flask",
+    "PostgreSQL", "MongoDB", "Redis", "GraphQL", "TypeScript", "C++", "Scala", "Airflow", "Tableau"
+] + [f"Niche Skill {i}" for i in range(400)]
+PLATFORMS = ["Naukri", "Indeed", "Monster", "LinkedIn", "PayScale"]
+
+
+def synthetic_postings(n, seed=7):
+    rng = random.Random(seed)
+    return [{
+        "title": f"Engineer {i}",
+        "skills": rng.sample(SKILL_POOL, rng.randint(3, 8)),
+        "experience": f"{rng.randint(0, 12)}+ years",
+        "platform": rng.choice(PLATFORMS),
+        "url": f"https://example.com/jobs/{i}"
+    } for i in range(n)]
+
+
+def legacy_rank(postings, skills, experience):
+    """The per-posting set arithmetic search_jobs used before vectorization"""
+    for posting in postings:
+        skills_match = len(set(skills) & set(posting["skills"])) / len(posting["skills"]) * 100
+        exp_match = 100 - abs(experience - int(posting["experience"].split("+")[0])) * 10
+        posting["match_score"] = min(100, (skills_match * 0.7 + exp_match * 0.3))
+    return sorted(postings, key=lambda x: (-x["match_score"], x["platform"]))
+
+
+def forced(path, fn):
+    """Run fn with rank_postings pinned to the "scalar" or "vectorized" path"""
+    threshold = match_scoring.VECTORIZE_MIN_POSTINGS
+    match_scoring.VECTORIZE_MIN_POSTINGS = float("inf") if path == "scalar" else 0
+    try:
+        return fn()
+    finally:
+        match_scoring.VECTORIZE_MIN_POSTINGS = threshold
+
+
+def best_of(fn, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1_000, 10_000, 100_000])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--top-k", type=int, default=50)
+    args = parser.parse_args()
+
+    profile_skills = ["Python", "SQL", "Machine Learning", "AWS", "Docker"]
+    print(f"threshold: vectorized from {match_scoring.VECTORIZE_MIN_POSTINGS} postings")
+    print(f"{'postings':>10} {'legacy ms':>10} {'scalar ms':>10} {'vectorized ms':>14} {'auto ms':>9} {'top-k ms':>9} "
+          f"{'speedup':>8}")
+    for size in args.sizes:
+        postings = synthetic_postings(size)
+        legacy = best_of(lambda: legacy_rank(postings, profile_skills, 3), args.repeat)
+        scalar = best_of(lambda: forced("scalar", lambda: rank_postings(postings, profile_skills, 3)), args.repeat)
+        vectorized = best_of(lambda: forced("vectorized", lambda: rank_postings(postings, profile_skills, 3)),
+                             args.repeat)
+        auto = best_of(lambda: rank_postings(postings, profile_skills, 3), args.repeat)
+        top_k = best_of(lambda: rank_postings(postings, profile_skills, 3, top_k=args.top_k), args.repeat)
+        print(f"{size:>10} {legacy * 1000:>10.1f} {scalar * 1000:>10.1f} {vectorized * 1000:>14.1f} {auto * 1000:>9.1f} "
+              f"{top_k * 1000:>9.1f} {legacy / auto:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
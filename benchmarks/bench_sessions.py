@@ -0,0 +1,294 @@
+"""Headless multi-session load test of app.py against the fake Gemini/Firecrawl backends.
+
+Each simulated user drives its own AppTest session through a realistic flow: upload a resume,
+fill in the job details, search, page through results, analyze the top matches, optimize the
+resume, generate interview questions and answer a mock interview, with think time between
+steps. All sessions share this process, as they would one Streamlit server, so their reruns
+contend for the same interpreter, quota and caches. The run steps through increasing session
+counts and reports rerun latency percentiles, throughput and where the process saturates.
+
+    python benchmarks/bench_sessions.py [--sessions 1 2 4 8 16] [--flows 1] [--think-ms 300]
+        [--analyze-top 3] [--answers 2] [--slo-ms 2000] [--min-scaling 0.25]
+        [--first-token-ms 20] [--per-token-ms 0.5] [--rate-per-minute 0] ...
+        [--json results.json]
+
+A level is saturated when adding sessions buys less than --min-scaling of the proportional
+throughput gain, or when its p95 rerun latency exceeds --slo-ms.
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Must be set before the app's modules are imported so every store starts empty and nothing warms in the background
+_workdir = tempfile.mkdtemp(prefix="bench_sessions_")
+os.environ["FAKE_GEMINI"] = "1"
+os.environ["FAKE_FIRECRAWL"] = "1"
+os.environ["REPORT_WARMUP"] = "0"
+for _name, _file in [("LLM_CACHE_PATH", "llm_cache"), ("POSTING_STORE_PATH", "postings"), ("REPORT_STORE_PATH", "reports"),
+                     ("VECTOR_CACHE_PATH", "vectors"), ("SESSION_SPILL_PATH", "session_spill"), ("KEYWORD_INDEX_PATH", "keywords")]:
+    os.environ.setdefault(_name, os.path.join(_workdir, f"{_file}.sqlite3"))
+
+from streamlit.testing.v1 import AppTest  # noqa: E402
+
+from bench_core import add_backend_arguments, install_fakes  # noqa: E402
+from diagnostics import percentile  # noqa: E402
+from fake_backends import synthetic_job_description, synthetic_resume_pdf  # noqa: E402
+from resources import (  # noqa: E402
+    get_artifact_registry, get_llm_cache, get_llm_scheduler, get_pdf_text_cache, get_posting_store
+)
+
+APP_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app.py")
+JOB_TITLES = ["Software Engineer", "Data Scientist", "Backend Developer", "DevOps Engineer", "Product Manager"]
+COMPANIES = ["Acme Corp", "Globex", "Initech", "Umbrella", "Stark Industries"]
+
+
+class StepFailed(Exception):
+    pass
+
+
+def share_runtime_across_sessions():
+    """Let AppTests run in parallel threads, the way sessions share one Streamlit server.
+
+    Each AppTest run installs a mock Runtime singleton and clears it when done, which pulls it
+    out from under sessions still running; fall back to one shared mock whenever that happens.
+    Each run also compiles the script afresh, and compiling in several threads at once can fail,
+    so compile it once per process like the server's script cache does.
+    """
+    from unittest.mock import MagicMock
+
+    from streamlit import config
+    from streamlit.components.v2.component_manager import BidiComponentManager
+    from streamlit.runtime import Runtime
+    from streamlit.runtime.caching.storage.dummy_cache_storage import MemoryCacheStorageManager
+    from streamlit.runtime.dataframe_source_manager import DataframeSourceManager
+    from streamlit.runtime.media_file_manager import MediaFileManager
+    from streamlit.runtime.memory_media_file_storage import MemoryMediaFileStorage
+    from streamlit.runtime.scriptrunner.script_cache import ScriptCache
+
+    shared = MagicMock(spec=Runtime)
+    shared.media_file_mgr = MediaFileManager(MemoryMediaFileStorage("/mock/media"))
+    shared.dataframe_source_mgr = DataframeSourceManager()
+    shared.cache_storage_manager = MemoryCacheStorageManager()
+    shared.bidi_component_registry = BidiComponentManager()
+    Runtime.instance = classmethod(lambda cls: cls._instance or shared)
+    Runtime.exists = classmethod(lambda cls: True)
+
+    compile_lock = threading.Lock()
+    compiled = {}
+    get_bytecode = ScriptCache.get_bytecode
+
+    def get_shared_bytecode(cache, script_path):
+        with compile_lock:
+            if script_path not in compiled:
+                compiled[script_path] = get_bytecode(cache, script_path)
+            return compiled[script_path]
+    ScriptCache.get_bytecode = get_shared_bytecode
+    # AppTest patches this option per run and restores it afterwards; keep it on between runs too
+    config.set_option("global.appTest", True)
+
+
+class SimulatedUser:
+    """One browser session: an AppTest driven step by step, with every rerun timed"""
+
+    def __init__(self, seed, args, record):
+        self.seed = seed
+        self.args = args
+        self.record = record
+        self.random = random.Random(seed)
+        self.app = AppTest.from_file(APP_PATH, default_timeout=args.timeout)
+
+    def think(self):
+        time.sleep(self.args.think_ms / 1000 * self.random.uniform(0.5, 1.5))
+
+    def step(self, name, interact=None):
+        """Apply an interaction (if any) and time the rerun it triggers"""
+        if interact is not None:
+            try:
+                interact(self.app)
+            except (KeyError, IndexError, StopIteration) as e:
+                self.record(name, 0.0, False)
+                raise StepFailed(f"{name}: widget missing ({e!r})")
+        started = time.perf_counter()
+        try:
+            self.app.run()
+            ok = not self.app.exception
+        except Exception:
+            ok = False
+        self.record(name, (time.perf_counter() - started) * 1000, ok)
+        if not ok:
+            raise StepFailed(name)
+        self.think()
+
+    def button(self, label):
+        for button in self.app.button:
+            if label in button.label and not button.disabled:
+                return button
+        return None
+
+    def click(self, name, label):
+        button = self.button(label)
+        if button is None:
+            self.record(name, 0.0, False)
+            raise StepFailed(f"{name}: no enabled '{label}' button")
+        self.step(name, lambda app: button.click())
+
+    def run_flow(self):
+        seed = self.seed
+        self.step("open")
+        self.step("upload", lambda app: app.file_uploader[0].set_value(
+            (f"resume_{seed}.pdf", synthetic_resume_pdf(seed), "application/pdf")
+        ))
+
+        def fill_details(app):
+            next(field for field in app.text_input if field.label == "Job Title").set_value(JOB_TITLES[seed % len(JOB_TITLES)])
+            next(field for field in app.text_input if field.label.startswith("Target Company")).set_value(
+                COMPANIES[seed % len(COMPANIES)]
+            )
+            next(field for field in app.text_area if field.label.startswith("Paste Job Description")).set_value(
+                synthetic_job_description(seed)
+            )
+        self.step("details", fill_details)
+
+        self.click("search", "Start Smart Search")
+        if self.button("Next ▶"):
+            self.click("next_page", "Next ▶")
+        self.step("pick_top", lambda app: next(field for field in app.number_input if field.label == "Analyze top").set_value(
+            self.args.analyze_top
+        ))
+        self.click("analyze", "Analyze top")
+        self.click("optimize", "Optimize Resume")
+        self.click("questions", "Generate Questions")
+        self.click("start_interview", "Start Mock Interview")
+        for number in range(self.args.answers):
+            self.step("answer", lambda app: app.chat_input(key="interview_answer").set_value(
+                f"In my last role I handled this by breaking the problem down and measuring the result (answer {number + 1})."
+            ))
+
+
+def summarize(samples):
+    latencies = [elapsed for elapsed, ok in samples if ok]
+    return {
+        "reruns": len(samples),
+        "errors": sum(1 for _, ok in samples if not ok),
+        "p50_ms": round(percentile(latencies, 50), 1),
+        "p95_ms": round(percentile(latencies, 95), 1),
+        "p99_ms": round(percentile(latencies, 99), 1),
+        "max_ms": round(max(latencies), 1) if latencies else 0.0,
+    }
+
+
+def run_level(sessions, args):
+    """Run `sessions` users concurrently, each completing args.flows flows; return stats for the level"""
+    get_llm_cache().clear()
+    get_pdf_text_cache().clear()
+    get_posting_store().clear()
+    lock = threading.Lock()
+    samples = {}
+    flows = {"completed": 0, "failed": 0}
+
+    def record(name, elapsed_ms, ok):
+        with lock:
+            samples.setdefault(name, []).append((elapsed_ms, ok))
+
+    def user(index):
+        for flow in range(args.flows):
+            seed = args.seed + sessions * 1000 + index * args.flows + flow
+            try:
+                SimulatedUser(seed, args, record).run_flow()
+                outcome = "completed"
+            except StepFailed:
+                outcome = "failed"
+            with lock:
+                flows[outcome] += 1
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=sessions) as executor:
+        list(executor.map(user, range(sessions)))
+    wall = time.perf_counter() - started
+
+    everything = [sample for step in samples.values() for sample in step]
+    return {
+        "sessions": sessions,
+        **summarize(everything),
+        "flows_completed": flows["completed"],
+        "flows_failed": flows["failed"],
+        "reruns_per_s": round(len(everything) / wall, 2),
+        "flows_per_min": round(flows["completed"] / wall * 60, 2),
+        "wall_s": round(wall, 1),
+        "steps": {name: summarize(step) for name, step in samples.items()},
+        "artifacts": get_artifact_registry().stats(),
+    }
+
+
+def find_saturation(levels, min_scaling, slo_ms):
+    """(sessions, reason) for the last level before throughput stops scaling or p95 breaks the SLO"""
+    for previous, current in zip(levels, levels[1:]):
+        if current["p95_ms"] > slo_ms:
+            return previous["sessions"], f"p95 {current['p95_ms']:.0f} ms > {slo_ms:.0f} ms at {current['sessions']} sessions"
+        expected = current["sessions"] / previous["sessions"] - 1
+        gained = current["reruns_per_s"] / previous["reruns_per_s"] - 1 if previous["reruns_per_s"] else 0.0
+        if expected > 0 and gained < min_scaling * expected:
+            return previous["sessions"], (
+                f"throughput +{gained:.0%} for +{expected:.0%} sessions at {current['sessions']} sessions"
+            )
+    return None, "not reached; try more sessions"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sessions", nargs="+", type=int, default=[1, 2, 4, 8, 16], help="concurrent session counts to step through")
+    parser.add_argument("--flows", type=int, default=1, help="flows each session runs back to back")
+    parser.add_argument("--think-ms", type=float, default=300.0, help="mean pause between a user's steps")
+    parser.add_argument("--analyze-top", type=int, default=3)
+    parser.add_argument("--answers", type=int, default=2, help="mock-interview questions answered per flow")
+    parser.add_argument("--timeout", type=float, default=120.0, help="seconds before a single rerun is abandoned")
+    parser.add_argument("--slo-ms", type=float, default=2000.0, help="p95 rerun latency considered acceptable")
+    parser.add_argument("--min-scaling", type=float, default=0.25,
+                        help="share of the proportional throughput gain below which a level counts as saturated")
+    add_backend_arguments(parser)
+    parser.add_argument("--json", help="write results to this file")
+    args = parser.parse_args()
+
+    install_fakes(args)
+    share_runtime_across_sessions()
+
+    levels = []
+    print(f"{'sessions':>8}{'reruns':>8}{'errors':>8}{'reruns/s':>10}{'flows/min':>11}"
+          f"{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'max ms':>9}{'KB/session':>12}")
+    for sessions in sorted(set(args.sessions)):
+        level = run_level(sessions, args)
+        levels.append(level)
+        print(f"{sessions:>8}{level['reruns']:>8}{level['errors']:>8}{level['reruns_per_s']:>10.2f}"
+              f"{level['flows_per_min']:>11.2f}{level['p50_ms']:>9.1f}{level['p95_ms']:>9.1f}{level['p99_ms']:>9.1f}"
+              f"{level['max_ms']:>9.1f}{level['artifacts']['largest_session_kb']:>12.1f}")
+
+    busiest = levels[-1]
+    print(f"\nreruns by step at {busiest['sessions']} sessions")
+    print(f"{'step':<18}{'reruns':>8}{'errors':>8}{'p50 ms':>9}{'p95 ms':>9}{'max ms':>9}")
+    for name, stats in busiest["steps"].items():
+        print(f"{name:<18}{stats['reruns']:>8}{stats['errors']:>8}{stats['p50_ms']:>9.1f}{stats['p95_ms']:>9.1f}{stats['max_ms']:>9.1f}")
+
+    saturation, reason = find_saturation(levels, args.min_scaling, args.slo_ms)
+    if saturation:
+        print(f"\nsaturates at ~{saturation} concurrent sessions ({reason})")
+    else:
+        print(f"\nsaturation {reason}")
+    print(f"scheduler: {get_llm_scheduler().stats()}")
+    print(f"artifacts: {get_artifact_registry().stats()}")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"config": vars(args), "levels": levels, "saturation": {"sessions": saturation, "reason": reason}},
+                      f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
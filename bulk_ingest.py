@@ -0,0 +1,262 @@
+"""Bulk resume ingestion: a directory or zip of PDFs in, one structured profile per line of JSONL out.
+
+    python bulk_ingest.py resumes/ profiles.jsonl [--workers 4] [--enrich --llm-concurrency 4]
+    python bulk_ingest.py batch.zip profiles.jsonl --parquet profiles.parquet
+
+PDF parsing runs on a process pool; identical files (by content hash) are parsed once.
+The JSONL output doubles as the checkpoint: rerunning the same command skips every
+file already written successfully, so an interrupted batch resumes where it stopped.
+"""
+import argparse
+import hashlib
+import io
+import json
+import os
+import sys
+import time
+import zipfile
+from collections import namedtuple
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from datetime import datetime
+
+from pdf_text import HASH_CHUNK_SIZE, extract_pdf_text
+from resume_parser import parse_resume
+
+DEFAULT_CHAR_BUDGET = int(os.getenv("PDF_CHAR_BUDGET", "20000"))
+PROFILE_FIELDS = ("technical_skills", "soft_skills", "years_experience", "job_titles", "education", "certifications")
+
+# A PDF on disk or inside a zip archive (member is None for plain files)
+Source = namedtuple("Source", ["path", "member"])
+
+
+def source_name(source):
+    return f"{source.path}!{source.member}" if source.member else source.path
+
+
+def iter_sources(root):
+    """Yield every PDF under a directory (sorted, recursive) or inside a zip archive"""
+    if zipfile.is_zipfile(root):
+        with zipfile.ZipFile(root) as archive:
+            for member in sorted(archive.namelist()):
+                if member.lower().endswith(".pdf") and not member.startswith("__MACOSX/"):
+                    yield Source(root, member)
+        return
+    for directory, subdirs, files in os.walk(root):
+        subdirs.sort()
+        for name in sorted(files):
+            if name.lower().endswith(".pdf"):
+                yield Source(os.path.join(directory, name), None)
+
+
+def open_source(source):
+    if source.member is None:
+        return open(source.path, "rb")
+    with zipfile.ZipFile(source.path) as archive:
+        return io.BytesIO(archive.read(source.member))
+
+
+def source_digest(source):
+    """SHA-256 of the file content, streamed in chunks"""
+    digest = hashlib.sha256()
+    with open_source(source) as stream:
+        for chunk in iter(lambda: stream.read(HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def parse_source(source, char_budget=DEFAULT_CHAR_BUDGET):
+    """Process-pool worker: extract text and the local profile from one PDF"""
+    with open_source(source) as stream:
+        text = extract_pdf_text(stream, char_budget)
+    if not text:
+        raise ValueError("no extractable text (scanned or empty PDF)")
+    return text, parse_resume(text)
+
+
+def load_checkpoint(path):
+    """Content hashes and source names already written successfully by a previous run"""
+    done_hashes, done_sources = {}, set()
+    if not os.path.exists(path):
+        return done_hashes, done_sources
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue  # Torn last line from an interrupted run
+            if record.get("status") in ("ok", "duplicate"):
+                done_sources.add(record["source"])
+                if record["status"] == "ok":
+                    done_hashes[record["sha256"]] = record["source"]
+    return done_hashes, done_sources
+
+
+class JsonlWriter:
+    """Append-only JSONL output, flushed every record and fsynced periodically"""
+
+    def __init__(self, path, sync_every=20):
+        self.file = open(path, "a", encoding="utf-8")
+        self.sync_every = sync_every
+        self.written = 0
+
+    def write(self, record):
+        self.file.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self.file.flush()
+        self.written += 1
+        if self.written % self.sync_every == 0:
+            os.fsync(self.file.fileno())
+
+    def close(self):
+        self.file.flush()
+        os.fsync(self.file.fileno())
+        self.file.close()
+
+
+def enrich_profile(text):
+    """Thread-pool worker: merge Gemini enrichment into the profile; the pool size bounds LLM concurrency"""
+    import core
+
+    with core.collect_notices() as notices:
+        profile = core.extract_skills_from_resume(text, enrich=True)
+    return text, profile, [notice["message"] for notice in notices]
+
+
+def ingest(root, output, workers=os.cpu_count(), enrich=False, llm_concurrency=4, include_text=False,
+           char_budget=DEFAULT_CHAR_BUDGET, log=sys.stderr):
+    """Stream PDFs through the pool and append one record per file to output; return status counts"""
+    done_hashes, done_sources = load_checkpoint(output)
+    counts = {"ok": 0, "duplicate": 0, "error": 0, "skipped": 0}
+    writer = JsonlWriter(output)
+    started = time.time()
+    window = max(1, workers) * 2
+    in_flight_hashes = {}
+    # Copies of an in-flight file; they are recorded as duplicates only once the original succeeds
+    waiting_copies = {}
+
+    def record(source, sha256, status, **fields):
+        counts[status] += 1
+        writer.write({"source": source_name(source), "sha256": sha256, "status": status,
+                      "processed_at": datetime.now().isoformat(timespec="seconds"), **fields})
+        total = sum(counts.values())
+        if total % 50 == 0:
+            print(f"{total} files, {total / (time.time() - started):.1f}/s {counts}", file=log)
+
+    def finish(source, sha256, text, profile, notices=None):
+        done_hashes[sha256] = source_name(source)
+        in_flight_hashes.pop(sha256, None)
+        fields = {"profile": profile, "chars": len(text)}
+        if notices:
+            fields["notices"] = notices
+        if include_text:
+            fields["text"] = text
+        record(source, sha256, "ok", **fields)
+        for copy in waiting_copies.pop(sha256, []):
+            record(copy, sha256, "duplicate", duplicate_of=source_name(source))
+
+    with ProcessPoolExecutor(max_workers=workers) as parse_pool, \
+            ThreadPoolExecutor(max_workers=max(1, llm_concurrency)) as llm_pool:
+        pending = {}
+
+        def submit(source, sha256):
+            in_flight_hashes[sha256] = source_name(source)
+            pending[parse_pool.submit(parse_source, source, char_budget)] = ("parse", source, sha256)
+
+        def drain():
+            """Handle whatever finished next: write results, or hand parsed text on to enrichment"""
+            finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in finished:
+                stage, source, sha256 = pending.pop(future)
+                try:
+                    result = future.result()
+                except Exception as e:
+                    in_flight_hashes.pop(sha256, None)
+                    record(source, sha256, "error", error=f"{type(e).__name__}: {e}")
+                    # The next waiting copy becomes the original instead of being lost as a duplicate
+                    copies = waiting_copies.pop(sha256, [])
+                    if copies:
+                        submit(copies[0], sha256)
+                        if copies[1:]:
+                            waiting_copies[sha256] = copies[1:]
+                    continue
+                if stage == "parse" and enrich:
+                    pending[llm_pool.submit(enrich_profile, result[0])] = ("enrich", source, sha256)
+                else:
+                    finish(source, sha256, *result)
+
+        for source in iter_sources(root):
+            if source_name(source) in done_sources:
+                counts["skipped"] += 1
+                continue
+            try:
+                sha256 = source_digest(source)
+            except (OSError, zipfile.BadZipFile) as e:
+                record(source, None, "error", error=f"{type(e).__name__}: {e}")
+                continue
+            if sha256 in done_hashes:
+                record(source, sha256, "duplicate", duplicate_of=done_hashes[sha256])
+                continue
+            if sha256 in in_flight_hashes:
+                waiting_copies.setdefault(sha256, []).append(source)
+                continue
+            submit(source, sha256)
+            # Keep a bounded number of files in flight so memory stays flat on huge batches
+            while len(pending) >= window:
+                drain()
+        while pending:
+            drain()
+
+    writer.close()
+    print(f"done in {time.time() - started:.1f}s: {counts}", file=log)
+    return counts
+
+
+def export_parquet(jsonl_path, parquet_path):
+    """Write the latest successful record per source to Parquet (needs pyarrow)"""
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise SystemExit("Parquet export needs pyarrow: pip install pyarrow")
+
+    latest = {}
+    with open(jsonl_path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if record.get("status") == "ok":
+                latest[record["source"]] = record
+    rows = [{
+        "source": record["source"],
+        "sha256": record["sha256"],
+        "processed_at": record["processed_at"],
+        "chars": record.get("chars"),
+        **{field: record["profile"].get(field) for field in PROFILE_FIELDS}
+    } for record in latest.values()]
+    pq.write_table(pa.Table.from_pylist(rows), parquet_path)
+    return len(rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("input", help="directory of PDFs or a .zip archive")
+    parser.add_argument("output", help="JSONL file to append to (also the resume checkpoint)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="PDF parsing processes")
+    parser.add_argument("--enrich", action="store_true", help="merge Gemini extraction into each profile")
+    parser.add_argument("--llm-concurrency", type=int, default=4, help="Gemini calls in flight at once")
+    parser.add_argument("--include-text", action="store_true", help="store the extracted text in each record")
+    parser.add_argument("--char-budget", type=int, default=DEFAULT_CHAR_BUDGET)
+    parser.add_argument("--parquet", help="also export successful profiles to this Parquet file")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.input):
+        parser.error(f"{args.input} does not exist")
+    ingest(args.input, args.output, args.workers, args.enrich, args.llm_concurrency, args.include_text,
+           args.char_budget)
+    if args.parquet:
+        print(f"wrote {export_parquet(args.output, args.parquet)} profiles to {args.parquet}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,680 @@
+"""Job-hunting pipeline shared by the Streamlit UI: resume parsing, job search and Gemini helpers.
+
+Kept out of app.py so it is imported once per process instead of re-executed on every rerun.
+"""
+import os
+import json
+import re
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime
+
+from resources import (
+    get_model_router, get_firecrawl_app, get_llm_cache, get_pdf_text_cache, get_llm_scheduler,
+    get_report_store, get_posting_store, get_semantic_matcher, get_keyword_index
+)
+from llm_cache import make_cache_key, DEFAULT_TTL
+from report_store import report_key, REPORT_REFRESH_SECONDS
+from prompt_builder import build_prompt, compact_json
+from job_scraper import ScrapeResult, ScrapeTask, scrape_concurrently
+from batch_analysis import run_batch, ANALYSIS_WORKERS
+from resume_parser import parse_resume, merge_profiles
+from match_scoring import rank_postings
+from diagnostics import metrics, record_usage
+
+# Models and clients are built lazily by resources.py; model_router picks the model for each helper
+
+# Stop reading resume pages once this many characters are extracted
+PDF_CHAR_BUDGET = int(os.getenv('PDF_CHAR_BUDGET', '20000'))
+# Scrape real postings only when a Firecrawl backend (hosted or local stub) is configured
+FIRECRAWL_ENABLED = bool(os.getenv('FIRECRAWL_API_KEY') or os.getenv('FAKE_FIRECRAWL'))
+
+# Cache lifetimes (seconds) for each Gemini-backed helper
+CACHE_TTLS = {
+    "extract_skills_from_resume": 7 * 24 * 3600,
+    "analyze_job_with_gemini": 24 * 3600,
+    "optimize_resume": 24 * 3600,
+    "generate_cover_letter": 24 * 3600,
+    "generate_interview_questions": 24 * 3600,
+    "generate_company_research": 3 * 24 * 3600,
+    "suggest_linkedin_connections": 3 * 24 * 3600,
+    "generate_outreach_template": 24 * 3600,
+    "get_industry_trends": 24 * 3600,
+}
+# Answers from the fallback tier are cached only briefly, so the routed model is retried soon
+FALLBACK_CACHE_TTL = int(os.getenv('FALLBACK_CACHE_MINUTES', '10')) * 60
+
+# Where helper errors and warnings go: Streamlit by default, a per-request list in the API
+_notice_handler = ContextVar("notice_handler", default=None)
+
+def notify(level, message):
+    """Surface a helper error ("error") or degraded result ("warning") to whoever is calling"""
+    handler = _notice_handler.get()
+    if handler is None:
+        import streamlit as st
+        getattr(st, level)(message)
+    else:
+        handler(level, message)
+
+@contextmanager
+def collect_notices():
+    """Capture notify() messages in the current context instead of rendering them"""
+    messages = []
+    token = _notice_handler.set(lambda level, message: messages.append({"level": level, "message": message}))
+    try:
+        yield messages
+    finally:
+        _notice_handler.reset(token)
+
+def response_text(response):
+    """Text of a Gemini response or stream chunk; "" for one without parts (safety-blocked or finish-only),
+    where .text raises ValueError"""
+    try:
+        return response.text or ""
+    except ValueError:
+        return ""
+
+def generate_content_cached(prompt, namespace, on_chunk=None, refresh=False):
+    """Call Gemini through the shared response cache and call scheduler and return the response text.
+    
+    When on_chunk is given the response is streamed and on_chunk(text_so_far) is called per chunk.
+    Identical prompts already in flight share one upstream call. refresh=True skips the cache
+    lookup and overwrites the entry.
+    """
+    return generate_content_tiered(prompt, namespace, on_chunk, refresh)[0]
+
+def generate_content_tiered(prompt, namespace, on_chunk=None, refresh=False):
+    """generate_content_cached, also returning the model tier that answered (None for a cache hit)"""
+    cache = get_llm_cache()
+    router = get_model_router()
+    key = make_cache_key(router.model_name(namespace), namespace, prompt)
+    if not refresh:
+        cached = cache.get(key, namespace)
+        if cached is not None:
+            return cached, None
+    
+    def generate(model, timeout):
+        options = {"timeout": timeout} if timeout else None
+        if on_chunk is None:
+            response = model.generate_content(prompt, request_options=options)
+            text = response_text(response)
+        else:
+            text = ""
+            response = None
+            for response in model.generate_content(prompt, stream=True, request_options=options):
+                text += response_text(response)
+                on_chunk(text)
+        record_usage(namespace, prompt, response, text)
+        return text
+    
+    def fetch():
+        with metrics.track(f"llm:{namespace}"):
+            text, tier = router.run(namespace, generate)
+        if text:
+            ttl = CACHE_TTLS.get(namespace, DEFAULT_TTL) if tier == router.tier(namespace) else FALLBACK_CACHE_TTL
+            cache.set(key, text, ttl, namespace)
+        return text, tier
+    
+    (text, tier), shared = get_llm_scheduler().call(key, fetch)
+    if shared and on_chunk:
+        on_chunk(text)
+    return text, tier
+
+# Indian major cities
+INDIAN_CITIES = [
+    "Bangalore", "Mumbai", "Delhi", "Hyderabad", "Chennai",
+    "Pune", "Kolkata", "Ahmedabad", "Gurgaon", "Noida",
+    "Remote", "Anywhere"
+]
+
+# Job platforms with specific search URLs
+JOB_PLATFORMS = {
+    "Naukri": {
+        "url": "https://www.naukri.com",
+        "search_pattern": "/{job_title}-jobs-in-{location}?experience={experience}"
+    },
+    "Indeed": {
+        "url": "https://www.indeed.com",
+        "search_pattern": "/jobs?q={job_title}&l={location}&explvl={experience_level}"
+    },
+    "Monster": {
+        "url": "https://www.monsterindia.com",
+        "search_pattern": "/search/{job_title}-jobs-in-{location}?exp={experience}"
+    },
+    "LinkedIn": {
+        "url": "https://www.linkedin.com/jobs",
+        "search_pattern": "/search/?keywords={job_title}&location={location}&f_E={experience_code}"
+    },
+    "PayScale": {
+        "url": "https://www.payscale.com",
+        "search_pattern": "/research/IN/Job={job_title}/Salary"
+    }
+}
+
+@metrics.instrument
+def extract_text_from_pdf(uploaded_file, char_budget=PDF_CHAR_BUDGET):
+    """Extract text from PDF resume page by page, skipping the parse for previously seen files"""
+    try:
+        return get_pdf_text_cache().extract(uploaded_file, char_budget)
+    except Exception as e:
+        notify("error", f"Error reading PDF: {str(e)}")
+        return None
+
+def parse_json_response(text):
+    """Parse JSON from a model reply, tolerating markdown code fences around it"""
+    text = text.strip()
+    fenced = re.search(r"```(?:json)?\s*(.*?)```", text, re.DOTALL)
+    if fenced:
+        text = fenced.group(1).strip()
+    return json.loads(text)
+
+@metrics.instrument
+def extract_skills_from_resume(resume_text, enrich=False):
+    """Parse the resume locally, optionally enriching the result with Gemini 1.5 Pro"""
+    profile = parse_resume(resume_text)
+    if not enrich:
+        return profile
+    
+    prompt = """Extract the following information from the resume in JSON format:
+    {
+        "technical_skills": [],
+        "soft_skills": [],
+        "years_experience": float,
+        "job_titles": [],
+        "education": [],
+        "certifications": []
+    }
+    
+    Resume Text:
+    """ + resume_text[:10000]  # Using 1.5 Pro's larger context window
+    
+    try:
+        response_text = generate_content_cached(prompt, "extract_skills_from_resume")
+        if response_text:
+            try:
+                return merge_profiles(profile, parse_json_response(response_text))
+            except json.JSONDecodeError:
+                notify("warning", "Failed to parse Gemini skills data, using local extraction only")
+        return profile
+    except Exception as e:
+        notify("warning", f"Gemini enrichment unavailable, using local extraction only: {str(e)}")
+        return profile
+
+def format_candidate_profile(user_profile):
+    """Serialize the candidate profile once so it can be shared across job prompts"""
+    return compact_json(user_profile)
+
+def build_job_analysis_prompt(job_details, profile_block):
+    """Job analysis prompt for one posting against a pre-serialized candidate profile"""
+    return build_prompt("analyze_job_with_gemini", """
+    Analyze this job opportunity against the candidate profile and provide:
+    1. Match score (0-100) with detailed breakdown
+    2. Key strengths and weaknesses
+    3. Missing qualifications
+    4. Salary benchmarking (current market rates)
+    5. Company culture insights
+    6. Customized application strategy
+    
+    Format your response as markdown with these sections:
+    
+    ### 🎯 Match Analysis
+    - Overall Score: [score]/100
+    - Skills Match: [x]/[y] skills matched
+    - Experience: [analysis]
+    
+    ### 💪 Strengths
+    - [List candidate strengths for this role]
+    
+    ### 📉 Weaknesses
+    - [List potential gaps]
+    
+    ### 💰 Salary Insights
+    - [Market range analysis]
+    
+    ### 🏢 Company Fit
+    - [Culture analysis]
+    
+    ### 📝 Application Strategy
+    - [Customized tips]
+    
+    Job Details:
+    {job_details}
+    
+    Candidate Profile:
+    {candidate_profile}
+    """, job_details=job_details, candidate_profile=profile_block)
+
+@metrics.instrument
+def analyze_job_with_gemini(job_details, user_profile, profile_block=None):
+    """Enhanced analysis with Gemini 1.5 Pro"""
+    prompt = build_job_analysis_prompt(job_details, profile_block or format_candidate_profile(user_profile))
+    
+    try:
+        return generate_content_cached(prompt, "analyze_job_with_gemini")
+    except Exception as e:
+        notify("error", f"Error analyzing with Gemini: {str(e)}")
+        return None
+
+@metrics.instrument
+def optimize_resume(resume_text, job_description, on_chunk=None):
+    """Optimize resume based on job description"""
+    prompt = build_prompt("optimize_resume", """
+    Optimize this resume for the following job description. Provide:
+    1. ATS-optimized version with relevant keywords
+    2. Improved formatting and structure
+    3. Enhanced bullet points with quantifiable achievements
+    4. Skills section reordered by relevance
+    
+    Return the optimized resume in markdown format.
+    
+    Job Description:
+    {job_description}
+    
+    Original Resume:
+    {resume_text}
+    """, job_description=job_description, resume_text=resume_text)
+    
+    try:
+        return generate_content_cached(prompt, "optimize_resume", on_chunk)
+    except Exception as e:
+        notify("error", f"Error optimizing resume: {str(e)}")
+        return None
+
+@metrics.instrument
+def generate_cover_letter(resume_text, job_description, company_name, on_chunk=None):
+    """Generate tailored cover letter"""
+    prompt = build_prompt("generate_cover_letter", """
+    Write a professional cover letter for this job application.
+    Tailor it specifically to the company and job description.
+    Include:
+    1. Personalized opening
+    2. 3-4 key qualifications
+    3. Specific examples from resume
+    4. Enthusiastic closing
+    
+    Job Description:
+    {job_description}
+    
+    Company Name:
+    {company_name}
+    
+    Candidate Resume:
+    {resume_text}
+    """, job_description=job_description, company_name=company_name, resume_text=resume_text)
+    
+    try:
+        return generate_content_cached(prompt, "generate_cover_letter", on_chunk)
+    except Exception as e:
+        notify("error", f"Error generating cover letter: {str(e)}")
+        return None
+
+@metrics.instrument
+def suggest_ats_keywords(job_description):
+    """Rank ATS keywords in a job description locally, against every posting scraped so far"""
+    try:
+        return get_keyword_index().extract(job_description)
+    except Exception as e:
+        notify("error", f"Error extracting keywords: {str(e)}")
+        return []
+
+@metrics.instrument
+def generate_interview_questions(job_description):
+    """Generate potential interview questions"""
+    prompt = f"""
+    Generate 10 likely interview questions for this job,
+    including 5 technical and 5 behavioral questions.
+    Format as a numbered list with question type.
+    
+    Job Description:
+    {job_description}
+    """
+    
+    try:
+        return generate_content_cached(prompt, "generate_interview_questions")
+    except Exception as e:
+        notify("error", f"Error generating questions: {str(e)}")
+        return None
+
+COMPANY_RESEARCH_TEMPLATE = """
+    Create a comprehensive research report about this company
+    to help a job candidate prepare for interviews.
+    Include:
+    1. Company overview
+    2. Recent news
+    3. Company culture
+    4. Interview tips specific to this company
+    
+    Company Name:
+    {company_name}
+    """
+
+def build_company_research_prompt(company_name):
+    return COMPANY_RESEARCH_TEMPLATE.format(company_name=company_name)
+
+@metrics.instrument
+def generate_company_research(company_name, on_chunk=None):
+    """Generate company research report, served from the precomputed store when warm"""
+    try:
+        return serve_report("company_research", (company_name,), on_chunk)
+    except Exception as e:
+        notify("error", f"Error generating research: {str(e)}")
+        return None
+
+# Application-pack artifacts: name -> (helper, input fields it needs)
+APPLICATION_PACK = {
+    "optimized_resume": (optimize_resume, ("resume_text", "job_description")),
+    "cover_letter": (generate_cover_letter, ("resume_text", "job_description", "company_name")),
+    "ats_keywords": (suggest_ats_keywords, ("job_description",)),
+    "interview_questions": (generate_interview_questions, ("job_description",)),
+    "company_research": (generate_company_research, ("company_name",)),
+}
+
+def application_pack_artifacts(resume_text, job_description, company_name):
+    """Artifacts whose inputs are all present"""
+    inputs = {"resume_text": resume_text, "job_description": job_description, "company_name": company_name}
+    return [name for name, (_, fields) in APPLICATION_PACK.items() if all(inputs[field] for field in fields)]
+
+def build_application_pack(resume_text, job_description, company_name, artifacts=None):
+    """Generate independent application artifacts concurrently.
+    
+    Yields (name, result, notices, seconds) as each artifact finishes, so total time is that of the slowest.
+    """
+    inputs = {"resume_text": resume_text, "job_description": job_description, "company_name": company_name}
+    names = artifacts or application_pack_artifacts(resume_text, job_description, company_name)
+    
+    def make(name):
+        helper, fields = APPLICATION_PACK[name]
+        started = time.perf_counter()
+        # Worker threads can't render, so each artifact's notices travel back with its result
+        with collect_notices() as notices:
+            result = helper(*(inputs[field] for field in fields))
+        return result, notices, time.perf_counter() - started
+    
+    for name, outcome, error in run_batch(names, make, max_workers=len(names)):
+        if error:
+            yield name, None, [{"level": "error", "message": str(error)}], 0.0
+        else:
+            yield (name, *outcome)
+
+@metrics.instrument
+def suggest_linkedin_connections(company_name, job_title):
+    """Suggest relevant LinkedIn connections"""
+    prompt = f"""
+    Suggest types of LinkedIn connections to make when applying
+    to this company for this position. Include:
+    1. Relevant job titles to connect with
+    2. Recommended outreach approach
+    3. Icebreaker message templates
+    
+    Company: {company_name}
+    Position: {job_title}
+    """
+    
+    try:
+        return generate_content_cached(prompt, "suggest_linkedin_connections")
+    except Exception as e:
+        notify("error", f"Error generating connection suggestions: {str(e)}")
+        return None
+
+@metrics.instrument
+def generate_outreach_template(connection_type, company_name):
+    """Generate personalized outreach template"""
+    prompt = f"""
+    Create a personalized LinkedIn outreach message template
+    for connecting with {connection_type} at {company_name}.
+    Make it professional but friendly.
+    Include:
+    1. Personalized greeting
+    2. Reason for connecting
+    3. Specific compliment or commonality
+    4. Clear call-to-action
+    
+    Return only the message content.
+    """
+    
+    try:
+        return generate_content_cached(prompt, "generate_outreach_template")
+    except Exception as e:
+        notify("error", f"Error generating template: {str(e)}")
+        return None
+
+def generate_search_url(platform, job_title, location, experience):
+    """Generate platform-specific job search URLs with proper parameters"""
+    platform_data = JOB_PLATFORMS.get(platform)
+    if not platform_data:
+        return None
+    
+    # Clean inputs
+    clean_job_title = job_title.strip().lower().replace(' ', '-')
+    clean_location = location.strip().lower().replace(' ', '-')
+    
+    # Platform-specific parameter handling
+    if platform == "Naukri":
+        return f"{platform_data['url']}/{clean_job_title}-jobs-in-{clean_location}?experience={experience}"
+    elif platform == "Indeed":
+        if experience < 1:
+            exp_level = "entry_level"
+        elif experience < 3:
+            exp_level = "mid_level"
+        else:
+            exp_level = "senior_level"
+        return f"{platform_data['url']}/jobs?q={clean_job_title}&l={clean_location}&explvl={exp_level}"
+    elif platform == "Monster":
+        return f"{platform_data['url']}/search/{clean_job_title}-jobs-in-{clean_location}?exp={experience}-{experience+2}"
+    elif platform == "LinkedIn":
+        if experience < 2:
+            exp_code = "1"
+        elif experience < 5:
+            exp_code = "2"
+        elif experience < 10:
+            exp_code = "3"
+        else:
+            exp_code = "4"
+        return f"{platform_data['url']}/search/?keywords={clean_job_title}&location={clean_location}&f_E={exp_code}"
+    elif platform == "PayScale":
+        return f"{platform_data['url']}/research/IN/Job={clean_job_title}/Salary"
+    return None
+
+def simulate_postings(job_title, experience, skills, tasks):
+    """Demo scraper used when no Firecrawl backend is configured"""
+    def scrape(app, task, timeout):
+        index = tasks.index(task)
+        return [{
+            "title": f"{job_title} ({task.platform})",
+            "company": f"Sample Company {index+1}",
+            "location": task.location,
+            "experience": f"{experience}+ years",
+            "skills": skills[:3] + [f"{task.platform}-Specialized"],
+            "salary": f"₹{10+index*2}-{15+index*3} LPA",
+            "url": task.url,
+            "platform": task.platform,
+            "posted_date": datetime.now().strftime("%Y-%m-%d")
+        }]
+    return scrape
+
+@metrics.instrument
+def search_jobs(job_title, locations, experience, skills, platforms, on_progress=None, resume_text=None):
+    """Search for jobs across multiple platforms concurrently.
+    
+    on_progress(result, found) is called as each platform/location scrape completes.
+    resume_text, when given, is matched semantically against each posting's requirements.
+    """
+    try:
+        tasks = []
+        for platform in platforms:
+            for location in locations:
+                search_url = generate_search_url(platform, job_title, location, experience)
+                if search_url:
+                    tasks.append(ScrapeTask(platform, location, search_url))
+        
+        if not FIRECRAWL_ENABLED:
+            return search_simulated(job_title, experience, skills, tasks, on_progress, resume_text)
+        
+        # Live postings go through the store so repeat searches skip boards scraped recently
+        store = get_posting_store()
+        stale = []
+        found = 0
+        for task in tasks:
+            if store.is_fresh(job_title, task.platform, task.location):
+                stored = store.search(job_title, [task.location], [task.platform])
+                found += len(stored)
+                if on_progress:
+                    on_progress(ScrapeResult(task, stored, None, 0.0, cached=True), found)
+            else:
+                stale.append(task)
+        
+        for result in scrape_concurrently(get_firecrawl_app(), stale):
+            if result.error:
+                notify("warning", f"Partial results: {result.task.platform} ({result.task.location}) failed: {str(result.error)}")
+            else:
+                store.upsert(result.postings, job_title, result.task.platform, result.task.location)
+                get_keyword_index().add_postings(result.postings)
+            found += len(result.postings)
+            if on_progress:
+                on_progress(result, found)
+        
+        return semantic_rank(store.search(job_title, locations, platforms), skills, experience, resume_text)
+    except Exception as e:
+        notify("error", f"Job search failed: {str(e)}")
+        return []
+
+def search_simulated(job_title, experience, skills, tasks, on_progress=None, resume_text=None):
+    """Generate demo postings for tasks without touching the posting store"""
+    results = []
+    seen_urls = set()
+    for result in scrape_concurrently(None, tasks, scrape=simulate_postings(job_title, experience, skills, tasks)):
+        for posting in result.postings:
+            if posting["url"] in seen_urls:
+                continue
+            seen_urls.add(posting["url"])
+            results.append(posting)
+        if on_progress:
+            on_progress(result, len(results))
+    
+    return semantic_rank(results, skills, experience, resume_text)
+
+def semantic_rank(postings, skills, experience, resume_text=None):
+    """Rank postings on skill overlap and experience, blended with embedding similarity when it works"""
+    try:
+        semantic = get_semantic_matcher().score_postings(postings, skills, resume_text)
+    except Exception as e:
+        notify("warning", f"Semantic matching unavailable, ranking on exact skills only: {str(e)}")
+        semantic = None
+    return rank_postings(postings, skills, experience, semantic=semantic)
+
+def analyze_jobs_concurrently(jobs, user_profile, max_workers=ANALYSIS_WORKERS):
+    """Analyze many postings on a worker pool, yielding (job, analysis, error) as each completes"""
+    profile_block = format_candidate_profile(user_profile)
+    
+    def analyze(job):
+        return generate_content_cached(build_job_analysis_prompt(job, profile_block), "analyze_job_with_gemini")
+    
+    return run_batch(jobs, analyze, max_workers)
+
+INDUSTRY_TRENDS_TEMPLATE = """
+    Provide a detailed industry trends report for {industry} professionals in {location}.
+    Include these sections with specific data:
+    
+    ### 💰 Salary Trends
+    - Entry-level: [range]
+    - Mid-career: [range]
+    - Senior-level: [range]
+    - Factors affecting compensation
+    
+    ### 📈 In-Demand Skills
+    1. Technical skills:
+       - [List 5-7 skills]
+    2. Soft skills:
+       - [List 3-5 skills]
+    
+    ### 🏆 Top Companies
+    - [List 5-7 top employers]
+    - Notable perks/benefits
+    
+    ### 🚀 Emerging Technologies
+    - [List 3-5 emerging tech]
+    - Adoption trends
+    
+    ### 📅 Hiring Trends
+    - Best times to apply
+    - Growth projections
+    - Remote work availability
+    
+    Format the response in markdown with clear headings.
+    """
+
+def build_industry_trends_prompt(industry, location):
+    return INDUSTRY_TRENDS_TEMPLATE.format(industry=industry, location=location)
+
+@metrics.instrument
+def get_industry_trends(industry, location):
+    """Get comprehensive industry trends using Gemini, served from the precomputed store when warm"""
+    try:
+        return serve_report("industry_trends", (industry, location))
+    except Exception as e:
+        notify("error", f"Error getting industry trends: {str(e)}")
+        return "Industry trends data unavailable."
+
+# Precomputed reports: kind -> (cache namespace, prompt template, prompt builder)
+REPORT_KINDS = {
+    "industry_trends": ("get_industry_trends", INDUSTRY_TRENDS_TEMPLATE, build_industry_trends_prompt),
+    "company_research": ("generate_company_research", COMPANY_RESEARCH_TEMPLATE, build_company_research_prompt),
+}
+# Keys warmed in the background on top of the most requested ones
+WARM_INDUSTRIES = [s.strip() for s in os.getenv('WARM_INDUSTRIES', 'Software,Data').split(',') if s.strip()]
+WARM_LOCATIONS = [s.strip() for s in os.getenv('WARM_LOCATIONS', 'Bangalore,Mumbai,Delhi,Hyderabad,Pune').split(',') if s.strip()]
+WARM_COMPANIES = [s.strip() for s in os.getenv('WARM_COMPANIES', 'TCS,Infosys,Wipro,Accenture,Google,Microsoft').split(',') if s.strip()]
+
+def report_version(kind):
+    """Changes whenever the model or the prompt template changes, invalidating stored reports"""
+    namespace, template, _ = REPORT_KINDS[kind]
+    return make_cache_key(get_model_router().model_name(namespace), namespace, template)[:16]
+
+def refresh_report(kind, args, on_chunk=None):
+    """Generate a report from scratch and store it under the current version"""
+    namespace, _, builder = REPORT_KINDS[kind]
+    text, tier = generate_content_tiered(builder(*args), namespace, on_chunk, refresh=True)
+    # A fallback-tier answer is only cached briefly; the key stays stale so the next cycle retries the primary
+    if text and tier == get_model_router().tier(namespace):
+        get_report_store().put(kind, report_key(*args), report_version(kind), text)
+    return text
+
+def serve_report(kind, args, on_chunk=None):
+    """Return the stored report for args, generating it on demand for cold keys.
+
+    A report older than REPORT_REFRESH_SECONDS counts as cold; if regenerating it fails the stale copy
+    is served instead. Only primary-tier answers are stored: fallback answers and cache hits of unknown
+    tier are served from the response cache for its shorter TTL.
+    """
+    store = get_report_store()
+    key = report_key(*args)
+    store.record_demand(kind, key, args)
+    stored = store.get(kind, key, report_version(kind))
+    if stored is not None and time.time() - stored.generated_at <= REPORT_REFRESH_SECONDS:
+        return stored.content
+    namespace, _, builder = REPORT_KINDS[kind]
+    try:
+        text, tier = generate_content_tiered(builder(*args), namespace, on_chunk, refresh=stored is not None)
+    except Exception as e:
+        if stored is None:
+            raise
+        notify("warning", f"Showing a report from {datetime.fromtimestamp(stored.generated_at):%d %b}: {str(e)}")
+        return stored.content
+    if text:
+        if tier == get_model_router().tier(namespace):
+            store.put(kind, key, report_version(kind), text)
+        return text
+    return stored.content if stored is not None else text
+
+def report_warm_plan():
+    """Seed keys first, then the most requested ones, without duplicates"""
+    store = get_report_store()
+    plan = [("industry_trends", (industry, location)) for industry in WARM_INDUSTRIES for location in WARM_LOCATIONS]
+    plan += [("company_research", (company,)) for company in WARM_COMPANIES]
+    for kind in REPORT_KINDS:
+        plan += [(kind, args) for args in store.popular(kind)]
+    unique = {}
+    for kind, args in plan:
+        unique.setdefault((kind, report_key(*args)), (kind, args))
+    return list(unique.values())
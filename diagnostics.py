@@ -0,0 +1,192 @@
+"""In-process latency, token and cache metrics with JSON and Prometheus export"""
+import functools
+import json
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+# Histogram bucket upper bounds in milliseconds
+LATENCY_BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000, 60000)
+SAMPLE_WINDOW = 1000
+
+
+def estimate_tokens(text):
+    """Rough token count (~4 characters per token) when the API doesn't report usage"""
+    return max(1, len(text) // 4) if text else 0
+
+
+def percentile(samples, pct):
+    """Nearest-rank percentile of a list of numbers"""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    rank = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered) + 0.5)) - 1))
+    return ordered[rank]
+
+
+class LatencyHistogram:
+    """Cumulative bucket counts plus a window of recent samples for percentiles"""
+
+    def __init__(self):
+        self.buckets = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+        self.count = 0
+        self.errors = 0
+        self.total_ms = 0.0
+        self.samples = deque(maxlen=SAMPLE_WINDOW)
+
+    def observe(self, elapsed_ms, error=False):
+        self.count += 1
+        self.errors += int(error)
+        self.total_ms += elapsed_ms
+        self.samples.append(elapsed_ms)
+        for i, bound in enumerate(LATENCY_BUCKETS_MS):
+            if elapsed_ms <= bound:
+                self.buckets[i] += 1
+                break
+        else:
+            self.buckets[-1] += 1
+
+    def summary(self):
+        samples = list(self.samples)
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "mean_ms": round(self.total_ms / self.count, 2) if self.count else 0.0,
+            "p50_ms": round(percentile(samples, 50), 2),
+            "p95_ms": round(percentile(samples, 95), 2),
+            "max_ms": round(max(samples), 2) if samples else 0.0
+        }
+
+
+class MetricsRegistry:
+    """Thread-safe store for per-function latencies and per-helper token counts"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.latencies = {}
+        self.tokens = {}
+        self.prompts = {}
+        self.started = time.time()
+
+    def observe(self, name, elapsed_ms, error=False):
+        with self._lock:
+            self.latencies.setdefault(name, LatencyHistogram()).observe(elapsed_ms, error)
+
+    def record_tokens(self, namespace, prompt_tokens, response_tokens, estimated=False):
+        with self._lock:
+            entry = self.tokens.setdefault(namespace, {"calls": 0, "prompt_tokens": 0, "response_tokens": 0, "estimated_calls": 0})
+            entry["calls"] += 1
+            entry["prompt_tokens"] += prompt_tokens
+            entry["response_tokens"] += response_tokens
+            entry["estimated_calls"] += int(estimated)
+
+    def record_prompt(self, namespace, raw_tokens, sent_tokens):
+        """Estimated prompt tokens before and after compaction"""
+        with self._lock:
+            entry = self.prompts.setdefault(namespace, {"calls": 0, "raw_tokens": 0, "sent_tokens": 0})
+            entry["calls"] += 1
+            entry["raw_tokens"] += raw_tokens
+            entry["sent_tokens"] += sent_tokens
+
+    @contextmanager
+    def track(self, name):
+        """Time a block of code under name, counting exceptions as errors"""
+        started = time.perf_counter()
+        error = False
+        try:
+            yield
+        except BaseException:
+            error = True
+            raise
+        finally:
+            self.observe(name, (time.perf_counter() - started) * 1000, error)
+
+    def instrument(self, func=None, name=None):
+        """Decorator that records every call's latency"""
+        if func is None:
+            return functools.partial(self.instrument, name=name)
+        metric_name = name or func.__name__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with self.track(metric_name):
+                return func(*args, **kwargs)
+        return wrapper
+
+    def reset(self):
+        with self._lock:
+            self.latencies.clear()
+            self.tokens.clear()
+            self.prompts.clear()
+            self.started = time.time()
+
+    def snapshot(self, cache_stats=None, startup=None):
+        """All metrics as a JSON-serializable dict"""
+        with self._lock:
+            return {
+                "uptime_s": round(time.time() - self.started, 1),
+                "latency": {name: hist.summary() for name, hist in sorted(self.latencies.items())},
+                "tokens": {name: dict(entry) for name, entry in sorted(self.tokens.items())},
+                "prompts": {
+                    name: {**entry, "saved_tokens": entry["raw_tokens"] - entry["sent_tokens"],
+                           "saved_pct": round(100 * (1 - entry["sent_tokens"] / entry["raw_tokens"]), 1) if entry["raw_tokens"] else 0.0}
+                    for name, entry in sorted(self.prompts.items())
+                },
+                "cache": cache_stats or {},
+                "startup_ms": startup or {}
+            }
+
+    def to_json(self, cache_stats=None, startup=None):
+        return json.dumps(self.snapshot(cache_stats, startup), indent=2)
+
+    def to_prometheus(self, cache_stats=None):
+        """Prometheus text exposition format"""
+        lines = [
+            "# HELP job_assistant_latency_ms Call latency in milliseconds",
+            "# TYPE job_assistant_latency_ms histogram"
+        ]
+        with self._lock:
+            for name, hist in sorted(self.latencies.items()):
+                cumulative = 0
+                for bound, count in zip(LATENCY_BUCKETS_MS, hist.buckets):
+                    cumulative += count
+                    lines.append(f'job_assistant_latency_ms_bucket{{name="{name}",le="{bound}"}} {cumulative}')
+                lines.append(f'job_assistant_latency_ms_bucket{{name="{name}",le="+Inf"}} {hist.count}')
+                lines.append(f'job_assistant_latency_ms_sum{{name="{name}"}} {hist.total_ms:.3f}')
+                lines.append(f'job_assistant_latency_ms_count{{name="{name}"}} {hist.count}')
+            lines += ["# HELP job_assistant_errors_total Calls that raised", "# TYPE job_assistant_errors_total counter"]
+            for name, hist in sorted(self.latencies.items()):
+                lines.append(f'job_assistant_errors_total{{name="{name}"}} {hist.errors}')
+            lines += ["# HELP job_assistant_tokens_total Gemini tokens by helper and direction",
+                      "# TYPE job_assistant_tokens_total counter"]
+            for name, entry in sorted(self.tokens.items()):
+                lines.append(f'job_assistant_tokens_total{{name="{name}",kind="prompt"}} {entry["prompt_tokens"]}')
+                lines.append(f'job_assistant_tokens_total{{name="{name}",kind="response"}} {entry["response_tokens"]}')
+            lines += ["# HELP job_assistant_prompt_tokens_saved_total Estimated prompt tokens removed by compaction",
+                      "# TYPE job_assistant_prompt_tokens_saved_total counter"]
+            for name, entry in sorted(self.prompts.items()):
+                lines.append(f'job_assistant_prompt_tokens_saved_total{{name="{name}"}} {entry["raw_tokens"] - entry["sent_tokens"]}')
+        if cache_stats:
+            lines += ["# HELP job_assistant_cache_requests_total LLM cache lookups by result",
+                      "# TYPE job_assistant_cache_requests_total counter"]
+            for name, entry in sorted(cache_stats.get("by_namespace", {}).items()):
+                lines.append(f'job_assistant_cache_requests_total{{name="{name}",result="hit"}} {entry["hits"]}')
+                lines.append(f'job_assistant_cache_requests_total{{name="{name}",result="miss"}} {entry["misses"]}')
+            lines.append(f'job_assistant_cache_entries {cache_stats.get("entries", 0)}')
+        return "\n".join(lines) + "\n"
+
+
+# Process-wide registry shared by every session
+metrics = MetricsRegistry()
+
+
+def record_usage(namespace, prompt, response, text):
+    """Record token counts from a Gemini response, estimating when usage metadata (or the response) is missing"""
+    usage = getattr(response, "usage_metadata", None)
+    prompt_tokens = getattr(usage, "prompt_token_count", None) if usage else None
+    response_tokens = getattr(usage, "candidates_token_count", None) if usage else None
+    if prompt_tokens is None or response_tokens is None:
+        metrics.record_tokens(namespace, estimate_tokens(prompt), estimate_tokens(text), estimated=True)
+    else:
+        metrics.record_tokens(namespace, prompt_tokens, response_tokens)
@@ -0,0 +1,329 @@
+"""Offline stand-ins for the Gemini and Firecrawl clients plus synthetic inputs.
+
+Used for local testing and benchmarks without network or API quota. Enable in the
+app with FAKE_GEMINI=1 / FAKE_FIRECRAWL=1; tune with FAKE_FIRST_TOKEN_MS,
+FAKE_PER_TOKEN_MS, FAKE_PER_PROMPT_TOKEN_MS, FAKE_JITTER, FAKE_LATENCY_DISTRIBUTION and FAKE_ERROR_RATE.
+"""
+import hashlib
+import json
+import os
+import random
+import threading
+import time
+
+from diagnostics import estimate_tokens
+
+DEFAULT_SKILLS_JSON = {
+    "technical_skills": ["Python", "SQL", "Docker"],
+    "soft_skills": ["Communication", "Teamwork"],
+    "years_experience": 3,
+    "job_titles": ["Software Engineer"],
+    "education": ["B.Tech Computer Science"],
+    "certifications": []
+}
+
+SKILL_POOL = [
+    "Python", "Java", "SQL", "Machine Learning", "AWS", "Docker", "Kubernetes", "React", "Node.js",
+    "Go", "Spark", "Kafka", "TensorFlow", "PyTorch", "Azure", "Terraform", "Django", "Flask",
+    "PostgreSQL", "MongoDB", "Redis", "GraphQL", "TypeScript", "C++", "Airflow", "Tableau"
+]
+COMPANIES = ["Acme Technologies", "Globex India", "Initech Labs", "Umbrella Systems", "Stark Digital",
+             "Wayne Analytics", "Hooli", "Pied Piper", "Soylent Software", "Cyberdyne"]
+TITLES = ["Software Engineer", "Backend Developer", "Data Scientist", "ML Engineer", "Full Stack Developer",
+          "DevOps Engineer", "Data Engineer", "Senior Software Engineer"]
+CITIES = ["Bangalore", "Mumbai", "Delhi", "Hyderabad", "Chennai", "Pune", "Remote"]
+
+
+class FakeQuotaError(Exception):
+    """Mimics a 429 ResourceExhausted error from the Gemini API"""
+    code = 429
+
+
+class FakeServerError(Exception):
+    """Mimics a 500/503 error from the Gemini API"""
+    code = 503
+
+
+class LatencyModel:
+    """Delay = (first_token + per_prompt_token * prompt_tokens) * noise + per_token * output_tokens.
+
+    distribution is "fixed", "uniform" (noise in 1 ± jitter) or "lognormal" (sigma = jitter).
+    """
+
+    def __init__(self, first_token=0.02, per_token=0.0005, jitter=0.0, distribution="fixed", seed=None,
+                 per_prompt_token=0.0):
+        self.first_token = first_token
+        self.per_token = per_token
+        self.per_prompt_token = per_prompt_token
+        self.jitter = jitter
+        self.distribution = distribution
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls, prefix="FAKE"):
+        return cls(
+            first_token=float(os.getenv(f"{prefix}_FIRST_TOKEN_MS", "20")) / 1000,
+            per_token=float(os.getenv(f"{prefix}_PER_TOKEN_MS", "0.5")) / 1000,
+            jitter=float(os.getenv(f"{prefix}_JITTER", "0")),
+            distribution=os.getenv(f"{prefix}_LATENCY_DISTRIBUTION", "fixed"),
+            per_prompt_token=float(os.getenv(f"{prefix}_PER_PROMPT_TOKEN_MS", "0")) / 1000
+        )
+
+    def scaled(self, factor):
+        """Copy with every delay multiplied by factor"""
+        return LatencyModel(self.first_token * factor, self.per_token * factor, self.jitter, self.distribution,
+                            per_prompt_token=self.per_prompt_token * factor)
+
+    def noise(self):
+        with self._lock:
+            if self.distribution == "uniform":
+                return max(0.0, self._rng.uniform(1 - self.jitter, 1 + self.jitter))
+            if self.distribution == "lognormal":
+                return self._rng.lognormvariate(0, self.jitter)
+        return 1.0
+
+    def first_token_delay(self, prompt_tokens=0):
+        return (self.first_token + self.per_prompt_token * prompt_tokens) * self.noise()
+
+    def token_delay(self, tokens):
+        return self.per_token * tokens
+
+
+def default_responder(prompt):
+    """Produce a deterministic reply shaped like what each helper expects"""
+    if "JSON format" in prompt:
+        return json.dumps(DEFAULT_SKILLS_JSON)
+    if "interview questions" in prompt:
+        kinds = ["Technical", "Behavioral", "Situational"]
+        return "\n".join(f"{i}. {kinds[i % 3]}: How would you approach challenge {i} in this role?" for i in range(1, 11))
+    first_line = next((line.strip() for line in prompt.splitlines() if line.strip()), "")
+    body = " ".join(f"point {i}" for i in range(1, 41))
+    return f"### Stub response\n\n> {first_line}\n\n{body}\n"
+
+
+class FakeUsage:
+    def __init__(self, prompt, text):
+        self.prompt_token_count = estimate_tokens(prompt)
+        self.candidates_token_count = estimate_tokens(text)
+
+
+class FakeChunk:
+    """Mimics a streamed GenerateContentResponse chunk"""
+
+    def __init__(self, text, usage_metadata=None):
+        self.text = text
+        self.usage_metadata = usage_metadata
+
+
+class FakeResponse:
+    """Mimics a complete GenerateContentResponse"""
+
+    def __init__(self, text, usage_metadata=None):
+        self.text = text
+        self.usage_metadata = usage_metadata
+
+
+class _ErrorInjector:
+    def __init__(self, error_rate, seed):
+        self.error_rate = error_rate
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def maybe_raise(self, errors=(FakeQuotaError, FakeServerError)):
+        with self._lock:
+            fail = self.error_rate and self._rng.random() < self.error_rate
+            error = self._rng.choice(errors) if fail else None
+        if error:
+            raise error(f"injected {error.__name__}")
+
+
+class FakeGenerativeModel:
+    """Drop-in replacement for genai.GenerativeModel that never touches the network.
+
+    responder maps a prompt to the reply text; latency shapes the delay and error_rate
+    injects quota/server errors. Streamed replies arrive in chunk_size-character chunks.
+    """
+
+    def __init__(self, model_name="fake-gemini", responder=default_responder, latency=None,
+                 error_rate=0.0, chunk_size=40, seed=None):
+        self.model_name = model_name
+        self.responder = responder
+        self.latency = latency or LatencyModel()
+        self.chunk_size = chunk_size
+        self.calls = 0
+        self._errors = _ErrorInjector(error_rate, seed)
+
+    @classmethod
+    def from_env(cls, model_name="fake-gemini", fast=False):
+        """Stub configured from FAKE_* variables; fast=True divides its latency by FAKE_FAST_SPEEDUP"""
+        latency = LatencyModel.from_env()
+        if fast:
+            latency = latency.scaled(1 / float(os.getenv("FAKE_FAST_SPEEDUP", "4")))
+        return cls(model_name, latency=latency, error_rate=float(os.getenv("FAKE_ERROR_RATE", "0")))
+
+    def generate_content(self, prompt, stream=False, **kwargs):
+        return self._respond(prompt, prompt, stream)
+
+    def start_chat(self, history=None):
+        return FakeChatSession(self, history)
+
+    def _respond(self, prompt, message, stream):
+        """Reply to message, with latency and usage based on the whole prompt sent upstream"""
+        self.calls += 1
+        text = self.responder(message)
+        usage = FakeUsage(prompt, text)
+        if not stream:
+            time.sleep(self.latency.first_token_delay(usage.prompt_token_count) + self.latency.token_delay(usage.candidates_token_count))
+            self._errors.maybe_raise()
+            return FakeResponse(text, usage)
+        return self._stream(text, usage)
+
+    def _stream(self, text, usage):
+        time.sleep(self.latency.first_token_delay(usage.prompt_token_count))
+        self._errors.maybe_raise()
+        for start in range(0, len(text), self.chunk_size):
+            chunk = text[start:start + self.chunk_size]
+            time.sleep(self.latency.token_delay(estimate_tokens(chunk)))
+            last = start + self.chunk_size >= len(text)
+            yield FakeChunk(chunk, usage if last else None)
+
+
+class FakeChatSession:
+    """Mimics genai.ChatSession: the whole history is sent with every message and grows by one exchange"""
+
+    def __init__(self, model, history=None):
+        self.model = model
+        self.history = list(history or [])
+
+    def send_message(self, content, stream=False, **kwargs):
+        prompt = "\n".join([part for message in self.history for part in message["parts"]] + [content])
+        response = self.model._respond(prompt, content, stream)
+        if not stream:
+            self._append(content, response.text)
+            return response
+        return self._stream(content, response)
+
+    def _stream(self, content, chunks):
+        text = ""
+        for chunk in chunks:
+            text += chunk.text
+            yield chunk
+        self._append(content, text)
+
+    def _append(self, content, text):
+        self.history += [{"role": "user", "parts": [content]}, {"role": "model", "parts": [text]}]
+
+
+def synthetic_postings(count, seed=0, location=None):
+    """Deterministic job postings in the shape Firecrawl extraction returns"""
+    rng = random.Random(seed)
+    postings = []
+    for i in range(count):
+        low = rng.randint(0, 8)
+        postings.append({
+            "title": rng.choice(TITLES),
+            "company": rng.choice(COMPANIES),
+            "location": location or rng.choice(CITIES),
+            "experience": f"{low}-{low + rng.randint(2, 5)} years",
+            "skills": rng.sample(SKILL_POOL, rng.randint(3, 7)),
+            "salary": f"₹{8 + low * 3}-{14 + low * 4} LPA",
+            "url": f"https://example.com/jobs/{seed}-{i}",
+            "posted_date": "2024-05-01"
+        })
+    return postings
+
+
+class FakeDocument:
+    """Mimics the Document a v2 Firecrawl scrape returns"""
+
+    def __init__(self, payload):
+        self.json = payload
+        self.markdown = ""
+
+
+class FakeFirecrawlApp:
+    """Drop-in replacement for FirecrawlApp returning synthetic postings per URL"""
+
+    def __init__(self, postings_per_page=10, latency=None, error_rate=0.0, seed=None):
+        self.postings_per_page = postings_per_page
+        self.latency = latency or LatencyModel(first_token=0.3, per_token=0.0)
+        self.calls = 0
+        self._errors = _ErrorInjector(error_rate, seed)
+
+    @classmethod
+    def from_env(cls):
+        return cls(
+            postings_per_page=int(os.getenv("FAKE_POSTINGS_PER_PAGE", "10")),
+            latency=LatencyModel.from_env("FAKE_FIRECRAWL"),
+            error_rate=float(os.getenv("FAKE_FIRECRAWL_ERROR_RATE", "0"))
+        )
+
+    def scrape(self, url, formats=None, timeout=None, **kwargs):
+        self.calls += 1
+        time.sleep(self.latency.first_token_delay())
+        self._errors.maybe_raise((TimeoutError, ConnectionError))
+        seed = int(hashlib.sha1(url.encode("utf-8")).hexdigest()[:8], 16)
+        return FakeDocument({"jobs": synthetic_postings(self.postings_per_page, seed)})
+
+
+def synthetic_resume_text(seed=0, roles=3):
+    """Plausible resume text with sections, dated roles and skills"""
+    rng = random.Random(seed)
+    year = 2024
+    lines = [f"Candidate {seed}", f"{rng.choice(TITLES)} | {rng.choice(CITIES)}", "", "SUMMARY",
+             f"Engineer with {roles * 2}+ years of experience. Strong communication and leadership.", "",
+             "WORK EXPERIENCE"]
+    for i in range(roles):
+        start = year - rng.randint(1, 3)
+        end = "Present" if i == 0 else f"Dec {year}"
+        lines += [f"{rng.choice(TITLES)} at {rng.choice(COMPANIES)}", f"Jan {start} - {end}"]
+        lines += [f"• Built services using {', '.join(rng.sample(SKILL_POOL, 3))}" for _ in range(3)]
+        year = start - 1
+    lines += ["", "EDUCATION", "B.Tech in Computer Science, 2012 - 2016", "", "SKILLS",
+              ", ".join(rng.sample(SKILL_POOL, 10)), "", "CERTIFICATIONS", "AWS Certified Developer"]
+    return "\n".join(lines)
+
+
+def synthetic_job_description(seed=0):
+    rng = random.Random(seed)
+    skills = rng.sample(SKILL_POOL, 6)
+    return (f"We are hiring a {rng.choice(TITLES)} at {rng.choice(COMPANIES)} in {rng.choice(CITIES)}.\n"
+            f"Requirements: {rng.randint(2, 6)}+ years of experience with {', '.join(skills[:4])}.\n"
+            f"Nice to have: {', '.join(skills[4:])}. Strong communication and ownership.")
+
+
+def make_pdf(pages):
+    """Build a minimal text PDF from a list of pages, each a list of lines"""
+    def escape(line):
+        return line.encode("latin-1", "replace").decode("latin-1").replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+    font_id = 3 + 2 * len(pages)
+    objects = [
+        "<< /Type /Catalog /Pages 2 0 R >>",
+        f"<< /Type /Pages /Kids [{' '.join(f'{3 + 2 * i} 0 R' for i in range(len(pages)))}] /Count {len(pages)} >>"
+    ]
+    for i, lines in enumerate(pages):
+        content = "BT /F1 10 Tf 13 TL 50 800 Td " + " ".join(f"({escape(line)}) Tj T*" for line in lines) + " ET"
+        objects.append(f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 842] "
+                       f"/Resources << /Font << /F1 {font_id} 0 R >> >> /Contents {4 + 2 * i} 0 R >>")
+        objects.append(f"<< /Length {len(content)} >>\nstream\n{content}\nendstream")
+    objects.append("<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+
+    out = b"%PDF-1.4\n"
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += f"{number} 0 obj\n{body}\nendobj\n".encode("latin-1")
+    xref = len(out)
+    out += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode("latin-1")
+    out += "".join(f"{offset:010d} 00000 n \n" for offset in offsets).encode("latin-1")
+    out += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode("latin-1")
+    return out
+
+
+def synthetic_resume_pdf(seed=0, lines_per_page=55):
+    """PDF bytes of synthetic_resume_text, split into pages"""
+    lines = synthetic_resume_text(seed).splitlines()
+    pages = [lines[i:i + lines_per_page] for i in range(0, len(lines), lines_per_page)] or [[""]]
+    return make_pdf(pages)
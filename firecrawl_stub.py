@@ -0,0 +1,123 @@
+"""Local stand-in for the Firecrawl API that replays recorded pages.
+
+Serve recorded pages:
+    python firecrawl_stub.py serve --port 3002 --fixtures fixtures/firecrawl
+
+Point the app at it:
+    FIRECRAWL_API_URL=http://localhost:3002 FIRECRAWL_API_KEY=stub streamlit run app.py
+
+Record a live page (needs a real FIRECRAWL_API_KEY):
+    python firecrawl_stub.py record "https://www.naukri.com/python-developer-jobs-in-bangalore?experience=3"
+"""
+import argparse
+import hashlib
+import json
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+DEFAULT_FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "firecrawl")
+
+
+def fixture_path(fixtures_dir, url):
+    """Path of the recorded page for a URL"""
+    return os.path.join(fixtures_dir, hashlib.sha1(url.encode("utf-8")).hexdigest()[:16] + ".json")
+
+
+def record_page(fixtures_dir, url, payload, markdown=""):
+    """Save an extracted page so the stub can replay it later"""
+    os.makedirs(fixtures_dir, exist_ok=True)
+    path = fixture_path(fixtures_dir, url)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"url": url, "markdown": markdown, "extract": payload}, f, indent=2, ensure_ascii=False)
+    return path
+
+
+def load_page(fixtures_dir, url):
+    """Return the recorded page for a URL, falling back to default.json"""
+    for path in (fixture_path(fixtures_dir, url), os.path.join(fixtures_dir, "default.json")):
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                return json.load(f)
+    return None
+
+
+def make_handler(fixtures_dir, latency=0.0):
+    """Build a request handler bound to a fixtures directory"""
+
+    class StubHandler(BaseHTTPRequestHandler):
+        def _send(self, status, body):
+            data = json.dumps(body).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def do_POST(self):
+            if not self.path.rstrip("/").endswith("/scrape"):
+                self._send(404, {"success": False, "error": f"Unsupported endpoint {self.path}"})
+                return
+            length = int(self.headers.get("Content-Length", 0))
+            request = json.loads(self.rfile.read(length) or b"{}")
+            page = load_page(fixtures_dir, request.get("url", ""))
+            if latency:
+                time.sleep(latency)
+            if page is None:
+                self._send(404, {"success": False, "error": f"No recording for {request.get('url')}"})
+                return
+            extract = page.get("extract", {})
+            self._send(200, {
+                "success": True,
+                "data": {
+                    "markdown": page.get("markdown", ""),
+                    "extract": extract,
+                    "json": extract,
+                    "metadata": {"sourceURL": request.get("url"), "statusCode": 200}
+                }
+            })
+
+        def log_message(self, format, *args):
+            pass
+
+    return StubHandler
+
+
+def start_stub_server(fixtures_dir=DEFAULT_FIXTURES_DIR, port=0, latency=0.0):
+    """Start the stub in a background thread and return (server, base_url)"""
+    server = ThreadingHTTPServer(("127.0.0.1", port), make_handler(fixtures_dir, latency))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay recorded Firecrawl pages for offline testing")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    serve = sub.add_parser("serve", help="Serve recorded pages")
+    serve.add_argument("--port", type=int, default=3002)
+    serve.add_argument("--fixtures", default=DEFAULT_FIXTURES_DIR)
+    serve.add_argument("--latency", type=float, default=0.0, help="Seconds to wait before each response")
+
+    record = sub.add_parser("record", help="Scrape a live page with Firecrawl and save it")
+    record.add_argument("url")
+    record.add_argument("--fixtures", default=DEFAULT_FIXTURES_DIR)
+
+    args = parser.parse_args()
+    if args.command == "serve":
+        server = ThreadingHTTPServer(("127.0.0.1", args.port), make_handler(args.fixtures, args.latency))
+        print(f"Firecrawl stub listening on http://127.0.0.1:{args.port} (fixtures: {args.fixtures})")
+        server.serve_forever()
+    else:
+        from dotenv import load_dotenv
+        from firecrawl import FirecrawlApp
+        from job_scraper import scrape_page
+
+        load_dotenv()
+        payload = scrape_page(FirecrawlApp(api_key=os.getenv("FIRECRAWL_API_KEY")), args.url)
+        print(record_page(args.fixtures, args.url, payload))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+"""Multi-turn mock interview on a Gemini chat session with a bounded context.
+
+Each turn sends only the question just answered and the candidate's answer. The chat history
+holds a fixed primer, a short summary of older turns and the most recent exchanges, so the
+prompt size (and with it per-turn latency) stays flat however long the interview runs.
+"""
+import os
+import re
+import uuid
+
+from core import notify, response_text
+from diagnostics import estimate_tokens, metrics, record_usage
+from prompt_builder import build_prompt, truncate_to_tokens
+from resources import get_llm_scheduler, get_model_router
+
+NAMESPACE = "mock_interview"
+# Exchanges kept verbatim in the chat history; older ones are folded into the summary
+INTERVIEW_RECENT_TURNS = int(os.getenv("INTERVIEW_RECENT_TURNS", "3"))
+INTERVIEW_SUMMARY_TOKENS = int(os.getenv("INTERVIEW_SUMMARY_TOKENS", "400"))
+
+QUESTION_PATTERN = re.compile(r"^\s*(?:\d+[.)]|[-*•])\s+(.+)$")
+QUESTION_LABEL_PATTERN = re.compile(
+    r"^\s*(?:\*\*|__)?[\[(]?(?:technical|behavio(?:u)?ral|situational|general)[\])]?\s*(?:question)?\s*[:\-–]?\s*(?:\*\*|__)?\s*",
+    re.IGNORECASE
+)
+ACKNOWLEDGEMENT = "Understood. Send me each question with the candidate's answer and I will give feedback."
+
+
+def parse_questions(text):
+    """Interview questions from a generated numbered or bulleted list, without type labels or markdown"""
+    questions = []
+    for line in (text or "").splitlines():
+        match = QUESTION_PATTERN.match(line)
+        if not match:
+            continue
+        question = QUESTION_LABEL_PATTERN.sub("", match.group(1))
+        question = re.sub(r"[*_`]+", "", question).strip()
+        question = re.sub(r"\s*[\[(](?:technical|behavio(?:u)?ral|situational)[\])]\s*$", "", question, flags=re.IGNORECASE)
+        if "?" in question:
+            questions.append(question)
+    return questions
+
+
+def _gist(text, words):
+    parts = text.split()
+    return " ".join(parts[:words]) + (" ..." if len(parts) > words else "")
+
+
+class MockInterview:
+    """Interview state for one candidate: questions, transcript, folded summary and the live chat"""
+
+    def __init__(self, questions_text, resume_text, job_description="", recent_turns=INTERVIEW_RECENT_TURNS):
+        self.id = uuid.uuid4().hex
+        self.questions = parse_questions(questions_text)
+        self.recent_turns = max(1, recent_turns)
+        self.primer = build_prompt(NAMESPACE, """
+        You are interviewing a job candidate. For each question and answer you receive,
+        give concise feedback: what worked, what to improve, and a score out of 10.
+        Do not ask the next question yourself.
+        When told the interview is over, add an overall assessment.
+
+        Job Description:
+        {job_description}
+
+        Candidate Resume:
+        {resume_text}
+        """, job_description=job_description, resume_text=resume_text)
+        self.turns = []
+        self.summary = []
+        self.folded = 0
+        self._chat = None
+        self._chat_model = None
+
+    def __getstate__(self):
+        # The live chat can't be pickled when the interview spills to disk; answer() rebuilds it from history()
+        state = dict(self.__dict__)
+        state["_chat"] = state["_chat_model"] = None
+        return state
+
+    @property
+    def finished(self):
+        return len(self.turns) >= len(self.questions)
+
+    @property
+    def current_question(self):
+        return None if self.finished else self.questions[len(self.turns)]
+
+    def history(self):
+        """Primer plus summary, then the recent exchanges verbatim, in genai chat-history form"""
+        primer = self.primer
+        if self.summary:
+            primer += "\n\nEarlier in this interview:\n" + "\n".join(self.summary)
+        history = [{"role": "user", "parts": [primer]}, {"role": "model", "parts": [ACKNOWLEDGEMENT]}]
+        for turn in self.turns[self.folded:]:
+            history += [{"role": "user", "parts": [turn["message"]]}, {"role": "model", "parts": [turn["feedback"]]}]
+        return history
+
+    def _fold(self):
+        """Move the oldest exchanges out of the chat into one-line summaries, dropping the oldest summaries past the budget"""
+        while len(self.turns) - self.folded > self.recent_turns:
+            turn = self.turns[self.folded]
+            self.folded += 1
+            self.summary.append(
+                f"Q{self.folded}: {turn['question']} | Answer: {_gist(turn['answer'], 30)} | "
+                f"Feedback: {_gist(turn['feedback'], 25)}"
+            )
+            self._chat = None
+        while len(self.summary) > 1 and estimate_tokens("\n".join(self.summary)) > INTERVIEW_SUMMARY_TOKENS:
+            self.summary.pop(0)
+        if self.summary:
+            self.summary[0] = truncate_to_tokens(self.summary[0], INTERVIEW_SUMMARY_TOKENS)
+
+    def answer(self, text, on_chunk=None):
+        """Send the answer to the current question and return the feedback, streaming it to on_chunk if given"""
+        question = self.current_question
+        if question is None:
+            return None
+        number = len(self.turns) + 1
+        message = f"Question {number}: {question}\nCandidate answer: {text.strip()}"
+        if number == len(self.questions):
+            message += "\n\nThe interview is over after this answer."
+
+        history = self.history()
+        # Everything the chat sends upstream this turn, for token accounting
+        context = "\n".join([part for item in history for part in item["parts"]] + [message])
+
+        def turn(model, timeout):
+            # A fallback to the other model tier starts a chat there from the same history
+            if self._chat is None or self._chat_model is not model:
+                self._chat, self._chat_model = model.start_chat(history=history), model
+            options = {"timeout": timeout} if timeout else None
+            try:
+                if on_chunk is None:
+                    response = self._chat.send_message(message, request_options=options)
+                    feedback = response_text(response)
+                else:
+                    feedback = ""
+                    response = None
+                    for response in self._chat.send_message(message, stream=True, request_options=options):
+                        feedback += response_text(response)
+                        on_chunk(feedback)
+            except Exception:
+                # A failed send can leave the session half-updated; retries rebuild it from the transcript
+                self._chat = None
+                raise
+            record_usage(NAMESPACE, context, response, feedback)
+            return feedback
+
+        def send():
+            with metrics.track(f"llm:{NAMESPACE}"):
+                return get_model_router().run(NAMESPACE, turn)[0]
+
+        try:
+            feedback, _ = get_llm_scheduler().call(f"{NAMESPACE}:{self.id}:{number}", send)
+        except Exception as e:
+            notify("error", f"Error getting interview feedback: {str(e)}")
+            return None
+        self.turns.append({"question": question, "answer": text.strip(), "message": message, "feedback": feedback})
+        self._fold()
+        return feedback
@@ -0,0 +1,152 @@
+"""Concurrent multi-platform job scraping on top of Firecrawl"""
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor, as_completed, TimeoutError as FuturesTimeoutError
+from datetime import datetime
+
+# Schema Firecrawl's LLM extraction fills for every search results page
+POSTING_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "jobs": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "title": {"type": "string"},
+                    "company": {"type": "string"},
+                    "location": {"type": "string"},
+                    "experience": {"type": "string"},
+                    "skills": {"type": "array", "items": {"type": "string"}},
+                    "salary": {"type": "string"},
+                    "url": {"type": "string"},
+                    "posted_date": {"type": "string"}
+                },
+                "required": ["title", "company"]
+            }
+        }
+    },
+    "required": ["jobs"]
+}
+
+# Max simultaneous scrapes per platform (job boards throttle aggressive clients)
+PLATFORM_CONCURRENCY = {
+    "Naukri": 3,
+    "Indeed": 2,
+    "Monster": 2,
+    "LinkedIn": 1,
+    "PayScale": 1
+}
+DEFAULT_PLATFORM_CONCURRENCY = 2
+MAX_SCRAPE_WORKERS = 8
+REQUEST_TIMEOUT = 30.0
+SEARCH_TIMEOUT = 60.0
+
+ScrapeTask = namedtuple("ScrapeTask", ["platform", "location", "url"])
+# cached is True when the postings came from the posting store instead of a fresh scrape
+ScrapeResult = namedtuple("ScrapeResult", ["task", "postings", "error", "elapsed", "cached"], defaults=(False,))
+
+
+def _field(result, name):
+    """Read a field from a Firecrawl response that may be a dict or a response object"""
+    if isinstance(result, dict):
+        return result.get(name)
+    return getattr(result, name, None)
+
+
+def scrape_page(firecrawl_app, url, timeout=REQUEST_TIMEOUT):
+    """Scrape one search results page and return Firecrawl's extracted payload"""
+    timeout_ms = int(timeout * 1000)
+    if hasattr(firecrawl_app, "scrape"):
+        # firecrawl-py 3.x+ (v2 API) takes format objects
+        result = firecrawl_app.scrape(url, formats=[{"type": "json", "schema": POSTING_SCHEMA}], timeout=timeout_ms)
+    else:
+        try:
+            # firecrawl-py 2.x takes keyword arguments
+            result = firecrawl_app.scrape_url(
+                url,
+                formats=["json"],
+                json_options={"schema": POSTING_SCHEMA},
+                timeout=timeout_ms
+            )
+        except TypeError:
+            # firecrawl-py 1.x takes a params dict
+            result = firecrawl_app.scrape_url(url, params={
+                "formats": ["extract"],
+                "extract": {"schema": POSTING_SCHEMA},
+                "timeout": timeout_ms
+            })
+    return _field(result, "json") or _field(result, "extract") or {}
+
+
+def normalize_posting(raw, task):
+    """Fill in the fields the UI relies on for a scraped posting"""
+    skills = raw.get("skills") or []
+    if isinstance(skills, str):
+        skills = [s.strip() for s in skills.split(",") if s.strip()]
+    return {
+        "title": raw.get("title") or "Untitled role",
+        "company": raw.get("company") or "Unknown company",
+        "location": raw.get("location") or task.location,
+        "experience": raw.get("experience") or "Not specified",
+        "skills": skills,
+        "salary": raw.get("salary") or "Not disclosed",
+        "url": raw.get("url") or task.url,
+        "platform": task.platform,
+        "posted_date": raw.get("posted_date") or datetime.now().strftime("%Y-%m-%d")
+    }
+
+
+def scrape_postings(firecrawl_app, task, timeout=REQUEST_TIMEOUT):
+    """Scrape a task's URL and return normalized postings"""
+    payload = scrape_page(firecrawl_app, task.url, timeout)
+    jobs = payload.get("jobs", []) if isinstance(payload, dict) else []
+    return [normalize_posting(job, task) for job in jobs if isinstance(job, dict)]
+
+
+def scrape_concurrently(firecrawl_app, tasks, scrape=scrape_postings, max_workers=MAX_SCRAPE_WORKERS,
+                        platform_limits=None, request_timeout=REQUEST_TIMEOUT, search_timeout=SEARCH_TIMEOUT):
+    """Fan tasks out over a bounded thread pool and yield a ScrapeResult as each one finishes.
+
+    Each platform gets its own concurrency limit. Tasks still running when search_timeout
+    expires are reported with a TimeoutError instead of blocking the caller.
+    """
+    if not tasks:
+        return
+    limits = dict(PLATFORM_CONCURRENCY, **(platform_limits or {}))
+    semaphores = {
+        platform: threading.BoundedSemaphore(limits.get(platform, DEFAULT_PLATFORM_CONCURRENCY))
+        for platform in {task.platform for task in tasks}
+    }
+    started = time.monotonic()
+
+    def run(task):
+        with semaphores[task.platform]:
+            task_started = time.monotonic()
+            postings = scrape(firecrawl_app, task, request_timeout)
+            return ScrapeResult(task, postings, None, time.monotonic() - task_started)
+
+    def collect(future, task):
+        try:
+            return future.result()
+        except Exception as e:
+            return ScrapeResult(task, [], e, time.monotonic() - started)
+
+    executor = ThreadPoolExecutor(max_workers=min(max_workers, len(tasks)))
+    futures = {executor.submit(run, task): task for task in tasks}
+    pending = set(futures)
+    try:
+        for future in as_completed(futures, timeout=search_timeout):
+            pending.discard(future)
+            yield collect(future, futures[future])
+    except FuturesTimeoutError:
+        for future in list(pending):
+            task = futures[future]
+            if future.done():
+                yield collect(future, task)
+            else:
+                future.cancel()
+                yield ScrapeResult(task, [], TimeoutError(f"timed out after {search_timeout:g}s"), time.monotonic() - started)
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,132 @@
+"""Persistent, content-addressed cache for LLM responses"""
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+
+DEFAULT_CACHE_PATH = os.getenv("LLM_CACHE_PATH", os.path.join(".cache", "llm_cache.sqlite3"))
+DEFAULT_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "2000"))
+DEFAULT_TTL = 24 * 3600
+
+
+def normalize_text(text):
+    """Collapse whitespace so cosmetic differences don't change the cache key"""
+    return re.sub(r"\s+", " ", text or "").strip()
+
+
+def make_cache_key(model_name, template, inputs):
+    """Hash (model name, prompt template, normalized inputs) into a cache key"""
+    if isinstance(inputs, str):
+        inputs = [inputs]
+    payload = json.dumps(
+        {
+            "model": model_name,
+            "template": template,
+            "inputs": [normalize_text(str(value)) for value in inputs],
+        },
+        sort_keys=True,
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class LLMCache:
+    """SQLite-backed response store with per-entry TTL and LRU eviction"""
+
+    def __init__(self, path=DEFAULT_CACHE_PATH, max_entries=DEFAULT_MAX_ENTRIES):
+        self.path = path
+        self.max_entries = max_entries
+        self.hits = {}
+        self.misses = {}
+        self._lock = threading.Lock()
+
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                namespace TEXT NOT NULL,
+                value TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                expires_at REAL NOT NULL,
+                last_access REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_responses_last_access ON responses(last_access)")
+        self._conn.commit()
+
+    def get(self, key, namespace="default"):
+        """Return the cached value for key, or None on a miss or expiry"""
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, expires_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None or row[1] < now:
+                if row is not None:
+                    self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                    self._conn.commit()
+                self.misses[namespace] = self.misses.get(namespace, 0) + 1
+                return None
+            self._conn.execute("UPDATE responses SET last_access = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+            self.hits[namespace] = self.hits.get(namespace, 0) + 1
+            return row[0]
+
+    def set(self, key, value, ttl=DEFAULT_TTL, namespace="default"):
+        """Store value under key for ttl seconds, evicting the least recently used entries"""
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, namespace, value, created_at, expires_at, last_access) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (key, namespace, value, now, now + ttl, now),
+            )
+            self._evict()
+            self._conn.commit()
+
+    def _evict(self):
+        """Drop expired rows, then the least recently used rows beyond max_entries"""
+        self._conn.execute("DELETE FROM responses WHERE expires_at < ?", (time.time(),))
+        count = self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+        overflow = count - self.max_entries
+        if overflow > 0:
+            self._conn.execute(
+                "DELETE FROM responses WHERE key IN "
+                "(SELECT key FROM responses ORDER BY last_access ASC LIMIT ?)",
+                (overflow,),
+            )
+
+    def clear(self):
+        """Remove every cached response and reset the counters"""
+        with self._lock:
+            self._conn.execute("DELETE FROM responses")
+            self._conn.commit()
+            self.hits.clear()
+            self.misses.clear()
+
+    def stats(self):
+        """Return hit/miss counters overall and per namespace"""
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+            hits = sum(self.hits.values())
+            misses = sum(self.misses.values())
+            namespaces = sorted(set(self.hits) | set(self.misses))
+            return {
+                "entries": entries,
+                "max_entries": self.max_entries,
+                "hits": hits,
+                "misses": misses,
+                "hit_rate": hits / (hits + misses) if hits + misses else 0.0,
+                "by_namespace": {
+                    ns: {"hits": self.hits.get(ns, 0), "misses": self.misses.get(ns, 0)}
+                    for ns in namespaces
+                },
+            }
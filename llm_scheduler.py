@@ -0,0 +1,206 @@
+"""Shared scheduler for Gemini calls: adaptive token bucket, retries with backoff and single-flight coalescing"""
+import os
+import random
+import threading
+import time
+
+GEMINI_RATE_PER_MINUTE = float(os.getenv("GEMINI_RATE_PER_MINUTE", "60"))
+GEMINI_BURST = int(os.getenv("GEMINI_BURST", "5"))
+GEMINI_MAX_RETRIES = int(os.getenv("GEMINI_MAX_RETRIES", "4"))
+# Give up rather than queue a caller behind the limiter for longer than this
+GEMINI_MAX_QUEUE_SECONDS = float(os.getenv("GEMINI_MAX_QUEUE_SECONDS", "120"))
+RETRY_BASE_DELAY = 1.0
+RETRY_MAX_DELAY = 30.0
+
+RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+RETRYABLE_NAMES = {"ResourceExhausted", "TooManyRequests", "ServiceUnavailable", "InternalServerError",
+                   "DeadlineExceeded", "InternalError"}
+
+
+class QueueTimeout(Exception):
+    """Raised when the limiter can't admit a call within the allowed wait"""
+
+
+def error_status(error):
+    """HTTP-style status code of an API error, if it carries one"""
+    code = getattr(error, "code", None)
+    if callable(code):  # grpc errors expose code() returning a StatusCode
+        try:
+            code = code()
+        except Exception:
+            return None
+    try:
+        return int(code)
+    except (TypeError, ValueError):
+        return None
+
+
+def is_quota_error(error):
+    return error_status(error) == 429 or type(error).__name__ in ("ResourceExhausted", "TooManyRequests")
+
+
+def is_retryable(error):
+    """Quota, server and transient network errors are worth retrying; bad requests are not"""
+    if isinstance(error, (TimeoutError, ConnectionError)):
+        return True
+    return error_status(error) in RETRYABLE_STATUS or type(error).__name__ in RETRYABLE_NAMES
+
+
+def backoff_delay(attempt, base=RETRY_BASE_DELAY, cap=RETRY_MAX_DELAY, rng=random):
+    """Exponential backoff with full jitter"""
+    return rng.uniform(0, min(cap, base * 2 ** attempt))
+
+
+class TokenBucket:
+    """Token bucket whose refill rate halves on quota errors and creeps back up on success"""
+
+    def __init__(self, rate_per_minute=GEMINI_RATE_PER_MINUTE, capacity=GEMINI_BURST, min_rate_per_minute=None):
+        self.max_rate = rate_per_minute / 60.0
+        self.min_rate = (min_rate_per_minute or max(1.0, rate_per_minute / 16)) / 60.0
+        self.rate = self.max_rate
+        self.capacity = max(1, capacity)
+        self.tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now):
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self, timeout=GEMINI_MAX_QUEUE_SECONDS):
+        """Take one token, blocking until one is available; raise QueueTimeout past timeout"""
+        if not self.max_rate:
+            return
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            if deadline is not None and now + wait > deadline:
+                raise QueueTimeout(f"Gemini rate limit queue exceeded {timeout:.0f}s")
+            time.sleep(wait)
+
+    def throttle(self):
+        """Quota hit upstream: drain the bucket and halve the rate"""
+        with self._lock:
+            self._refill(time.monotonic())
+            self.tokens = 0.0
+            self.rate = max(self.min_rate, self.rate / 2)
+
+    def recover(self):
+        """Successful call: step the rate back towards the configured quota"""
+        with self._lock:
+            self.rate = min(self.max_rate, self.rate + self.max_rate / 20)
+
+    def headroom(self):
+        """Fraction of the burst currently available (1.0 when the limiter is disabled)"""
+        if not self.max_rate:
+            return 1.0
+        with self._lock:
+            self._refill(time.monotonic())
+            return self.tokens / self.capacity
+
+    def rate_per_minute(self):
+        return round(self.rate * 60, 2)
+
+
+class _Flight:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """Concurrent calls with the same key share one execution of fn"""
+
+    def __init__(self):
+        self._flights = {}
+        self._lock = threading.Lock()
+
+    def do(self, key, fn):
+        """Return (result, shared); shared is True when another caller's execution was reused"""
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+            else:
+                flight.waiters += 1
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result, True
+
+        try:
+            flight.result = fn()
+            return flight.result, False
+        except Exception as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                self._flights.pop(key, None)
+            flight.done.set()
+
+
+class CallScheduler:
+    """Admits every Gemini call through one limiter, retries transient failures and coalesces duplicates"""
+
+    def __init__(self, limiter=None, max_retries=GEMINI_MAX_RETRIES, base_delay=RETRY_BASE_DELAY,
+                 max_delay=RETRY_MAX_DELAY, sleep=time.sleep):
+        self.limiter = limiter or TokenBucket()
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.sleep = sleep
+        self.flights = SingleFlight()
+        self._rng = random.Random()
+        self._lock = threading.Lock()
+        self.counters = {"calls": 0, "upstream": 0, "coalesced": 0, "retries": 0, "throttled": 0, "failed": 0}
+
+    def _count(self, name):
+        with self._lock:
+            self.counters[name] += 1
+
+    def call(self, key, fn):
+        """Run fn() once per concurrent key; return (result, shared)"""
+        self._count("calls")
+        result, shared = self.flights.do(key, lambda: self._with_retries(fn))
+        if shared:
+            self._count("coalesced")
+        return result, shared
+
+    def _with_retries(self, fn):
+        attempt = 0
+        while True:
+            self.limiter.acquire()
+            self._count("upstream")
+            try:
+                result = fn()
+            except Exception as e:
+                if is_quota_error(e):
+                    self._count("throttled")
+                    self.limiter.throttle()
+                if attempt >= self.max_retries or not is_retryable(e):
+                    self._count("failed")
+                    raise
+                self._count("retries")
+                self.sleep(backoff_delay(attempt, self.base_delay, self.max_delay, self._rng))
+                attempt += 1
+            else:
+                self.limiter.recover()
+                return result
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self.counters)
+        stats["rate_per_minute"] = self.limiter.rate_per_minute()
+        return stats
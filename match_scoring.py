@@ -0,0 +1,225 @@
+"""Vectorized job-to-profile match scoring.
+
+Postings are encoded against a shared skill vocabulary as a CSR-style
+(indptr, indices) layout, so skill overlap, IDF-weighted similarity and
+experience fit are computed for the whole batch with NumPy. Batches below
+VECTORIZE_MIN_POSTINGS, where NumPy's setup costs more than it saves, are
+scored with the same formula in plain Python.
+"""
+import math
+import os
+import re
+from collections import Counter
+from functools import lru_cache
+from itertools import chain
+
+import numpy as np
+
+# Blend of the score components; skills keep the 70/30 split with experience
+OVERLAP_WEIGHT = 0.35
+TFIDF_WEIGHT = 0.35
+EXPERIENCE_WEIGHT = 0.3
+EXPERIENCE_PENALTY_PER_YEAR = 10
+# Share of the final score taken by semantic (embedding) similarity when it is available
+SEMANTIC_WEIGHT = float(os.getenv("SEMANTIC_WEIGHT", "0.3"))
+# Smallest batch scored with NumPy; the per-posting loop is faster below this
+VECTORIZE_MIN_POSTINGS = int(os.getenv("VECTORIZE_MIN_POSTINGS", "500"))
+
+_YEARS_PATTERN = re.compile(r"\d+")
+
+
+# Skill names recur across searches, so their normalized forms are kept between calls
+@lru_cache(maxsize=16384)
+def normalize_skill(skill):
+    """Canonical vocabulary form of a skill name"""
+    return " ".join(str(skill).lower().split())
+
+
+class SkillVocabulary(dict):
+    """Maps raw skill strings to dense integer ids shared by their normalized form"""
+
+    def __init__(self):
+        super().__init__()
+        self.terms = {}
+
+    def __missing__(self, skill):
+        key = normalize_skill(skill)
+        term_id = self.terms.setdefault(key, len(self.terms))
+        self[skill] = term_id
+        return term_id
+
+    def encode(self, skills):
+        """Unique ids for a list of skills, adding unseen ones to the vocabulary"""
+        return sorted({self[skill] for skill in skills})
+
+    def add_all(self, skills):
+        """Register every distinct raw skill string, normalizing each one only once"""
+        for skill in dict.fromkeys(skills):
+            if skill not in self:
+                self.__missing__(skill)
+
+
+def encode_postings(postings, vocabulary):
+    """Encode each posting's distinct skills into CSR arrays (indptr, indices).
+
+    Raw strings are normalized once per distinct value; repeats within a posting, including case
+    variants of one skill, are dropped by sorting the (posting, term) pairs once.
+    """
+    skill_lists = [posting.get("skills") or () for posting in postings]
+    lengths = np.fromiter(map(len, skill_lists), dtype=np.int64, count=len(postings))
+    flat = list(chain.from_iterable(skill_lists))
+    vocabulary.add_all(flat)
+    indices = np.fromiter(map(vocabulary.__getitem__, flat), dtype=np.int64, count=len(flat))
+    n_terms = max(len(vocabulary.terms), 1)
+    pairs = np.repeat(np.arange(len(postings), dtype=np.int64) * n_terms, lengths) + indices
+    # Pairs are grouped by posting already, so a plain sort (much cheaper than np.unique) puts repeats side by side
+    pairs.sort()
+    distinct = np.empty(len(pairs), dtype=bool)
+    distinct[:1] = True
+    np.not_equal(pairs[1:], pairs[:-1], out=distinct[1:])
+    if not distinct.all():
+        pairs = pairs[distinct]
+    rows, indices = np.divmod(pairs, n_terms)
+    indptr = np.zeros(len(postings) + 1, dtype=np.int64)
+    np.cumsum(np.bincount(rows, minlength=len(postings)), out=indptr[1:])
+    return indptr, indices
+
+
+def required_years(text):
+    """Minimum years an experience string asks for, NaN where it doesn't say"""
+    match = _YEARS_PATTERN.search(str(text))
+    return float(match.group()) if match else np.nan
+
+
+def parse_required_experience(postings):
+    """Minimum years each posting asks for, parsing each distinct experience string once"""
+    texts = [posting.get("experience", "") for posting in postings]
+    years = {text: required_years(text) for text in dict.fromkeys(texts)}
+    return np.fromiter(map(years.__getitem__, texts), dtype=np.float64, count=len(postings))
+
+
+def _row_sums(values, indptr):
+    """Sum values per CSR row, returning 0 for empty rows"""
+    totals = np.concatenate(([0.0], np.cumsum(values, dtype=np.float64)))
+    return totals[indptr[1:]] - totals[indptr[:-1]]
+
+
+def compute_match_scores(postings, skills, experience):
+    """Score every posting against the profile; returns a float array of 0-100 scores"""
+    if not postings:
+        return np.zeros(0)
+
+    vocabulary = SkillVocabulary()
+    profile_ids = np.asarray(vocabulary.encode(skills), dtype=np.int64)
+    indptr, indices = encode_postings(postings, vocabulary)
+    n_postings, n_terms = len(postings), len(vocabulary.terms)
+
+    profile_mask = np.zeros(n_terms, dtype=bool)
+    profile_mask[profile_ids] = True
+    matched = profile_mask[indices]
+
+    # Plain overlap: share of the posting's skills the candidate has
+    posting_sizes = np.diff(indptr).astype(np.float64)
+    overlap_counts = _row_sums(matched, indptr)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        overlap = np.where(posting_sizes > 0, overlap_counts / posting_sizes * 100, 0.0)
+
+    # IDF-weighted cosine between binary skill vectors; rare skills count for more
+    document_frequency = np.bincount(indices, minlength=n_terms)
+    idf = np.log((1 + n_postings) / (1 + document_frequency)) + 1
+    weights_sq = idf[indices] ** 2
+    dot = _row_sums(np.where(matched, weights_sq, 0.0), indptr)
+    posting_norms = np.sqrt(_row_sums(weights_sq, indptr))
+    profile_norm = np.sqrt(np.sum(idf[profile_ids] ** 2))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        tfidf = np.where(posting_norms > 0, dot / (posting_norms * profile_norm), 0.0) * 100
+    tfidf = np.nan_to_num(tfidf)
+
+    # Experience fit: full marks when unspecified, minus a penalty per year of gap
+    required = parse_required_experience(postings)
+    gap = np.abs(experience - required)
+    experience_fit = np.where(
+        np.isnan(required), 100.0, np.clip(100 - gap * EXPERIENCE_PENALTY_PER_YEAR, 0, 100)
+    )
+
+    scores = overlap * OVERLAP_WEIGHT + tfidf * TFIDF_WEIGHT + experience_fit * EXPERIENCE_WEIGHT
+    return np.minimum(scores, 100.0)
+
+
+def score_postings(postings, skills, experience):
+    """compute_match_scores for small batches: the same 0-100 scores as a list, without NumPy"""
+    profile = set(map(normalize_skill, skills))
+    posting_skills = [set(map(normalize_skill, posting.get("skills") or ())) for posting in postings]
+    n_postings = len(postings)
+    # Squared IDF weights, as in the vectorized cosine; profile-only skills have a document frequency of 0
+    document_frequency = Counter(chain.from_iterable(posting_skills))
+    by_frequency = {
+        frequency: (math.log((1 + n_postings) / (1 + frequency)) + 1) ** 2
+        for frequency in set(document_frequency.values()) | {0}
+    }
+
+    def weight_sum(terms):
+        return sum(map(by_frequency.__getitem__, map(document_frequency.__getitem__, terms)))
+
+    profile_norm = math.sqrt(weight_sum(profile))
+
+    # Experience fit per distinct experience string
+    texts = [posting.get("experience", "") for posting in postings]
+    fits = {}
+    for text in dict.fromkeys(texts):
+        required = required_years(text)
+        fits[text] = 100.0 if math.isnan(required) else min(
+            max(100 - abs(experience - required) * EXPERIENCE_PENALTY_PER_YEAR, 0), 100
+        )
+
+    scores = []
+    for terms, text in zip(posting_skills, texts):
+        matched = terms & profile
+        if matched:
+            overlap = len(matched) / len(terms) * 100
+            tfidf = weight_sum(matched) / (math.sqrt(weight_sum(terms)) * profile_norm) * 100
+            score = overlap * OVERLAP_WEIGHT + tfidf * TFIDF_WEIGHT + fits[text] * EXPERIENCE_WEIGHT
+        else:
+            score = fits[text] * EXPERIENCE_WEIGHT
+        scores.append(min(score, 100.0))
+    return scores
+
+
+def top_k_order(scores, platforms, k=None):
+    """Indices of the top-k scores, ties broken by platform name for a stable order"""
+    n = len(scores)
+    if n == 0:
+        return np.zeros(0, dtype=np.int64)
+    codes = {name: code for code, name in enumerate(sorted(set(platforms)))}
+    platform_codes = np.fromiter((codes[name] for name in platforms), dtype=np.int64, count=n)
+    candidates = np.arange(n)
+    if k is not None and k < n:
+        # Keep everything tied with the k-th best so the tie-break stays deterministic
+        threshold = np.partition(scores, n - k)[n - k]
+        candidates = np.flatnonzero(scores >= threshold)
+    order = candidates[np.lexsort((candidates, platform_codes[candidates], -scores[candidates]))]
+    return order[:k] if k is not None else order
+
+
+def rank_postings(postings, skills, experience, top_k=None, semantic=None):
+    """Attach match_score to each posting and return them best-first.
+
+    semantic, if given, is a 0-100 array of embedding similarity blended in with SEMANTIC_WEIGHT.
+    """
+    if len(postings) < VECTORIZE_MIN_POSTINGS:
+        scores = score_postings(postings, skills, experience)
+        if semantic is not None and len(semantic) == len(postings):
+            scores = [score * (1 - SEMANTIC_WEIGHT) + float(similarity) * SEMANTIC_WEIGHT
+                      for score, similarity in zip(scores, semantic)]
+        for posting, score in zip(postings, scores):
+            posting["match_score"] = score
+        platforms = [posting.get("platform", "") for posting in postings]
+        order = sorted(zip([-score for score in scores], platforms, range(len(postings))))
+        return [postings[i] for _, _, i in order[:top_k]]
+    scores = compute_match_scores(postings, skills, experience)
+    if semantic is not None and len(semantic) == len(postings):
+        scores = scores * (1 - SEMANTIC_WEIGHT) + np.asarray(semantic, dtype=np.float64) * SEMANTIC_WEIGHT
+    for posting, score in zip(postings, scores.tolist()):
+        posting["match_score"] = score
+    order = top_k_order(scores, [posting.get("platform", "") for posting in postings], top_k)
+    return [postings[i] for i in order.tolist()]
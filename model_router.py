@@ -0,0 +1,137 @@
+"""Per-helper Gemini model routing with tier fallback and per-route latency and quality signals.
+
+Light helpers (lists, short messages, extraction) go to the fast tier; deep analysis stays on
+the pro tier. A call that times out or hits quota on its tier is retried once on the other.
+Override routes with MODEL_ROUTES="generate_cover_letter=pro,get_industry_trends=pro".
+"""
+import json
+import os
+import threading
+import time
+
+from diagnostics import metrics
+from llm_scheduler import is_quota_error
+
+MODEL_TIERS = {
+    "fast": os.getenv("GEMINI_FAST_MODEL", "gemini-1.5-flash"),
+    "pro": os.getenv("GEMINI_PRO_MODEL", "gemini-1.5-pro"),
+}
+# Per-request timeout for each tier; a timeout falls back to the other tier
+TIER_TIMEOUTS = {
+    "fast": float(os.getenv("GEMINI_FAST_TIMEOUT", "30")),
+    "pro": float(os.getenv("GEMINI_PRO_TIMEOUT", "120")),
+}
+DEFAULT_TIER = os.getenv("GEMINI_DEFAULT_TIER", "pro")
+MODEL_FALLBACK = os.getenv("MODEL_FALLBACK", "1") != "0"
+
+DEFAULT_ROUTES = {
+    "analyze_job_with_gemini": "pro",
+    "optimize_resume": "pro",
+    "generate_cover_letter": "fast",
+    "extract_skills_from_resume": "fast",
+    "generate_interview_questions": "fast",
+    "mock_interview": "fast",
+    "generate_company_research": "fast",
+    "suggest_linkedin_connections": "fast",
+    "generate_outreach_template": "fast",
+    "get_industry_trends": "fast",
+}
+
+TIMEOUT_NAMES = {"DeadlineExceeded", "Timeout", "ReadTimeout", "TimeoutError"}
+
+
+def parse_routes(spec):
+    """{namespace: tier} from "namespace=tier,namespace=tier", ignoring unknown tiers"""
+    routes = {}
+    for item in (spec or "").split(","):
+        namespace, _, tier = item.partition("=")
+        if tier.strip() in MODEL_TIERS:
+            routes[namespace.strip()] = tier.strip()
+    return routes
+
+
+def _json_object(text):
+    text = text.strip().removeprefix("```json").removeprefix("```").removesuffix("```")
+    start, end = text.find("{"), text.rfind("}")
+    try:
+        return isinstance(json.loads(text[start:end + 1]), dict)
+    except ValueError:
+        return False
+
+
+# Cheap checks that a response has the shape its helper needs; anything else just has to be non-trivial
+QUALITY_CHECKS = {
+    "extract_skills_from_resume": _json_object,
+    "generate_interview_questions": lambda text: text.count("?") >= 5,
+}
+
+
+def passes_quality(namespace, text):
+    check = QUALITY_CHECKS.get(namespace)
+    return bool(text) and (check(text) if check else len(text.strip()) >= 20)
+
+
+def should_fall_back(error):
+    return is_quota_error(error) or isinstance(error, TimeoutError) or type(error).__name__ in TIMEOUT_NAMES
+
+
+class ModelRouter:
+    """Picks the model for each helper and falls back across tiers; models maps tier -> zero-arg factory"""
+
+    def __init__(self, models, routes=None, default_tier=DEFAULT_TIER, timeouts=None, fallback=MODEL_FALLBACK):
+        self.models = models
+        self.routes = {**DEFAULT_ROUTES, **(routes if routes is not None else parse_routes(os.getenv("MODEL_ROUTES")))}
+        self.default_tier = default_tier if default_tier in models else next(iter(models))
+        self.timeouts = {**TIER_TIMEOUTS, **(timeouts or {})}
+        self.fallback = fallback
+        self._lock = threading.Lock()
+        self._stats = {}
+
+    def tier(self, namespace):
+        tier = self.routes.get(namespace, self.default_tier)
+        return tier if tier in self.models else self.default_tier
+
+    def model_name(self, namespace):
+        return MODEL_TIERS.get(self.tier(namespace), self.tier(namespace))
+
+    def _record(self, namespace, tier, elapsed_ms, outcome):
+        metrics.observe(f"route:{namespace}:{tier}", elapsed_ms, outcome == "errors")
+        with self._lock:
+            entry = self._stats.setdefault((namespace, tier), {
+                "calls": 0, "errors": 0, "fallbacks": 0, "low_quality": 0, "total_ms": 0.0
+            })
+            entry["calls"] += 1
+            entry["total_ms"] += elapsed_ms
+            if outcome:
+                entry[outcome] += 1
+
+    def run(self, namespace, call):
+        """Return (call(model, timeout), tier that answered), retrying once on the other tier on quota or timeout"""
+        primary = self.tier(namespace)
+        tiers = [primary] + ([tier for tier in self.models if tier != primary][:1] if self.fallback else [])
+        for attempt, tier in enumerate(tiers):
+            started = time.perf_counter()
+            try:
+                text = call(self.models[tier](), self.timeouts.get(tier))
+            except Exception as e:
+                elapsed_ms = (time.perf_counter() - started) * 1000
+                if attempt + 1 < len(tiers) and should_fall_back(e):
+                    self._record(namespace, tier, elapsed_ms, "fallbacks")
+                    continue
+                self._record(namespace, tier, elapsed_ms, "errors")
+                raise
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            self._record(namespace, tier, elapsed_ms, None if passes_quality(namespace, text) else "low_quality")
+            return text, tier
+
+    def stats(self):
+        """Per-route counters with average latency, keyed "namespace:tier" """
+        with self._lock:
+            return {
+                f"{namespace}:{tier}": {
+                    **{key: value for key, value in entry.items() if key != "total_ms"},
+                    "model": MODEL_TIERS.get(tier, tier),
+                    "avg_ms": round(entry["total_ms"] / entry["calls"], 1),
+                }
+                for (namespace, tier), entry in sorted(self._stats.items())
+            }
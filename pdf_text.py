@@ -0,0 +1,75 @@
+"""Incremental PDF text extraction with a content-hash cache"""
+import hashlib
+import threading
+from collections import OrderedDict
+
+import PyPDF2
+
+HASH_CHUNK_SIZE = 64 * 1024
+
+
+def file_digest(stream):
+    """SHA-256 of a seekable binary stream, read in chunks and rewound afterwards"""
+    stream.seek(0)
+    digest = hashlib.sha256()
+    for chunk in iter(lambda: stream.read(HASH_CHUNK_SIZE), b""):
+        digest.update(chunk)
+    stream.seek(0)
+    return digest.hexdigest()
+
+
+def iter_pdf_pages(stream):
+    """Yield the text of each page lazily, without copying the whole file into memory"""
+    stream.seek(0)
+    reader = PyPDF2.PdfReader(stream)
+    for page in reader.pages:
+        yield page.extract_text() or ""  # Handle None returns
+
+
+def extract_pdf_text(stream, char_budget=None):
+    """Join page text once, stopping after char_budget characters if given"""
+    pages = []
+    total = 0
+    for text in iter_pdf_pages(stream):
+        pages.append(text)
+        total += len(text) + 1
+        if char_budget and total >= char_budget:
+            break
+    text = "\n".join(pages).strip()
+    return text[:char_budget] if char_budget else text
+
+
+class PdfTextCache:
+    """Small LRU of extracted text keyed by file content hash"""
+
+    def __init__(self, max_entries=64):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            if key not in self._entries:
+                return None
+            self._entries.move_to_end(key)
+            return self._entries[key]
+
+    def set(self, key, text):
+        with self._lock:
+            self._entries[key] = text
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def extract(self, stream, char_budget=None):
+        """Return cached text for identical content, parsing the PDF only on a miss"""
+        key = f"{file_digest(stream)}:{char_budget or 0}"
+        text = self.get(key)
+        if text is None:
+            text = extract_pdf_text(stream, char_budget)
+            self.set(key, text)
+        return text
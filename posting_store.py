@@ -0,0 +1,253 @@
+"""Persistent job-posting store with fuzzy deduplication and an inverted index for repeat searches"""
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+
+POSTING_STORE_PATH = os.getenv("POSTING_STORE_PATH", os.path.join(".cache", "postings.sqlite3"))
+# A (query, platform, location) scrape younger than this is answered from the store
+POSTING_REFRESH_SECONDS = float(os.getenv("POSTING_REFRESH_HOURS", "6")) * 3600
+# Postings not seen in any scrape for this long are left out of results
+POSTING_MAX_AGE_SECONDS = float(os.getenv("POSTING_MAX_AGE_DAYS", "14")) * 86400
+
+LOCATION_ALIASES = {
+    "bengaluru": "bangalore", "gurugram": "gurgaon", "new delhi": "delhi", "delhi ncr": "delhi",
+    "bombay": "mumbai", "navi mumbai": "mumbai", "madras": "chennai", "calcutta": "kolkata",
+    "work from home": "remote", "wfh": "remote"
+}
+# Locations that match every posting
+ANY_LOCATION = {"anywhere", ""}
+COMPANY_SUFFIXES = re.compile(
+    r"\b(private|pvt|limited|ltd|inc|incorporated|llc|llp|corp|corporation|co|company|india|technologies|"
+    r"technology|solutions|services|software|systems|labs|group)\b"
+)
+TITLE_SYNONYMS = {"sr": "senior", "jr": "junior", "engg": "engineer", "dev": "developer", "mgr": "manager",
+                  "sde": "software developer engineer", "swe": "software engineer"}
+TITLE_NOISE = {"urgent", "hiring", "opening", "immediate", "joiner", "joiners", "wfh", "remote", "hybrid", "onsite",
+               "job", "jobs", "for", "the", "and", "of", "in", "a", "an", "at", "with"}
+
+
+def _words(text):
+    return re.findall(r"[a-z0-9+#]+", (text or "").lower())
+
+
+def normalize_title(title):
+    """Lower-case words with abbreviations expanded and parenthesized or noise words dropped"""
+    title = re.sub(r"\(.*?\)|\[.*?\]", " ", title or "")
+    words = []
+    for word in _words(title):
+        words.extend(TITLE_SYNONYMS.get(word, word).split())
+    return [word for word in words if word not in TITLE_NOISE]
+
+
+def normalize_company(company):
+    return " ".join(_words(COMPANY_SUFFIXES.sub(" ", (company or "").lower())))
+
+
+def normalize_location(location):
+    """Canonical city name: first comma-separated part, with common aliases folded"""
+    city = " ".join(_words((location or "").split(",")[0]))
+    return LOCATION_ALIASES.get(city, city)
+
+
+def fingerprint(posting):
+    """Stable key for 'the same job' across boards: sorted title words, bare company name and city"""
+    key = "|".join([
+        " ".join(sorted(set(normalize_title(posting.get("title"))))),
+        normalize_company(posting.get("company")),
+        normalize_location(posting.get("location"))
+    ])
+    return hashlib.sha1(key.encode("utf-8")).hexdigest()
+
+
+def query_key(job_title):
+    return " ".join(normalize_title(job_title))
+
+
+class PostingStore:
+    """SQLite posting table keyed by fingerprint, with a term index and a log of which scrapes found what"""
+
+    def __init__(self, path=POSTING_STORE_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS postings (
+                id INTEGER PRIMARY KEY,
+                fingerprint TEXT UNIQUE NOT NULL,
+                data TEXT NOT NULL,
+                first_seen REAL NOT NULL,
+                last_seen REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS sources (
+                posting_id INTEGER NOT NULL,
+                platform TEXT NOT NULL,
+                url TEXT NOT NULL,
+                PRIMARY KEY (posting_id, platform, url)
+            );
+            CREATE TABLE IF NOT EXISTS terms (
+                field TEXT NOT NULL,
+                term TEXT NOT NULL,
+                posting_id INTEGER NOT NULL,
+                PRIMARY KEY (field, term, posting_id)
+            ) WITHOUT ROWID;
+            CREATE TABLE IF NOT EXISTS scrapes (
+                query TEXT NOT NULL,
+                platform TEXT NOT NULL,
+                location TEXT NOT NULL,
+                scraped_at REAL NOT NULL,
+                PRIMARY KEY (query, platform, location)
+            );
+            CREATE TABLE IF NOT EXISTS scrape_hits (
+                query TEXT NOT NULL,
+                platform TEXT NOT NULL,
+                location TEXT NOT NULL,
+                posting_id INTEGER NOT NULL,
+                PRIMARY KEY (query, platform, location, posting_id)
+            ) WITHOUT ROWID;
+            """
+        )
+        self._conn.commit()
+
+    def _index_terms(self, posting_id, posting):
+        rows = {("title", word) for word in normalize_title(posting.get("title"))}
+        rows |= {("skill", skill.strip().lower()) for skill in posting.get("skills", []) if skill.strip()}
+        rows.add(("location", normalize_location(posting.get("location"))))
+        self._conn.executemany(
+            "INSERT OR IGNORE INTO terms (field, term, posting_id) VALUES (?, ?, ?)",
+            [(field, term, posting_id) for field, term in rows]
+        )
+
+    def upsert(self, postings, job_title, platform, location):
+        """Store postings from one scrape, merging duplicates; return how many were new"""
+        now = time.time()
+        query = query_key(job_title)
+        new = 0
+        with self._lock:
+            for posting in postings:
+                fp = fingerprint(posting)
+                row = self._conn.execute("SELECT id, data FROM postings WHERE fingerprint = ?", (fp,)).fetchone()
+                if row is None:
+                    cursor = self._conn.execute(
+                        "INSERT INTO postings (fingerprint, data, first_seen, last_seen) VALUES (?, ?, ?, ?)",
+                        (fp, json.dumps(posting, ensure_ascii=False), now, now)
+                    )
+                    posting_id = cursor.lastrowid
+                    self._index_terms(posting_id, posting)
+                    new += 1
+                else:
+                    posting_id, data = row
+                    merged = json.loads(data)
+                    # Boards disagree on detail; keep whatever each one adds
+                    merged["skills"] = list(dict.fromkeys(merged.get("skills", []) + posting.get("skills", [])))
+                    for field, value in posting.items():
+                        if merged.get(field) in (None, "", "Not disclosed", "Not specified"):
+                            merged[field] = value
+                    self._conn.execute("UPDATE postings SET data = ?, last_seen = ? WHERE id = ?",
+                                       (json.dumps(merged, ensure_ascii=False), now, posting_id))
+                    self._index_terms(posting_id, merged)
+                self._conn.execute("INSERT OR IGNORE INTO sources (posting_id, platform, url) VALUES (?, ?, ?)",
+                                   (posting_id, posting.get("platform", platform), posting.get("url", "")))
+                self._conn.execute(
+                    "INSERT OR IGNORE INTO scrape_hits (query, platform, location, posting_id) VALUES (?, ?, ?, ?)",
+                    (query, platform, normalize_location(location), posting_id)
+                )
+            self._conn.execute(
+                "INSERT OR REPLACE INTO scrapes (query, platform, location, scraped_at) VALUES (?, ?, ?, ?)",
+                (query, platform, normalize_location(location), now)
+            )
+            self._conn.commit()
+        return new
+
+    def is_fresh(self, job_title, platform, location, max_age=POSTING_REFRESH_SECONDS):
+        """Whether this search was scraped recently enough to answer from the store"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT scraped_at FROM scrapes WHERE query = ? AND platform = ? AND location = ?",
+                (query_key(job_title), platform, normalize_location(location))
+            ).fetchone()
+        return row is not None and time.time() - row[0] < max_age
+
+    def _load(self, ids, platforms=None):
+        """Fresh postings by id, with platform and url taken from a listing on one of the selected boards"""
+        if not ids:
+            return []
+        ids = sorted(ids)
+        placeholders = ",".join("?" * len(ids))
+        cutoff = time.time() - POSTING_MAX_AGE_SECONDS
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT id, data FROM postings WHERE id IN ({placeholders}) AND last_seen >= ?", (*ids, cutoff)
+            ).fetchall()
+            sources = {}
+            for posting_id, platform, url in self._conn.execute(
+                f"SELECT posting_id, platform, url FROM sources WHERE posting_id IN ({placeholders})", ids
+            ):
+                sources.setdefault(posting_id, []).append({"platform": platform, "url": url})
+        postings = []
+        for posting_id, data in rows:
+            posting = json.loads(data)
+            listed = [source for source in sources.get(posting_id, []) if not platforms or source["platform"] in platforms]
+            if platforms and not listed:
+                continue
+            if listed:
+                posting.update(listed[0])
+            postings.append(posting)
+        return postings
+
+    def search(self, job_title, locations, platforms=None, skills=None):
+        """Postings scraped for this query plus indexed postings matching every title word and a location"""
+        query = query_key(job_title)
+        places = {normalize_location(location) for location in locations}
+        match_anywhere = bool(places & ANY_LOCATION)
+        with self._lock:
+            ids = set()
+            for place in places:
+                ids.update(posting_id for (posting_id,) in self._conn.execute(
+                    "SELECT posting_id FROM scrape_hits WHERE query = ? AND location = ?", (query, place)
+                ))
+
+            words = sorted(set(query.split()))
+            if words:
+                title_ids = None
+                for word in words:
+                    matches = {posting_id for (posting_id,) in self._conn.execute(
+                        "SELECT posting_id FROM terms WHERE field = 'title' AND term = ?", (word,)
+                    )}
+                    title_ids = matches if title_ids is None else title_ids & matches
+                if title_ids and not match_anywhere:
+                    placeholders = ",".join("?" * len(places))
+                    located = {posting_id for (posting_id,) in self._conn.execute(
+                        f"SELECT posting_id FROM terms WHERE field = 'location' AND term IN ({placeholders})",
+                        tuple(places)
+                    )}
+                    title_ids &= located
+                ids |= title_ids or set()
+
+            if skills:
+                placeholders = ",".join("?" * len(skills))
+                ids &= {posting_id for (posting_id,) in self._conn.execute(
+                    f"SELECT posting_id FROM terms WHERE field = 'skill' AND term IN ({placeholders})",
+                    tuple(skill.lower() for skill in skills)
+                )}
+        return self._load(ids, platforms)
+
+    def clear(self):
+        with self._lock:
+            for table in ("postings", "sources", "terms", "scrapes", "scrape_hits"):
+                self._conn.execute(f"DELETE FROM {table}")
+            self._conn.commit()
+
+    def stats(self):
+        with self._lock:
+            postings = self._conn.execute("SELECT COUNT(*) FROM postings").fetchone()[0]
+            sources = self._conn.execute("SELECT COUNT(*) FROM sources").fetchone()[0]
+            scrapes = self._conn.execute("SELECT COUNT(*) FROM scrapes").fetchone()[0]
+        return {"postings": postings, "listings": sources, "duplicates_merged": sources - postings, "scrapes": scrapes}
@@ -0,0 +1,191 @@
+"""Compact prompt construction: whitespace and boilerplate cleanup, relevance trimming and token budgets"""
+import json
+import math
+import re
+from collections import defaultdict
+
+from diagnostics import estimate_tokens, metrics
+from resume_parser import heading_section
+
+# Upper bound on prompt tokens per helper; inputs are trimmed to fit
+PROMPT_TOKEN_BUDGETS = {
+    "analyze_job_with_gemini": 1500,
+    "optimize_resume": 4000,
+    "generate_cover_letter": 2500,
+    "mock_interview": 1500,
+}
+DEFAULT_PROMPT_BUDGET = 4000
+
+# Resume sections that are always kept when trimming
+CORE_SECTIONS = ("header", "summary", "skills")
+HEADER_MAX_LINES = 6
+
+STOPWORDS = {
+    "the", "and", "for", "with", "you", "your", "our", "are", "will", "have", "has", "this", "that", "from",
+    "who", "all", "can", "any", "not", "but", "job", "role", "work", "team", "years", "year", "experience",
+    "strong", "good", "ability", "skills", "including", "such", "what", "into", "about", "their", "they"
+}
+# Page furniture PDF extraction leaves between pages
+PAGE_NUMBER_PATTERN = re.compile(r"^(page\s*)?\d+(\s*(of|/)\s*\d+)?$", re.IGNORECASE)
+# A header/footer line recurs once per page, so its repeats are at least this many lines apart
+MIN_PAGE_LINES = 20
+# Allowed variation in lines per page, as a fraction of the page length
+PAGE_LENGTH_DRIFT = 0.2
+BULLET_PATTERN = re.compile(r"^\s*([•▪◦●\-*–]|\d+[.)])\s+")
+TOKEN_PATTERN = re.compile(r"[a-z][a-z0-9+#.]*[a-z0-9+#]|[a-z]")
+
+
+def compact_text(text):
+    """Collapse runs of spaces, strip every line and squeeze blank lines to one"""
+    lines = [re.sub(r"[ \t ]+", " ", line).strip() for line in (text or "").splitlines()]
+    return re.sub(r"\n{3,}", "\n\n", "\n".join(lines)).strip()
+
+
+def strip_page_furniture(text):
+    """Drop header/footer lines that PDF extraction repeats at the same spot on every page.
+
+    A line (digits ignored, so "Page 1 of 2" matches "Page 2 of 2") counts only if every occurrence is
+    a page-sized block apart and it shows up once in each such block, so titles, bullets or years that
+    repeat inside sections are kept. The first copy of a running header such as the name stays.
+    """
+    lines = text.splitlines()
+    positions = defaultdict(list)
+    for i, line in enumerate(lines):
+        key = re.sub(r"\d+", "#", line.strip().lower())
+        if key:
+            positions[key].append(i)
+    dropped = set()
+    for key, found in positions.items():
+        if len(found) < 2:
+            continue
+        gaps = [later - earlier for earlier, later in zip(found, found[1:])]
+        page = max(gaps)
+        if min(gaps) < MIN_PAGE_LINES or page - min(gaps) > page * PAGE_LENGTH_DRIFT:
+            continue
+        # Same position on every page: no page-sized stretch before the first or after the last copy
+        if found[0] >= page or len(lines) - 1 - found[-1] >= page:
+            continue
+        dropped.update(found if PAGE_NUMBER_PATTERN.match(lines[found[0]].strip()) else found[1:])
+    return "\n".join(line for i, line in enumerate(lines) if i not in dropped)
+
+
+def compact_json(value):
+    """Minified JSON without empty fields"""
+    if isinstance(value, dict):
+        value = {key: item for key, item in value.items() if item not in (None, "", [], {})}
+    return json.dumps(value, separators=(",", ":"), ensure_ascii=False)
+
+
+def keywords(text):
+    return {token for token in TOKEN_PATTERN.findall(text.lower()) if token not in STOPWORDS and len(token) > 1}
+
+
+def truncate_to_tokens(text, max_tokens):
+    """Cut text to roughly max_tokens, at a line boundary when one is close"""
+    if estimate_tokens(text) <= max_tokens:
+        return text
+    cut = text[:max(0, max_tokens * 4)]
+    newline = cut.rfind("\n")
+    return cut[:newline] if newline > len(cut) * 0.8 else cut
+
+
+def _resume_blocks(resume_text):
+    """Split a resume into (section, heading, entries) in original order.
+
+    Entries end at blank lines or where a non-bullet line (e.g. the next role's title) follows bullets.
+    """
+    blocks = [["header", "", [[]]]]
+    previous_bullet = False
+    for line in resume_text.splitlines():
+        section = heading_section(line)
+        bullet = bool(BULLET_PATTERN.match(line))
+        if section:
+            blocks.append([section, line.strip(), [[]]])
+        elif not line.strip():
+            blocks[-1][2].append([])
+        else:
+            if previous_bullet and not bullet:
+                blocks[-1][2].append([])
+            blocks[-1][2][-1].append(line)
+        previous_bullet = bullet
+    return [(section, heading, ["\n".join(entry) for entry in entries if entry]) for section, heading, entries in blocks]
+
+
+def relevant_resume(resume_text, context, max_tokens):
+    """Keep core sections plus the resume entries that share most keywords with context, within max_tokens"""
+    if estimate_tokens(resume_text) <= max_tokens:
+        return resume_text
+    wanted = keywords(context)
+    blocks = _resume_blocks(resume_text)
+
+    section, heading, entries = blocks[0]
+    blocks[0] = (section, heading, ["\n".join("\n".join(entries).splitlines()[:HEADER_MAX_LINES])] if entries else [])
+
+    chosen = set()
+    used = 0
+    candidates = []
+    for b, (section, heading, entries) in enumerate(blocks):
+        used += estimate_tokens(heading) + 1
+        for e, entry in enumerate(entries):
+            if section in CORE_SECTIONS:
+                chosen.add((b, e))
+                used += estimate_tokens(entry) + 1
+            else:
+                overlap = len(wanted & keywords(entry))
+                # Prefer matching entries; among equals prefer earlier (usually more recent) ones
+                candidates.append((-overlap / math.sqrt(estimate_tokens(entry) or 1), b, e))
+
+    for _, b, e in sorted(candidates):
+        cost = estimate_tokens(blocks[b][2][e]) + 1
+        if used + cost <= max_tokens:
+            chosen.add((b, e))
+            used += cost
+
+    parts = []
+    for b, (section, heading, entries) in enumerate(blocks):
+        kept = [entry for e, entry in enumerate(entries) if (b, e) in chosen]
+        if kept:
+            parts.append("\n".join(([heading] if heading else []) + kept))
+    return truncate_to_tokens("\n\n".join(parts), max_tokens)
+
+
+def _fit_fields(fields, available):
+    """Water-fill the token budget across fields; a field over its share loses page furniture, then the
+    resume is trimmed by relevance and the rest truncated"""
+    sizes = {name: estimate_tokens(text) for name, text in fields.items()}
+    if sum(sizes.values()) <= available:
+        return fields
+    context = "\n".join(text for name, text in fields.items() if name != "resume_text")
+    fitted = {}
+    remaining = max(0, available)
+    for i, name in enumerate(sorted(fields, key=sizes.get)):
+        share = remaining // (len(fields) - i)
+        text = fields[name]
+        if sizes[name] > share:
+            text = strip_page_furniture(text)
+        if estimate_tokens(text) > share:
+            text = relevant_resume(text, context, share) if name == "resume_text" else truncate_to_tokens(text, share)
+        fitted[name] = text
+        remaining -= estimate_tokens(text)
+    return fitted
+
+
+def build_prompt(namespace, template, **fields):
+    """Fill a str.format template with compacted fields that fit the namespace's token budget.
+
+    Strings are whitespace-normalized and dicts/lists become compact JSON; only fields over their share of
+    the budget are cut further. Tokens saved against the uncompacted prompt are recorded in diagnostics.
+    """
+    raw = template.format(**{
+        name: value if isinstance(value, str) else json.dumps(value, indent=2) for name, value in fields.items()
+    })
+    compacted = {
+        name: compact_text(value) if isinstance(value, str) else compact_json(value)
+        for name, value in fields.items()
+    }
+    template = compact_text(template)
+    fixed = estimate_tokens(template.format(**{name: "" for name in fields}))
+    budget = PROMPT_TOKEN_BUDGETS.get(namespace, DEFAULT_PROMPT_BUDGET)
+    prompt = template.format(**_fit_fields(compacted, budget - fixed))
+    metrics.record_prompt(namespace, estimate_tokens(raw), estimate_tokens(prompt))
+    return prompt
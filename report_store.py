@@ -0,0 +1,206 @@
+"""Versioned store of precomputed reports plus a background warmer that keeps popular keys fresh"""
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import namedtuple
+
+from llm_cache import normalize_text
+
+logger = logging.getLogger(__name__)
+
+REPORT_STORE_PATH = os.getenv("REPORT_STORE_PATH", os.path.join(".cache", "reports.sqlite3"))
+REPORT_WARMUP = os.getenv("REPORT_WARMUP", "1") != "0"
+REPORT_REFRESH_SECONDS = float(os.getenv("REPORT_REFRESH_HOURS", "24")) * 3600
+# Keys nobody has asked for in this long stop being warmed and their reports are dropped
+REPORT_IDLE_SECONDS = float(os.getenv("REPORT_IDLE_DAYS", "30")) * 86400
+# Seconds between background generations, so warm-up never bursts through the quota
+REPORT_WARM_PACE_SECONDS = float(os.getenv("REPORT_WARM_PACE_SECONDS", "2"))
+# Most-requested keys kept warm in addition to the configured seeds
+REPORT_WARM_POPULAR = int(os.getenv("REPORT_WARM_POPULAR", "20"))
+WARM_CHECK_SECONDS = 15 * 60
+
+StoredReport = namedtuple("StoredReport", ["content", "generated_at", "version"])
+
+
+def report_key(*parts):
+    """Case- and whitespace-insensitive key for report inputs"""
+    return "|".join(normalize_text(str(part)).lower() for part in parts)
+
+
+class ReportStore:
+    """SQLite table of generated reports keyed by (kind, key, version), plus demand counts per key"""
+
+    def __init__(self, path=REPORT_STORE_PATH):
+        self.path = path
+        self.hits = {}
+        self.misses = {}
+        self._lock = threading.Lock()
+
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS reports (
+                kind TEXT NOT NULL,
+                key TEXT NOT NULL,
+                version TEXT NOT NULL,
+                content TEXT NOT NULL,
+                generated_at REAL NOT NULL,
+                PRIMARY KEY (kind, key, version)
+            );
+            CREATE TABLE IF NOT EXISTS demand (
+                kind TEXT NOT NULL,
+                key TEXT NOT NULL,
+                args TEXT NOT NULL,
+                requests INTEGER NOT NULL,
+                last_requested REAL NOT NULL,
+                PRIMARY KEY (kind, key)
+            );
+            """
+        )
+        self._conn.commit()
+
+    def get(self, kind, key, version, count=True):
+        """Latest report for the current version, or None if it was never generated"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT content, generated_at, version FROM reports WHERE kind = ? AND key = ? AND version = ?",
+                (kind, key, version)
+            ).fetchone()
+            if count:
+                counter = self.hits if row else self.misses
+                counter[kind] = counter.get(kind, 0) + 1
+        return StoredReport(*row) if row else None
+
+    def put(self, kind, key, version, content):
+        """Store a report, dropping rows left over from older versions of the same key"""
+        with self._lock:
+            self._conn.execute("DELETE FROM reports WHERE kind = ? AND key = ? AND version != ?", (kind, key, version))
+            self._conn.execute(
+                "INSERT OR REPLACE INTO reports (kind, key, version, content, generated_at) VALUES (?, ?, ?, ?, ?)",
+                (kind, key, version, content, time.time())
+            )
+            self._conn.commit()
+
+    def record_demand(self, kind, key, args):
+        """Count a request so the warmer can keep popular keys fresh"""
+        with self._lock:
+            self._conn.execute(
+                """
+                INSERT INTO demand (kind, key, args, requests, last_requested) VALUES (?, ?, ?, 1, ?)
+                ON CONFLICT(kind, key) DO UPDATE SET requests = requests + 1, last_requested = excluded.last_requested
+                """,
+                (kind, key, json.dumps(list(args)), time.time())
+            )
+            self._conn.commit()
+
+    def popular(self, kind, limit=REPORT_WARM_POPULAR):
+        """Argument tuples of the most requested keys of a kind"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT args FROM demand WHERE kind = ? ORDER BY requests DESC, last_requested DESC LIMIT ?",
+                (kind, limit)
+            ).fetchall()
+        return [tuple(json.loads(args)) for (args,) in rows]
+
+    def prune(self, keep=(), idle_seconds=REPORT_IDLE_SECONDS):
+        """Forget demand idle for idle_seconds and drop reports whose (kind, key) is neither demanded nor in keep.
+
+        Returns the number of reports dropped.
+        """
+        with self._lock:
+            self._conn.execute("DELETE FROM demand WHERE last_requested < ?", (time.time() - idle_seconds,))
+            wanted = set(self._conn.execute("SELECT kind, key FROM demand").fetchall()) | set(keep)
+            stored = set(self._conn.execute("SELECT DISTINCT kind, key FROM reports").fetchall())
+            unwanted = list(stored - wanted)
+            self._conn.executemany("DELETE FROM reports WHERE kind = ? AND key = ?", unwanted)
+            self._conn.commit()
+        return len(unwanted)
+
+    def stats(self):
+        with self._lock:
+            rows = self._conn.execute("SELECT kind, COUNT(*), MIN(generated_at) FROM reports GROUP BY kind").fetchall()
+            hits, misses = dict(self.hits), dict(self.misses)
+        return {
+            kind: {
+                "reports": count,
+                "oldest_age_h": round((time.time() - oldest) / 3600, 1),
+                "hits": hits.get(kind, 0),
+                "misses": misses.get(kind, 0)
+            }
+            for kind, count, oldest in rows
+        }
+
+
+class ReportWarmer:
+    """Daemon thread that (re)generates stale or missing reports for a plan of keys and prunes the rest.
+
+    plan() returns (kind, args) pairs; refresh(kind, args) generates and stores one report;
+    version(kind) gives the current version; admit() says whether there is spare quota right now.
+    """
+
+    def __init__(self, store, plan, refresh, version, admit=lambda: True,
+                 refresh_seconds=REPORT_REFRESH_SECONDS, pace_seconds=REPORT_WARM_PACE_SECONDS):
+        self.store = store
+        self.plan = plan
+        self.refresh = refresh
+        self.version = version
+        self.admit = admit
+        self.refresh_seconds = refresh_seconds
+        self.pace_seconds = pace_seconds
+        self.status = {"running": False, "last_cycle": None, "generated": 0, "failures": 0, "pruned": 0}
+        self._stop = threading.Event()
+        self._thread = None
+
+    def is_stale(self, kind, args):
+        stored = self.store.get(kind, report_key(*args), self.version(kind), count=False)
+        return stored is None or time.time() - stored.generated_at > self.refresh_seconds
+
+    def run_once(self):
+        """Prune reports no longer demanded, then generate every stale one in the plan; return how many were generated"""
+        plan = list(self.plan())
+        self.status["pruned"] += self.store.prune({(kind, report_key(*args)) for kind, args in plan})
+        generated = 0
+        for kind, args in plan:
+            if self._stop.is_set():
+                break
+            if not self.is_stale(kind, args):
+                continue
+            # Background work only spends quota interactive users aren't using
+            while not self.admit() and not self._stop.wait(max(self.pace_seconds, 1.0)):
+                pass
+            try:
+                self.refresh(kind, args)
+                generated += 1
+                self.status["generated"] += 1
+            except Exception as e:
+                self.status["failures"] += 1
+                logger.warning("report warm-up failed for %s %s: %s", kind, args, e)
+            self._stop.wait(self.pace_seconds)
+        self.status["last_cycle"] = time.time()
+        return generated
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                self.run_once()
+            except Exception:
+                # A failing plan or store must not end warming for the life of the process
+                logger.exception("report warm-up cycle failed")
+            self._stop.wait(min(self.refresh_seconds, WARM_CHECK_SECONDS))
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="report-warmer", daemon=True)
+            self._thread.start()
+            self.status["running"] = True
+        return self
+
+    def stop(self):
+        self._stop.set()
+        self.status["running"] = False
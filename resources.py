@@ -0,0 +1,210 @@
+"""Process-wide clients and shared resources.
+
+Streamlit re-executes app.py on every interaction, but imported modules stay
+loaded, so everything here is built at most once per process and only when
+first used. Construction times are recorded in STARTUP_TIMINGS.
+"""
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+from dotenv import load_dotenv
+
+logger = logging.getLogger(__name__)
+
+PROCESS_STARTED = time.time()
+STARTUP_TIMINGS = {}
+
+_resources = {}
+_lock = threading.RLock()
+
+
+@contextmanager
+def timed(name):
+    """Record how long a startup step took"""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        STARTUP_TIMINGS[name] = time.perf_counter() - started
+        logger.info("startup: %s took %.1f ms", name, STARTUP_TIMINGS[name] * 1000)
+
+
+with timed("load_dotenv"):
+    load_dotenv()
+
+
+def get_resource(name, factory):
+    """Return the named singleton, building it with factory() on first use"""
+    resource = _resources.get(name)
+    if resource is None:
+        with _lock:
+            resource = _resources.get(name)
+            if resource is None:
+                with timed(name):
+                    resource = factory()
+                _resources[name] = resource
+    return resource
+
+
+def override_resource(name, resource):
+    """Install a prebuilt singleton, e.g. a fake client for benchmarks"""
+    with _lock:
+        _resources[name] = resource
+
+
+def reset_resource(name):
+    """Drop a singleton so the next access rebuilds it (e.g. after config changes)"""
+    with _lock:
+        _resources.pop(name, None)
+
+
+def _build_gemini_model(tier):
+    from model_router import MODEL_TIERS
+
+    if os.getenv("FAKE_GEMINI"):
+        # Offline stub for local testing; never touches the network
+        from fake_backends import FakeGenerativeModel
+        return FakeGenerativeModel.from_env(MODEL_TIERS[tier], fast=tier == "fast")
+
+    with timed("import google.generativeai"):
+        import google.generativeai as genai
+    genai.configure(api_key=os.getenv("GEMINI_API_KEY"))
+    return genai.GenerativeModel(MODEL_TIERS[tier])
+
+
+def _build_model_router():
+    from model_router import MODEL_TIERS, ModelRouter
+    return ModelRouter({tier: (lambda tier=tier: get_gemini_model(tier)) for tier in MODEL_TIERS})
+
+
+def _build_firecrawl_app():
+    if os.getenv("FAKE_FIRECRAWL"):
+        from fake_backends import FakeFirecrawlApp
+        return FakeFirecrawlApp.from_env()
+
+    with timed("import firecrawl"):
+        from firecrawl import FirecrawlApp
+    # One client per process so its HTTP session and connection pool are reused
+    if os.getenv("FIRECRAWL_API_URL"):
+        return FirecrawlApp(api_key=os.getenv("FIRECRAWL_API_KEY"), api_url=os.getenv("FIRECRAWL_API_URL"))
+    return FirecrawlApp(api_key=os.getenv("FIRECRAWL_API_KEY"))
+
+
+def _build_llm_cache():
+    from llm_cache import LLMCache
+    return LLMCache()
+
+
+def _build_pdf_text_cache():
+    from pdf_text import PdfTextCache
+    return PdfTextCache()
+
+
+def _build_llm_scheduler():
+    from llm_scheduler import CallScheduler
+    return CallScheduler()
+
+
+def _build_report_store():
+    from report_store import ReportStore
+    return ReportStore()
+
+
+def _build_posting_store():
+    from posting_store import PostingStore
+    return PostingStore()
+
+
+def _build_artifact_registry():
+    from session_store import ArtifactRegistry
+    return ArtifactRegistry()
+
+
+def _build_keyword_index():
+    from ats_keywords import KeywordIndex
+    return KeywordIndex()
+
+
+def _build_semantic_matcher():
+    from semantic_match import SemanticMatcher
+    with timed("load embedder"):
+        return SemanticMatcher()
+
+
+def _build_report_warmer():
+    from report_store import ReportWarmer, REPORT_WARMUP
+    from core import refresh_report, report_version, report_warm_plan
+
+    scheduler = get_llm_scheduler()
+    warmer = ReportWarmer(get_report_store(), report_warm_plan, refresh_report, report_version,
+                          admit=lambda: scheduler.limiter.headroom() >= 0.5)
+    return warmer.start() if REPORT_WARMUP else warmer
+
+
+def get_gemini_model(tier="pro"):
+    """Shared Gemini model client for a tier ("pro" or "fast")"""
+    name = "gemini_model" if tier == "pro" else f"gemini_model_{tier}"
+    return get_resource(name, lambda: _build_gemini_model(tier))
+
+
+def get_model_router():
+    """Maps each helper to a model tier, with fallback between tiers"""
+    return get_resource("model_router", _build_model_router)
+
+
+def get_firecrawl_app():
+    """Shared Firecrawl client"""
+    return get_resource("firecrawl_app", _build_firecrawl_app)
+
+
+def get_llm_cache():
+    """Response cache shared by all sessions"""
+    return get_resource("llm_cache", _build_llm_cache)
+
+
+def get_pdf_text_cache():
+    """Extracted resume text keyed by file content hash, shared across sessions"""
+    return get_resource("pdf_text_cache", _build_pdf_text_cache)
+
+
+def get_llm_scheduler():
+    """Scheduler so Gemini calls from all sessions share one quota budget"""
+    return get_resource("llm_scheduler", _build_llm_scheduler)
+
+
+def get_report_store():
+    """Precomputed industry-trends and company-research reports"""
+    return get_resource("report_store", _build_report_store)
+
+
+def get_posting_store():
+    """Scraped job postings, deduplicated and indexed for repeat searches"""
+    return get_resource("posting_store", _build_posting_store)
+
+
+def get_artifact_registry():
+    """Memory accounting and disk spill for every session's artifacts"""
+    return get_resource("artifact_registry", _build_artifact_registry)
+
+
+def get_keyword_index():
+    """Document frequencies over every job description and posting seen, for local ATS keywords"""
+    return get_resource("keyword_index", _build_keyword_index)
+
+
+def get_semantic_matcher():
+    """Embedding matcher with its on-disk vector cache"""
+    return get_resource("semantic_matcher", _build_semantic_matcher)
+
+
+def get_report_warmer():
+    """Background thread keeping popular reports fresh, started once per process"""
+    return get_resource("report_warmer", _build_report_warmer)
+
+
+def startup_report():
+    """Timings for every startup step recorded so far, in milliseconds"""
+    return {name: round(seconds * 1000, 1) for name, seconds in STARTUP_TIMINGS.items()}
@@ -0,0 +1,87 @@
+"""Sorting, filtering and pagination of search results, done before rendering so only one page builds widgets"""
+import math
+import os
+import re
+from functools import lru_cache
+
+RESULTS_PAGE_SIZE = int(os.getenv("RESULTS_PAGE_SIZE", "10"))
+ALL_PLATFORMS = "All"
+
+# Sort order name -> (key, descending)
+SORT_ORDERS = {
+    "Best match": (lambda job: job.get("match_score", 0), True),
+    "Highest salary": (lambda job: salary_range(job.get("salary"))[1] or 0, True),
+    "Newest": (lambda job: job.get("posted_date") or "", True),
+    "Company": (lambda job: (job.get("company") or "").lower(), False),
+}
+
+SALARY_PATTERN = re.compile(
+    r"(\d+(?:\.\d+)?)\s*k?\s*(?:(?:-|–|to)\s*(?:₹|rs\.?|inr)?\s*(\d+(?:\.\d+)?))?", re.IGNORECASE
+)
+SALARY_UNIT_PATTERN = re.compile(r"\d\s*(lpa|lakhs?|lacs?|cr|k)\b", re.IGNORECASE)
+SALARY_MONTHLY_PATTERN = re.compile(r"month|\bp\.?\s?m\b|/\s*mo\b", re.IGNORECASE)
+# Rupees per unit; figures without a unit are lakhs when small and plain rupees from 1000 up
+SALARY_UNITS = {
+    "cr": 10000000, "lpa": 100000, "lakh": 100000, "lakhs": 100000, "lac": 100000, "lacs": 100000, "k": 1000
+}
+
+
+@lru_cache(maxsize=4096)
+def salary_range(salary):
+    """(low, high) annual salary in lakhs parsed from strings like '₹12-18 LPA' or '₹50,000 - ₹70,000 a month';
+    (None, None) if undisclosed"""
+    match = SALARY_PATTERN.search((salary or "").replace(",", ""))
+    if not match:
+        return None, None
+    unit = SALARY_UNIT_PATTERN.search(salary)
+    unit = unit.group(1).lower() if unit else None
+    # Thousands are quoted monthly unless the posting says otherwise
+    months = 12 if SALARY_MONTHLY_PATTERN.search(salary) or unit == "k" else 1
+
+    def lakhs(amount):
+        rupees = amount * (SALARY_UNITS[unit] if unit else 1 if amount >= 1000 else 100000)
+        return rupees * months / 100000
+
+    low = lakhs(float(match.group(1)))
+    high = lakhs(float(match.group(2))) if match.group(2) else low
+    return low, high
+
+
+def platform_counts(jobs):
+    counts = {}
+    for job in jobs:
+        counts[job["platform"]] = counts.get(job["platform"], 0) + 1
+    return counts
+
+
+def filter_postings(jobs, platform=ALL_PLATFORMS, min_score=0, min_salary=0, locations=None):
+    """Postings on platform scoring at least min_score, paying at least min_salary LPA, in one of locations"""
+    selected = []
+    wanted = {location.lower() for location in locations or []}
+    for job in jobs:
+        if platform != ALL_PLATFORMS and job["platform"] != platform:
+            continue
+        if job.get("match_score", 0) < min_score:
+            continue
+        if min_salary and (salary_range(job.get("salary"))[1] or 0) < min_salary:
+            continue
+        if wanted and (job.get("location") or "").lower() not in wanted:
+            continue
+        selected.append(job)
+    return selected
+
+
+def sort_postings(jobs, order):
+    """Postings arrive ranked by match score, so the default order needs no work"""
+    if order == "Best match":
+        return jobs
+    key, descending = SORT_ORDERS[order]
+    return sorted(jobs, key=key, reverse=descending)
+
+
+def paginate(items, page, page_size=RESULTS_PAGE_SIZE):
+    """(items on page, page clamped to range, page count) for a 1-based page number"""
+    pages = max(1, math.ceil(len(items) / page_size))
+    page = min(max(1, page), pages)
+    start = (page - 1) * page_size
+    return items[start:start + page_size], page, pages
@@ -0,0 +1,298 @@
+"""Deterministic, LLM-free resume parser.
+
+Produces the same schema as the Gemini extraction prompt:
+technical_skills, soft_skills, years_experience, job_titles, education, certifications.
+"""
+import re
+from datetime import date
+
+TECHNICAL_SKILLS = [
+    "Python", "Java", "JavaScript", "TypeScript", "C", "C++", "C#", "Go", "Rust", "Kotlin", "Swift",
+    "Scala", "Ruby", "PHP", "R", "MATLAB", "Perl", "Bash", "Shell Scripting", "SQL", "NoSQL",
+    "HTML", "CSS", "React", "Angular", "Vue.js", "Next.js", "Node.js", "Express", "Django", "Flask",
+    "FastAPI", "Spring", "Spring Boot", "Hibernate", ".NET", "ASP.NET", "Ruby on Rails", "GraphQL",
+    "REST APIs", "gRPC", "Microservices", "MySQL", "PostgreSQL", "MongoDB", "Redis", "Cassandra",
+    "Elasticsearch", "Oracle", "SQLite", "DynamoDB", "Snowflake", "BigQuery", "AWS", "Azure",
+    "Google Cloud", "Docker", "Kubernetes", "Terraform", "Ansible", "Jenkins", "GitHub Actions",
+    "CI/CD", "Git", "Linux", "Kafka", "RabbitMQ", "Spark", "Hadoop", "Airflow", "dbt", "Pandas",
+    "NumPy", "SciPy", "Scikit-learn", "TensorFlow", "PyTorch", "Keras", "Machine Learning",
+    "Deep Learning", "NLP", "Computer Vision", "Data Analysis", "Data Science", "Data Engineering",
+    "Statistics", "Tableau", "Power BI", "Excel", "ETL", "LLMs", "Generative AI", "OpenCV",
+    "Selenium", "Pytest", "JUnit", "Jira", "Agile", "Scrum", "DevOps", "System Design",
+    "Android", "iOS", "Flutter", "React Native", "Figma", "Blockchain", "Cybersecurity"
+]
+
+SOFT_SKILLS = [
+    "Communication", "Leadership", "Teamwork", "Collaboration", "Problem Solving", "Critical Thinking",
+    "Time Management", "Adaptability", "Creativity", "Mentoring", "Stakeholder Management",
+    "Project Management", "Presentation", "Negotiation", "Attention to Detail", "Decision Making",
+    "Conflict Resolution", "Customer Service", "Analytical Thinking", "Ownership"
+]
+
+# Alternate spellings mapped to their canonical skill name
+SKILL_ALIASES = {
+    "js": "JavaScript", "ts": "TypeScript", "golang": "Go", "nodejs": "Node.js", "node": "Node.js",
+    "reactjs": "React", "react.js": "React", "vue": "Vue.js", "vuejs": "Vue.js", "nextjs": "Next.js",
+    "postgres": "PostgreSQL", "mongo": "MongoDB", "k8s": "Kubernetes", "gcp": "Google Cloud",
+    "amazon web services": "AWS", "microsoft azure": "Azure", "sklearn": "Scikit-learn",
+    "scikit learn": "Scikit-learn", "ml": "Machine Learning", "dl": "Deep Learning",
+    "natural language processing": "NLP", "rest": "REST APIs", "rest api": "REST APIs",
+    "restful apis": "REST APIs", "ci cd": "CI/CD", "powerbi": "Power BI", "ms excel": "Excel",
+    "large language models": "LLMs", "llm": "LLMs", "genai": "Generative AI", "team work": "Teamwork",
+    "problem-solving": "Problem Solving", "team player": "Teamwork", "public speaking": "Presentation"
+}
+
+# Skill names that are also everyday words or letters. Outside a skills section they only count when
+# spelled exactly like this, so "excel at", "go the extra mile" or "node scheduler" are not skills
+AMBIGUOUS_SPELLINGS = {
+    "go": "Go", "r": "R", "c": "C", "excel": "Excel", "express": "Express", "spring": "Spring",
+    "swift": "Swift", "rest": "REST", "node": "Node", "ml": "ML", "dl": "DL", "js": "JS", "ts": "TS"
+}
+YEAR_PATTERN = re.compile(r"(?:19|20)\d\d")
+
+SECTION_HEADINGS = {
+    "summary": ["summary", "profile", "professional summary", "objective", "about me", "career objective"],
+    "experience": ["experience", "work experience", "professional experience", "employment history",
+                   "work history", "employment", "internships", "internship experience"],
+    "education": ["education", "academic background", "academics", "qualifications", "educational qualifications"],
+    "skills": ["skills", "technical skills", "core competencies", "key skills", "technologies", "tech stack",
+               "skills & tools", "skills and tools", "soft skills"],
+    "projects": ["projects", "personal projects", "academic projects", "key projects"],
+    "certifications": ["certifications", "certificates", "licenses & certifications", "licenses and certifications",
+                       "courses", "certifications & courses"],
+    "achievements": ["achievements", "awards", "honors", "accomplishments"]
+}
+
+TITLE_KEYWORDS = (
+    "engineer", "developer", "manager", "analyst", "scientist", "consultant", "intern", "architect",
+    "designer", "lead", "administrator", "specialist", "programmer", "director", "associate", "officer"
+)
+
+DEGREE_PATTERN = re.compile(
+    r"\b(B\.?\s?Tech|M\.?\s?Tech|B\.?E\.?|M\.?E\.?|B\.?Sc|M\.?Sc|BCA|MCA|MBA|PGDM|Ph\.?D|B\.?Com|M\.?Com|"
+    r"Bachelor(?:'s)?|Master(?:'s)?|Diploma|Doctorate|Associate Degree)\b",
+    re.IGNORECASE
+)
+CERTIFICATION_PATTERN = re.compile(r"\b(certified|certification|certificate|AWS Certified|PMP|CCNA|CKA|OCJP)\b", re.IGNORECASE)
+
+MONTHS = {m: i for i, m in enumerate(
+    ["jan", "feb", "mar", "apr", "may", "jun", "jul", "aug", "sep", "oct", "nov", "dec"], start=1)}
+_MONTH = r"(?:jan|feb|mar|apr|may|jun|jul|aug|sep|sept|oct|nov|dec)[a-z]*\.?"
+_POINT = rf"(?:{_MONTH}\s*,?\s*\d{{4}}|\d{{1,2}}[/.-]\d{{4}}|\d{{4}})"
+_PRESENT = r"(?:present|current|now|till date|to date|ongoing)"
+DATE_RANGE_PATTERN = re.compile(rf"({_POINT})\s*(?:-|–|—|to|until)\s*({_POINT}|{_PRESENT})", re.IGNORECASE)
+EXPLICIT_YEARS_PATTERN = re.compile(r"(\d+(?:\.\d+)?)\s*\+?\s*(?:years?|yrs?)\s+(?:of\s+)?(?:experience|exp)", re.IGNORECASE)
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9][a-z0-9+#./-]*[a-z0-9+#]|[a-z0-9+#]", re.IGNORECASE)
+
+
+def _tokenize(text):
+    return [token.lower() for token in TOKEN_PATTERN.findall(text)]
+
+
+class SkillMatcher:
+    """Token trie over skill phrases; matches the longest phrase at each position"""
+
+    def __init__(self, skills, aliases=None):
+        self.root = {}
+        for skill in skills:
+            self.add(skill, skill)
+        for alias, canonical in (aliases or {}).items():
+            if canonical in skills:
+                self.add(alias, canonical)
+
+    def add(self, phrase, canonical):
+        node = self.root
+        for token in _tokenize(phrase):
+            node = node.setdefault(token, {})
+        node["$"] = canonical
+
+    def find(self, text, lenient=False):
+        """Return canonical skills found in text, in first-seen order.
+
+        Ambiguous names need their exact spelling unless lenient, and never count when joined to a
+        neighbour by "&" (R&D) or followed by a year (Spring 2020).
+        """
+        spans = list(TOKEN_PATTERN.finditer(text))
+        tokens = [span.group().lower() for span in spans]
+        found = []
+        i = 0
+        while i < len(tokens):
+            node, match, match_end = self.root, None, i
+            j = i
+            while j < len(tokens) and tokens[j] in node:
+                node = node[tokens[j]]
+                j += 1
+                if "$" in node:
+                    match, match_end = node["$"], j
+            if match and self._plausible(text, spans, i, match_end, lenient):
+                if match not in found:
+                    found.append(match)
+                i = match_end
+            else:
+                i += 1
+        return found
+
+    @staticmethod
+    def _plausible(text, spans, start, end, lenient):
+        spelling = AMBIGUOUS_SPELLINGS.get(" ".join(span.group().lower() for span in spans[start:end]))
+        if spelling is None:
+            return True
+        begin, finish = spans[start].start(), spans[end - 1].end()
+        if text[begin - 1:begin] == "&" or text[finish:finish + 1] == "&":
+            return False
+        if end < len(spans) and YEAR_PATTERN.fullmatch(spans[end].group()):
+            return False
+        return lenient or text[begin:finish] == spelling
+
+    def find_in_resume(self, text):
+        """find over resume text, lenient about ambiguous names only inside the skills section"""
+        runs = [[False, []]]
+        for line in text.splitlines():
+            section = heading_section(line)
+            if section and (section == "skills") != runs[-1][0]:
+                runs.append([section == "skills", []])
+            runs[-1][1].append(line)
+        found = []
+        for lenient, lines in runs:
+            found += [skill for skill in self.find("\n".join(lines), lenient) if skill not in found]
+        return found
+
+
+_TECHNICAL_MATCHER = SkillMatcher(TECHNICAL_SKILLS, SKILL_ALIASES)
+_SOFT_MATCHER = SkillMatcher(SOFT_SKILLS, SKILL_ALIASES)
+_HEADING_LOOKUP = {heading: section for section, headings in SECTION_HEADINGS.items() for heading in headings}
+
+
+def heading_section(line):
+    """Canonical section name if line is a section heading, else None"""
+    if len(line.strip()) > 40:
+        return None
+    return _HEADING_LOOKUP.get(re.sub(r"[^a-z& ]", "", line.lower()).strip())
+
+
+def split_sections(text):
+    """Split resume text into {section: text}; content before the first heading goes under 'header'"""
+    sections = {"header": []}
+    current = "header"
+    for line in text.splitlines():
+        section = heading_section(line)
+        if section:
+            current = section
+            sections.setdefault(current, [])
+            continue
+        sections[current].append(line)
+    return {name: "\n".join(lines).strip() for name, lines in sections.items()}
+
+
+def _parse_point(value, today):
+    value = value.strip().lower()
+    if re.fullmatch(_PRESENT, value):
+        return today.year * 12 + today.month
+    month_name = re.match(r"[a-z]+", value)
+    year = int(re.search(r"\d{4}", value).group())
+    if month_name:
+        month = MONTHS.get(month_name.group()[:3], 1)
+    else:
+        numeric = re.match(r"(\d{1,2})[/.-]\d{4}", value)
+        month = int(numeric.group(1)) if numeric and 1 <= int(numeric.group(1)) <= 12 else 1
+    return year * 12 + month
+
+
+def years_of_experience(text, today=None):
+    """Total years covered by date ranges in text, merging overlapping roles"""
+    today = today or date.today()
+    intervals = []
+    for start, end in DATE_RANGE_PATTERN.findall(text):
+        begin, finish = _parse_point(start, today), _parse_point(end, today)
+        if begin <= finish <= today.year * 12 + today.month:
+            intervals.append((begin, finish))
+    if not intervals:
+        explicit = [float(value) for value in EXPLICIT_YEARS_PATTERN.findall(text)]
+        return max(explicit) if explicit else 0
+
+    months = 0
+    current_start, current_end = None, None
+    for begin, finish in sorted(intervals):
+        if current_end is None or begin > current_end:
+            if current_end is not None:
+                months += current_end - current_start
+            current_start, current_end = begin, finish
+        else:
+            current_end = max(current_end, finish)
+    months += current_end - current_start
+    return round(months / 12, 1)
+
+
+def _clean_line(line):
+    return re.sub(r"^[\s•●▪◦*·\-–]+", "", line).strip()
+
+
+def extract_job_titles(text):
+    """Title-like phrases from experience lines"""
+    titles = []
+    for line in text.splitlines():
+        line = _clean_line(line)
+        if not line or len(line) > 80:
+            continue
+        candidate = re.split(r"\s+(?:at|@)\s+|\s*[|,–—]\s*|\s+-\s+", line)[0].strip()
+        words = candidate.lower().split()
+        ends_with_title = 1 <= len(words) <= 6 and words[-1].rstrip(".") in TITLE_KEYWORDS
+        short_title_case = 1 <= len(words) <= 4 and candidate.istitle() and any(w in TITLE_KEYWORDS for w in words)
+        if ends_with_title or short_title_case:
+            if candidate not in titles:
+                titles.append(candidate)
+    return titles
+
+
+def extract_education(text):
+    """Lines mentioning a degree"""
+    entries = []
+    for line in text.splitlines():
+        line = _clean_line(line)
+        if line and DEGREE_PATTERN.search(line) and line not in entries:
+            entries.append(line[:150])
+    return entries
+
+
+def extract_certifications(section_text, full_text):
+    """Lines from the certifications section, plus certification mentions elsewhere"""
+    entries = [_clean_line(line) for line in section_text.splitlines() if _clean_line(line)]
+    for line in full_text.splitlines():
+        line = _clean_line(line)
+        if line and CERTIFICATION_PATTERN.search(line) and len(line) <= 150 and line not in entries:
+            entries.append(line)
+    return entries
+
+
+def parse_resume(resume_text, today=None):
+    """Parse resume text into the structured profile schema used by the app"""
+    text = resume_text or ""
+    sections = split_sections(text)
+    experience_text = sections.get("experience") or text
+
+    return {
+        "technical_skills": _TECHNICAL_MATCHER.find_in_resume(text),
+        "soft_skills": _SOFT_MATCHER.find_in_resume(text),
+        "years_experience": years_of_experience(experience_text, today),
+        "job_titles": extract_job_titles(sections.get("experience") or sections.get("header", "")),
+        "education": extract_education(sections.get("education") or text),
+        "certifications": extract_certifications(sections.get("certifications", ""), text)
+    }
+
+
+def merge_profiles(local, enriched):
+    """Union list fields from an LLM enrichment pass into the local profile"""
+    merged = dict(local)
+    for field, value in (enriched or {}).items():
+        if isinstance(value, list):
+            existing = {str(item).lower() for item in merged.get(field, [])}
+            merged[field] = list(merged.get(field, [])) + [
+                item for item in value if str(item).lower() not in existing
+            ]
+        elif field == "years_experience" and not merged.get(field):
+            try:
+                merged[field] = float(value)
+            except (TypeError, ValueError):
+                pass
+    return merged
@@ -0,0 +1,295 @@
+"""Embedding-based matching between a candidate's resume/skills and posting requirements.
+
+Text is embedded with a local sentence-transformers model when EMBEDDING_MODEL is set and the
+package is installed, otherwise with a deterministic hashing vectorizer that expands known
+skills into the broader concepts they belong to ("PyTorch" -> deep learning framework).
+Vectors are cached on disk keyed by a hash of the embedder and the text, so each resume
+section and requirement is embedded once. Nearest neighbours are found by brute-force NumPy
+dot products, or an hnswlib index for large collections when hnswlib is available.
+"""
+import hashlib
+import logging
+import os
+import re
+import sqlite3
+import threading
+
+import numpy as np
+
+from resume_parser import split_sections
+
+logger = logging.getLogger(__name__)
+
+# sentence-transformers model name, e.g. all-MiniLM-L6-v2; empty uses the hashing vectorizer
+EMBEDDING_MODEL = os.getenv("EMBEDDING_MODEL", "")
+EMBEDDING_DIM = int(os.getenv("EMBEDDING_DIM", "1024"))
+VECTOR_CACHE_PATH = os.getenv("VECTOR_CACHE_PATH", os.path.join(".cache", "vectors.sqlite3"))
+# Collections at least this large use an hnswlib index when the package is installed
+ANN_MIN_ITEMS = int(os.getenv("ANN_MIN_ITEMS", "5000"))
+# Resume lines embedded per candidate, longest first
+MAX_RESUME_CHUNKS = 200
+
+# Skills mapped to the broader concepts postings tend to ask for
+SKILL_CONCEPTS = {
+    "pytorch": "deep learning framework neural networks machine learning",
+    "tensorflow": "deep learning framework neural networks machine learning",
+    "keras": "deep learning framework neural networks",
+    "scikit-learn": "machine learning library python data science",
+    "pandas": "data analysis python data wrangling",
+    "numpy": "numerical computing python data analysis",
+    "spark": "big data distributed processing data engineering",
+    "hadoop": "big data distributed processing data engineering",
+    "kafka": "streaming messaging event driven data engineering",
+    "airflow": "workflow orchestration data pipelines data engineering",
+    "docker": "containers containerization devops",
+    "kubernetes": "container orchestration containers devops cloud",
+    "terraform": "infrastructure as code devops cloud",
+    "aws": "cloud platform cloud computing",
+    "azure": "cloud platform cloud computing",
+    "google cloud": "cloud platform cloud computing",
+    "react": "frontend javascript framework web development ui",
+    "angular": "frontend javascript framework web development ui",
+    "vue.js": "frontend javascript framework web development ui",
+    "django": "backend python web framework web development",
+    "flask": "backend python web framework web development",
+    "fastapi": "backend python web framework rest apis",
+    "spring boot": "backend java web framework microservices",
+    "node.js": "backend javascript runtime web development",
+    "postgresql": "relational database sql",
+    "mysql": "relational database sql",
+    "mongodb": "nosql database document store",
+    "redis": "in-memory cache nosql database",
+    "tableau": "data visualization business intelligence dashboards",
+    "power bi": "data visualization business intelligence dashboards",
+    "nlp": "natural language processing machine learning text",
+    "llms": "large language models generative ai natural language processing",
+    "ci/cd": "continuous integration deployment pipelines devops",
+    "jenkins": "continuous integration deployment pipelines devops",
+    "git": "version control",
+    "rest apis": "web services api design backend",
+    "graphql": "api design backend web services",
+}
+
+BULLET_PATTERN = re.compile(r"^[\s•●▪◦*·\-–]+")
+WORD_PATTERN = re.compile(r"[a-z0-9][a-z0-9+#./-]*[a-z0-9+#]|[a-z0-9+#]")
+
+
+def content_hash(*parts):
+    return hashlib.sha256("\x1f".join(parts).encode("utf-8")).hexdigest()
+
+
+def _normalize(matrix):
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    return matrix / np.where(norms > 0, norms, 1.0)
+
+
+class HashingEmbedder:
+    """Deterministic bag-of-features embedding: words, concept expansions and character trigrams"""
+
+    def __init__(self, dim=EMBEDDING_DIM):
+        self.dim = dim
+        self.name = f"hashing-v1-{dim}"
+        self._concepts = {skill: concepts.split() for skill, concepts in SKILL_CONCEPTS.items()}
+
+    def _bucket(self, feature):
+        digest = hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest()
+        value = int.from_bytes(digest, "little")
+        return value % self.dim, 1.0 if value >> 63 else -1.0
+
+    def features(self, text):
+        """(feature, weight) pairs for one text"""
+        text = text.lower()
+        words = WORD_PATTERN.findall(text)
+        features = [(f"w:{word}", 1.0) for word in words]
+        features += [(f"b:{a} {b}", 0.5) for a, b in zip(words, words[1:])]
+        for word in words:
+            padded = f"<{word}>"
+            features += [(f"c:{padded[i:i + 3]}", 0.15) for i in range(len(padded) - 2)]
+        # Concepts may span words ("spring boot"), so match phrases against the whole text
+        for skill, concepts in self._concepts.items():
+            if skill in words or (" " in skill and skill in text):
+                features += [(f"w:{concept}", 0.6) for concept in concepts]
+        return features
+
+    def embed(self, texts):
+        matrix = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for feature, weight in self.features(text):
+                column, sign = self._bucket(feature)
+                matrix[row, column] += sign * weight
+        return _normalize(matrix)
+
+
+class SentenceTransformerEmbedder:
+    """Small local embedding model (needs sentence-transformers)"""
+
+    def __init__(self, model_name):
+        from sentence_transformers import SentenceTransformer
+
+        self.model = SentenceTransformer(model_name)
+        self.name = f"st-{model_name}"
+
+    def embed(self, texts):
+        vectors = self.model.encode(list(texts), normalize_embeddings=True, convert_to_numpy=True)
+        return vectors.astype(np.float32)
+
+
+def load_embedder(model_name=EMBEDDING_MODEL, dim=EMBEDDING_DIM):
+    """The configured local model, falling back to the hashing vectorizer if it can't be loaded"""
+    if model_name:
+        try:
+            return SentenceTransformerEmbedder(model_name)
+        except Exception as e:
+            logger.warning("embedding model %s unavailable (%s); using hashing vectorizer", model_name, e)
+    return HashingEmbedder(dim)
+
+
+class VectorCache:
+    """Embeddings on disk keyed by content hash"""
+
+    def __init__(self, path=VECTOR_CACHE_PATH):
+        self._lock = threading.Lock()
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("CREATE TABLE IF NOT EXISTS vectors (key TEXT PRIMARY KEY, vector BLOB NOT NULL)")
+        self._conn.commit()
+        self.hits = 0
+        self.misses = 0
+
+    def get_many(self, keys):
+        found = {}
+        with self._lock:
+            for start in range(0, len(keys), 500):
+                batch = keys[start:start + 500]
+                rows = self._conn.execute(
+                    f"SELECT key, vector FROM vectors WHERE key IN ({','.join('?' * len(batch))})", batch
+                ).fetchall()
+                found.update((key, np.frombuffer(blob, dtype=np.float32)) for key, blob in rows)
+            self.hits += len(found)
+            self.misses += len(keys) - len(found)
+        return found
+
+    def put_many(self, items):
+        with self._lock:
+            self._conn.executemany("INSERT OR REPLACE INTO vectors (key, vector) VALUES (?, ?)",
+                                   [(key, vector.astype(np.float32).tobytes()) for key, vector in items])
+            self._conn.commit()
+
+    def stats(self):
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM vectors").fetchone()[0]
+        return {"entries": entries, "hits": self.hits, "misses": self.misses}
+
+
+class VectorIndex:
+    """Cosine nearest-neighbour search over unit vectors"""
+
+    def __init__(self, vectors, ann_min_items=ANN_MIN_ITEMS):
+        self.vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+        self._ann = None
+        if len(self.vectors) >= ann_min_items:
+            self._ann = self._build_ann()
+
+    def _build_ann(self):
+        try:
+            import hnswlib
+        except ImportError:
+            return None
+        index = hnswlib.Index(space="ip", dim=self.vectors.shape[1])
+        index.init_index(max_elements=len(self.vectors), ef_construction=200, M=16)
+        index.add_items(self.vectors, np.arange(len(self.vectors)))
+        index.set_ef(64)
+        return index
+
+    def search(self, queries, k=1):
+        """(indices, similarities), each shaped (len(queries), k), best first"""
+        queries = np.atleast_2d(np.asarray(queries, dtype=np.float32))
+        k = min(k, len(self.vectors))
+        if k == 0:
+            return np.zeros((len(queries), 0), dtype=np.int64), np.zeros((len(queries), 0), dtype=np.float32)
+        if self._ann is not None:
+            labels, distances = self._ann.knn_query(queries, k=k)
+            return labels.astype(np.int64), 1.0 - distances
+        similarities = queries @ self.vectors.T
+        if k < similarities.shape[1]:
+            top = np.argpartition(-similarities, k - 1, axis=1)[:, :k]
+        else:
+            top = np.tile(np.arange(similarities.shape[1]), (len(queries), 1))
+        top_similarities = np.take_along_axis(similarities, top, axis=1)
+        order = np.argsort(-top_similarities, axis=1)
+        return np.take_along_axis(top, order, axis=1), np.take_along_axis(top_similarities, order, axis=1)
+
+
+def resume_chunks(resume_text, skills=()):
+    """Skills plus the substantive lines of a resume, the units matched against requirements"""
+    chunks = [str(skill) for skill in skills if str(skill).strip()]
+    if resume_text:
+        sections = split_sections(resume_text)
+        lines = []
+        for name, text in sections.items():
+            if name == "header":
+                continue
+            lines += [BULLET_PATTERN.sub("", line).strip() for line in text.splitlines()]
+        lines = [line for line in lines if len(line.split()) >= 2]
+        chunks += sorted(lines, key=len, reverse=True)[:MAX_RESUME_CHUNKS]
+    return list(dict.fromkeys(chunks))
+
+
+def posting_requirements(posting):
+    """What a posting asks for: its listed skills, or its title when none are listed"""
+    return [str(skill) for skill in posting.get("skills") or () if str(skill).strip()] or [posting.get("title") or ""]
+
+
+def posting_document(posting):
+    return " ".join([posting.get("title") or ""] + posting_requirements(posting))
+
+
+class SemanticMatcher:
+    """Embeds through the vector cache and scores how well a candidate covers each posting's requirements"""
+
+    def __init__(self, embedder=None, cache=None):
+        self.embedder = embedder or load_embedder()
+        self.cache = cache or VectorCache()
+
+    def embed(self, texts):
+        """Unit vectors for texts, embedding only those not already cached"""
+        unique = list(dict.fromkeys(texts))
+        keys = [content_hash(self.embedder.name, text) for text in unique]
+        vectors = self.cache.get_many(keys)
+        missing = [(key, text) for key, text in zip(keys, unique) if key not in vectors]
+        if missing:
+            embedded = self.embedder.embed([text for _, text in missing])
+            fresh = [(key, vector) for (key, _), vector in zip(missing, embedded)]
+            self.cache.put_many(fresh)
+            vectors.update(fresh)
+        by_text = {text: vectors[key] for key, text in zip(keys, unique)}
+        return np.array([by_text[text] for text in texts], dtype=np.float32).reshape(len(texts), -1)
+
+    def score_postings(self, postings, skills, resume_text=None):
+        """0-100 per posting: mean over its requirements of the best cosine match in the candidate's resume"""
+        chunks = resume_chunks(resume_text, skills)
+        if not postings or not chunks:
+            return np.zeros(len(postings))
+        index = VectorIndex(self.embed(chunks))
+        requirements = [posting_requirements(posting) for posting in postings]
+        counts = np.fromiter(map(len, requirements), dtype=np.int64, count=len(postings))
+        flat = [text for items in requirements for text in items]
+        _, similarities = index.search(self.embed(flat), k=1)
+        best = np.clip(similarities[:, 0], 0.0, 1.0)
+        owners = np.repeat(np.arange(len(postings)), counts)
+        return np.bincount(owners, weights=best, minlength=len(postings)) / np.maximum(counts, 1) * 100
+
+    def nearest_postings(self, postings, skills, resume_text=None, k=10):
+        """The k postings closest to the candidate as a whole, as (posting, similarity) pairs"""
+        chunks = resume_chunks(resume_text, skills)
+        if not postings or not chunks:
+            return []
+        profile = self.embed(chunks).mean(axis=0, keepdims=True)
+        index = VectorIndex(self.embed([posting_document(posting) for posting in postings]))
+        indices, similarities = index.search(profile / (np.linalg.norm(profile) or 1.0), k)
+        return [(postings[i], float(s)) for i, s in zip(indices[0].tolist(), similarities[0].tolist())]
+
+    def stats(self):
+        return {"embedder": self.embedder.name, **self.cache.stats()}
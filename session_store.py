@@ -0,0 +1,227 @@
+"""Bounded per-session artifact store with LRU spill to a compressed on-disk area.
+
+Generated reports, resume text and search results live here rather than directly in
+st.session_state. Each session keeps at most SESSION_MEMORY_KB resident and the whole process at
+most SESSION_PROCESS_MEMORY_MB; the least recently used artifacts beyond that are pickled,
+zlib-compressed and written to SQLite, then loaded back transparently the next time they are read.
+"""
+import os
+import pickle
+import sqlite3
+import threading
+import time
+import uuid
+import weakref
+import zlib
+from collections import OrderedDict
+from collections.abc import MutableMapping
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+SESSION_SPILL_PATH = os.getenv("SESSION_SPILL_PATH", os.path.join(".cache", "session_spill.sqlite3"))
+# Resident artifact bytes per session before the least recently used are spilled to disk
+SESSION_MEMORY_BYTES = int(os.getenv("SESSION_MEMORY_KB", "512")) * 1024
+# Resident artifact bytes across all sessions in the process
+SESSION_PROCESS_MEMORY_BYTES = int(os.getenv("SESSION_PROCESS_MEMORY_MB", "256")) * 1024 * 1024
+# Spilled rows older than this belong to sessions of a previous process and are dropped at startup
+SESSION_SPILL_MAX_AGE_SECONDS = float(os.getenv("SESSION_SPILL_MAX_AGE_HOURS", "24")) * 3600
+
+
+def measure(value):
+    """Approximate memory held by an artifact: its pickled size"""
+    if isinstance(value, str):
+        return len(value.encode("utf-8"))
+    return len(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+
+
+def peak_rss_mb():
+    if resource is None:
+        return None
+    # ru_maxrss is kilobytes on Linux, bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(peak / (1024 * 1024 if os.uname().sysname == "Darwin" else 1024), 1)
+
+
+class SessionArtifacts(MutableMapping):
+    """One session's artifacts; reads of spilled names reload them from disk"""
+
+    def __init__(self, registry, session_id):
+        self.registry = registry
+        self.session_id = session_id
+        self._resident = OrderedDict()
+        self._sizes = {}
+        self._spilled = {}
+        self.resident_bytes = 0
+
+    def __getitem__(self, name):
+        return self.registry._get(self, name)
+
+    def __setitem__(self, name, value):
+        self.registry._put(self, name, value)
+
+    def __delitem__(self, name):
+        self.registry._delete(self, name)
+
+    def __contains__(self, name):
+        # Checked without reloading a spilled value
+        return name in self._resident or name in self._spilled
+
+    def __iter__(self):
+        return iter(list(self._resident) + list(self._spilled))
+
+    def __len__(self):
+        return len(self._resident) + len(self._spilled)
+
+    def stats(self):
+        return {
+            "resident_items": len(self._resident), "resident_kb": round(self.resident_bytes / 1024, 1),
+            "spilled_items": len(self._spilled), "spilled_kb": round(sum(self._spilled.values()) / 1024, 1)
+        }
+
+
+class ArtifactRegistry:
+    """Process-wide accounting for every session's artifacts, with one shared spill table"""
+
+    def __init__(self, path=SESSION_SPILL_PATH, session_budget=SESSION_MEMORY_BYTES,
+                 process_budget=SESSION_PROCESS_MEMORY_BYTES):
+        self.path = path
+        self.session_budget = session_budget
+        self.process_budget = process_budget
+        self.spills = 0
+        self.reloads = 0
+        self.resident_bytes = 0
+        self._sessions = weakref.WeakValueDictionary()
+        # Every resident (session_id, name) in least-recently-used order, for process-wide eviction
+        self._lru = OrderedDict()
+        self._lock = threading.RLock()
+
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS spilled (
+                session_id TEXT NOT NULL,
+                name TEXT NOT NULL,
+                data BLOB NOT NULL,
+                spilled_at REAL NOT NULL,
+                PRIMARY KEY (session_id, name)
+            )
+            """
+        )
+        self._conn.execute("DELETE FROM spilled WHERE spilled_at < ?", (time.time() - SESSION_SPILL_MAX_AGE_SECONDS,))
+        self._conn.commit()
+
+    def session(self, session_id=None):
+        """A new artifact store; its spilled rows are deleted once the session object is garbage collected"""
+        store = SessionArtifacts(self, session_id or uuid.uuid4().hex)
+        with self._lock:
+            self._sessions[store.session_id] = store
+        weakref.finalize(store, self._forget, store.session_id)
+        return store
+
+    def _forget(self, session_id):
+        with self._lock:
+            for key in [key for key in self._lru if key[0] == session_id]:
+                self.resident_bytes -= self._lru.pop(key)
+            self._conn.execute("DELETE FROM spilled WHERE session_id = ?", (session_id,))
+            self._conn.commit()
+
+    def _get(self, store, name):
+        with self._lock:
+            if name in store._resident:
+                store._resident.move_to_end(name)
+                self._lru.move_to_end((store.session_id, name))
+                return store._resident[name]
+            if name not in store._spilled:
+                raise KeyError(name)
+            row = self._conn.execute(
+                "SELECT data FROM spilled WHERE session_id = ? AND name = ?", (store.session_id, name)
+            ).fetchone()
+            if row is None:
+                del store._spilled[name]
+                raise KeyError(name)
+            raw = zlib.decompress(row[0])
+            value = pickle.loads(raw)
+            self.reloads += 1
+            if len(raw) > self.session_budget:
+                # Would be written straight back by _put; its row is already current
+                return value
+            self._put(store, name, value)
+            return value
+
+    def _put(self, store, name, value):
+        size = measure(value)
+        with self._lock:
+            self._discard(store, name)
+            if size > self.session_budget:
+                # Too big to ever stay resident; straight to disk
+                self._write(store, name, value)
+                return
+            store._resident[name] = value
+            store._sizes[name] = size
+            store.resident_bytes += size
+            self._lru[(store.session_id, name)] = size
+            self.resident_bytes += size
+            while store.resident_bytes > self.session_budget:
+                self._spill(store, next(iter(store._resident)))
+            while self.resident_bytes > self.process_budget and self._lru:
+                session_id, oldest = next(iter(self._lru))
+                owner = self._sessions.get(session_id)
+                if owner is None:
+                    self.resident_bytes -= self._lru.pop((session_id, oldest))
+                else:
+                    self._spill(owner, oldest)
+
+    def _delete(self, store, name):
+        with self._lock:
+            if name not in store:
+                raise KeyError(name)
+            self._discard(store, name)
+
+    def _discard(self, store, name):
+        if name in store._resident:
+            del store._resident[name]
+            size = store._sizes.pop(name)
+            store.resident_bytes -= size
+            self.resident_bytes -= self._lru.pop((store.session_id, name), size)
+        if store._spilled.pop(name, None) is not None:
+            self._conn.execute("DELETE FROM spilled WHERE session_id = ? AND name = ?", (store.session_id, name))
+            self._conn.commit()
+
+    def _write(self, store, name, value):
+        data = zlib.compress(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+        self._conn.execute(
+            "INSERT OR REPLACE INTO spilled (session_id, name, data, spilled_at) VALUES (?, ?, ?, ?)",
+            (store.session_id, name, data, time.time())
+        )
+        self._conn.commit()
+        store._spilled[name] = len(data)
+        self.spills += 1
+
+    def _spill(self, store, name):
+        value = store._resident[name]
+        self._discard(store, name)
+        self._write(store, name, value)
+
+    def stats(self):
+        """Process-wide memory use of session artifacts, for sizing nodes"""
+        with self._lock:
+            sessions = [store.stats() for store in list(self._sessions.values())]
+            return {
+                "sessions": len(sessions),
+                "resident_kb": round(self.resident_bytes / 1024, 1),
+                "resident_items": sum(entry["resident_items"] for entry in sessions),
+                "spilled_kb": round(sum(entry["spilled_kb"] for entry in sessions), 1),
+                "spilled_items": sum(entry["spilled_items"] for entry in sessions),
+                "largest_session_kb": max((entry["resident_kb"] for entry in sessions), default=0),
+                "spills": self.spills,
+                "reloads": self.reloads,
+                "session_budget_kb": self.session_budget // 1024,
+                "process_budget_mb": self.process_budget // (1024 * 1024),
+                "peak_rss_mb": peak_rss_mb(),
+            }